@@ -1,28 +1,61 @@
 """Agent Container Pack CLI."""
 
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import sys
+from typing import Annotated, Any, Literal
 
 import cyclopts
+from cyclopts import Parameter
 import httpx
 
-from agent_container_pack.devcontainer import update_firewall
+from agent_container_pack.devcontainer import (
+    check_preinstall,
+    resolve_firewall,
+    update_firewall,
+    update_preinstall,
+)
 from agent_container_pack.generators import (
     generate_claude_md,
     generate_codex_config,
+    generate_package_md,
     generate_settings_json,
 )
 from agent_container_pack.init import (
-    download_template,
-    generate_skeleton,
+    HttpConfig,
+    init_projects,
+    LocalTemplateSource,
+    parse_size,
     parse_template_source,
+    read_targets_file,
+    TemplateCache,
 )
+from agent_container_pack.init.bulk import MAX_INIT_WORKERS
 from agent_container_pack.manifest import (
     load_manifest,
     ManifestNotFoundError,
     ManifestParseError,
 )
-from agent_container_pack.validators import validate_env_vars, validate_skills
+from agent_container_pack.manifest.schema import Manifest, MCPProxyConfig
+from agent_container_pack.mcp import (
+    MCPProxy,
+    proxy_url,
+    run_bench,
+    run_doctor,
+    run_footprint,
+)
+from agent_container_pack.mcp.bench import DEFAULT_TRIALS
+from agent_container_pack.mcp.doctor import DEFAULT_PROBE_TIMEOUT
+from agent_container_pack.mcp.footprint import DEFAULT_TOKEN_BUDGET
+from agent_container_pack.stack import (
+    detect_stacks,
+    detect_workspace,
+    StackError,
+    WorkspacePackage,
+)
+from agent_container_pack.validators import run_validators, Severity
 
 app = cyclopts.App(
     name="acpack",
@@ -41,12 +74,18 @@ def generate(
     *,
     write: bool = False,
     directory: Path = Path("."),
+    workspace: bool = False,
+    stack: str | None = None,
 ) -> None:
     """Generate configuration files from agentpack.yml.
 
     Args:
         write: Write files to disk (default: dry-run).
         directory: Project directory.
+        workspace: Also generate per-package CLAUDE.md/AGENTS.md for every
+            package detected in the tree (also enabled by docs.mode: workspace).
+        stack: Stack whose MCP servers to configure (default: the manifest's
+            stack, else the detected stacks, else all servers).
     """
     try:
         manifest = load_manifest(directory)
@@ -57,22 +96,65 @@ def generate(
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
+    if stack is not None and stack not in manifest.stacks:
+        print(
+            f"Error: Unknown stack: {stack}. "
+            f"Expected one of: {list(manifest.stacks.keys())}",
+            file=sys.stderr,
+        )
+        sys.exit(1)
+
+    # Detect workspace packages
+    packages: list[WorkspacePackage] = []
+    if workspace or manifest.docs.mode == "workspace":
+        packages = detect_workspace(manifest, directory)
+
+    # Configs may only run pre-installed launchers if the install step exists
+    try:
+        preinstalled = check_preinstall(manifest, directory)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
     # Generate outputs
-    claude_md = generate_claude_md(manifest)
+    stacks = _select_stacks(manifest, directory, stack)
+    claude_md = generate_claude_md(
+        manifest, packages={p.path: p.stack for p in packages}
+    )
     agents_md = claude_md  # Same content
-    settings_json = generate_settings_json(manifest)
-    codex_config = generate_codex_config(manifest)
+    settings_json = generate_settings_json(manifest, stacks, preinstalled=preinstalled)
+    codex_config = generate_codex_config(manifest, stacks, preinstalled=preinstalled)
 
-    # Validate
-    env_warnings = validate_env_vars(manifest, directory)
-    for warning in env_warnings:
-        print(f"Warning: {warning.message}", file=sys.stderr)
+    with ThreadPoolExecutor() as executor:
+        rendered = executor.map(
+            lambda p: generate_package_md(manifest, p.path, p.stack), packages
+        )
+        package_docs = {
+            p.path: content for p, content in zip(packages, rendered, strict=True)
+        }
 
-    skills_errors = validate_skills(manifest, directory)
-    for error in skills_errors:
-        print(f"Warning: [{error.skill_id}] {error.message}", file=sys.stderr)
+    # Packages whose stack lists its MCP servers get their own minimal set
+    package_mcp = {
+        p.path: (
+            generate_settings_json(manifest, [p.stack], preinstalled=preinstalled),
+            generate_codex_config(manifest, [p.stack], preinstalled=preinstalled),
+        )
+        for p in packages
+        if manifest.stacks[p.stack].mcp is not None
+    }
+
+    # Validate
+    for result in run_validators(manifest, directory):
+        for issue in result.issues:
+            print(f"Warning: {issue}", file=sys.stderr)
 
     if write:
+        # Install step first: the configs below run its launchers
+        preinstall_result = update_preinstall(manifest, directory)
+        if not preinstall_result.success:
+            print(f"Error: {preinstall_result.message}", file=sys.stderr)
+            sys.exit(1)
+
         # Write files
         (directory / "CLAUDE.md").write_text(claude_md)
         (directory / "AGENTS.md").write_text(agents_md)
@@ -83,23 +165,56 @@ def generate(
 
         (directory / "codex.config.toml").write_text(codex_config)
 
+        with ThreadPoolExecutor() as executor:
+            futures = [
+                executor.submit(
+                    _write_package_docs,
+                    directory / path,
+                    content,
+                    package_mcp.get(path),
+                )
+                for path, content in package_docs.items()
+            ]
+            for future in futures:
+                future.result()
+
         # Update firewall
         firewall_result = update_firewall(manifest, directory)
-        if firewall_result.success and firewall_result.domains_added > 0:
+        if firewall_result.success and firewall_result.path:
             print(
-                f"  - Updated init-firewall.sh ({firewall_result.domains_added} domains added)"
+                f"  - Updated {firewall_result.path.name} "
+                f"({firewall_result.domains_added} domains added, "
+                f"{firewall_result.domains_removed} removed)"
             )
+            for domain in firewall_result.added:
+                print(f"      + {domain}")
+            for domain in firewall_result.removed:
+                print(f"      - {domain}")
         elif (
             not firewall_result.success
             and "not found" not in firewall_result.message.lower()
         ):
             print(f"Warning: {firewall_result.message}", file=sys.stderr)
+        if firewall_result.warning:
+            print(f"Warning: {firewall_result.warning}", file=sys.stderr)
+
+        if preinstall_result.path:
+            print(
+                f"  - Updated {preinstall_result.path.name} "
+                f"({len(preinstall_result.packages)} MCP server packages pre-installed)"
+            )
+            for package in preinstall_result.packages:
+                print(f"      + {package}")
 
         print("Generated:")
         print("  - CLAUDE.md")
         print("  - AGENTS.md")
         print("  - .claude/settings.json")
         print("  - codex.config.toml")
+        for path in package_docs:
+            print(f"  - {path}/CLAUDE.md, {path}/AGENTS.md")
+            if path in package_mcp:
+                print(f"  - {path}/.claude/settings.json, {path}/codex.config.toml")
         print()
         print("Start devcontainer:")
         print("  VS Code:  Open folder → 'Reopen in Container'")
@@ -113,66 +228,665 @@ def generate(
         print(settings_json)
         print("=== codex.config.toml ===")
         print(codex_config)
+        for path, content in package_docs.items():
+            print(f"=== {path}/CLAUDE.md ===")
+            print(content)
+            if path in package_mcp:
+                print(f"=== {path}/.claude/settings.json ===")
+                print(package_mcp[path][0])
+                print(f"=== {path}/codex.config.toml ===")
+                print(package_mcp[path][1])
         print("\nUse --write to create files.")
 
 
+def _select_stacks(
+    manifest: Manifest, directory: Path, stack: str | None
+) -> list[str] | None:
+    """Stacks whose MCP servers to configure.
+
+    An explicit ``--stack`` wins, then ``manifest.stack``, then every
+    detected stack. None (all servers) if nothing is detected.
+    """
+    if stack:
+        return [stack]
+    if manifest.stack:
+        return [manifest.stack]
+    try:
+        return detect_stacks(manifest, directory)
+    except StackError:
+        return None
+
+
+def _write_package_docs(
+    package_dir: Path, content: str, mcp_configs: tuple[str, str] | None = None
+) -> None:
+    """Write nested CLAUDE.md/AGENTS.md (and MCP configs) for a package."""
+    (package_dir / "CLAUDE.md").write_text(content)
+    (package_dir / "AGENTS.md").write_text(content)
+    if mcp_configs:
+        settings_json, codex_config = mcp_configs
+        (package_dir / ".claude").mkdir(exist_ok=True)
+        (package_dir / ".claude" / "settings.json").write_text(settings_json)
+        (package_dir / "codex.config.toml").write_text(codex_config)
+
+
 @app.command
-def init(
+def check(
+    *,
     directory: Path = Path("."),
+    output_format: Annotated[Literal["text", "json"], Parameter(name="--format")] = (
+        "text"
+    ),
+    strict: bool = False,
+    only: list[str] | None = None,
+    skip: list[str] | None = None,
+    timings: bool = False,
+) -> None:
+    """Validate agentpack.yml without generating or writing anything.
+
+    Exits non-zero when the manifest is invalid or a validator reports an
+    error (or a warning, with --strict).
+
+    Args:
+        directory: Project directory.
+        output_format: Output format (text or json).
+        strict: Treat warnings as errors.
+        only: Run only these validators.
+        skip: Skip these validators.
+        timings: Show how long each validator took.
+    """
+    issues: list[dict[str, Any]] = []
+    validators: list[dict[str, Any]] = []
+
+    try:
+        manifest = load_manifest(directory)
+    except (ManifestNotFoundError, ManifestParseError) as e:
+        issues.append(
+            {"validator": "manifest", "severity": Severity.ERROR, "message": str(e)}
+        )
+    else:
+        try:
+            results = run_validators(manifest, directory, only=only, skip=skip)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(2)
+
+        for result in results:
+            validators.append(
+                {
+                    "name": result.name,
+                    "duration_ms": round(result.duration * 1000, 3),
+                    "issues": len(result.issues),
+                }
+            )
+            for issue in result.issues:
+                issues.append(
+                    {
+                        "validator": issue.validator,
+                        "severity": issue.severity,
+                        "message": str(issue),
+                    }
+                )
+
+    errors = [i for i in issues if i["severity"] == Severity.ERROR]
+    warnings = [i for i in issues if i["severity"] == Severity.WARNING]
+    failed = bool(errors) or (strict and bool(warnings))
+
+    if output_format == "json":
+        report = {
+            "ok": not failed,
+            "errors": errors,
+            "warnings": warnings,
+            "issues": issues,
+            "validators": validators,
+        }
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        for issue in issues:
+            print(f"{issue['severity'].title()}: {issue['message']}", file=sys.stderr)
+        if timings:
+            for validator in validators:
+                print(f"  {validator['name']}: {validator['duration_ms']:.1f} ms")
+        print(f"{len(errors)} error(s), {len(warnings)} warning(s)")
+
+    if failed:
+        sys.exit(1)
+
+
+@app.command
+def doctor(
     *,
-    template: str = "github:ryoooo/acpack-template-default",
+    directory: Path = Path("."),
+    server: list[str] | None = None,
+    timeout: float = DEFAULT_PROBE_TIMEOUT,
+    output_format: Annotated[Literal["text", "json"], Parameter(name="--format")] = (
+        "text"
+    ),
+) -> None:
+    """Check that the configured MCP servers start and respond.
+
+    Every server is probed concurrently: stdio servers are started and
+    HTTP servers are contacted, and each must answer the MCP initialize
+    handshake within the timeout. Exits non-zero if any server fails.
+
+    Args:
+        directory: Project directory.
+        server: Probe only these servers.
+        timeout: Seconds each server gets to respond.
+        output_format: Output format (text or json).
+    """
+    directory = directory.resolve()
+
+    try:
+        manifest = load_manifest(directory)
+    except ManifestNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except ManifestParseError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        results = run_doctor(manifest, directory, names=server, timeout=timeout)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    failed = [r for r in results if not r.ok]
+    if output_format == "json":
+        report = {
+            "ok": not failed,
+            "servers": [
+                {
+                    "name": r.name,
+                    "transport": r.transport,
+                    "ok": r.ok,
+                    "latency_ms": round(r.latency * 1000, 3),
+                    "server_info": r.server_info,
+                    "protocol_version": r.protocol_version,
+                    "error": r.error,
+                }
+                for r in results
+            ],
+        }
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    elif not results:
+        print("No MCP servers configured")
+    else:
+        for r in results:
+            status = "ok" if r.ok else "FAIL"
+            line = f"  {status:<4}  {r.name} ({r.transport})  {r.latency * 1000:.1f} ms"
+            if r.error:
+                line += f"  {r.error}"
+            elif r.server_info:
+                line += f"  {r.server_info.get('name', '')} {r.server_info.get('version', '')}"
+            print(line.rstrip())
+        print(
+            f"{len(results)} server(s): {len(results) - len(failed)} ok, "
+            f"{len(failed)} failed"
+        )
+
+    if failed:
+        sys.exit(1)
+
+
+DEFAULT_TEMPLATE = "github:ryoooo/acpack-template-default"
+
+
+@app.command
+def init(
+    *directories: Path,
+    directory: list[Path] | None = None,
+    template: list[str] | None = None,
     stack: str = "python",
     force: bool = False,
+    cache: bool = True,
+    offline: bool = False,
+    partial: bool = False,
+    link: bool = False,
+    targets_file: Path | None = None,
+    jobs: int = MAX_INIT_WORKERS,
+    timeout: float = 30.0,
+    retries: int = 3,
 ) -> None:
-    """Initialize a new agentpack project.
+    """Initialize new agentpack projects.
 
     Args:
-        directory: Target directory.
-        template: Template source.
+        directories: Target directories (default: current directory).
+        directory: Target directory, added to the positional ones. Repeat
+            for several targets.
+        template: Template source. Repeat to layer templates; later layers
+            override files of earlier ones and deep-merge agentpack.yml.
+            [default: github:ryoooo/acpack-template-default]
         stack: Stack to use.
         force: Overwrite existing files.
+        cache: Use the local template cache.
+        offline: Use only cached templates, never the network.
+        partial: Fetch only the needed files via HTTP Range when possible.
+        link: Hardlink files of local directory templates when reflinks are
+            not supported.
+        targets_file: File listing target directories, one per line.
+        jobs: Maximum number of targets initialized concurrently.
+        timeout: Read timeout for template downloads, in seconds.
+        retries: Retries for failed or throttled template downloads.
+    """
+    targets = [*directories, *(directory or [])]
+    if targets_file is not None:
+        try:
+            targets += read_targets_file(targets_file)
+        except OSError as e:
+            print(f"Error: Cannot read targets file: {e}", file=sys.stderr)
+            sys.exit(1)
+    if not targets:
+        targets = [Path(".")]
+
+    try:
+        sources = []
+        for layer in template or [DEFAULT_TEMPLATE]:
+            source = parse_template_source(layer)
+            if isinstance(source, LocalTemplateSource):
+                print(f"Copying template from {source.path}...")
+            else:
+                print(f"Downloading template from {layer}...")
+            sources.append(source)
+        results = init_projects(
+            sources,
+            targets,
+            stack=stack,
+            force=force,
+            cache=TemplateCache() if cache or offline else None,
+            offline=offline,
+            partial=partial,
+            link=link,
+            progress=_print_progress
+            if sys.stderr.isatty() and len(sources) == 1
+            else None,
+            http_config=HttpConfig(read_timeout=timeout, retries=retries),
+            max_workers=jobs,
+        )
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except httpx.HTTPError as e:
+        print(f"Error downloading template: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if len(results) == 1:
+        result = results[0]
+        if result.status != "created":
+            print(f"Error: {result.message}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Initialized agentpack project in {result.directory}")
+        print("  - .devcontainer/")
+        print("  - agentpack.yml")
+        print()
+        print("Next steps:")
+        print("  1. Edit agentpack.yml (project name, commands, MCP servers)")
+        print("  2. Run: acpack generate --write")
+        return
+
+    for result in results:
+        if result.status == "created":
+            print(f"  created  {result.directory}")
+        else:
+            print(f"  {result.status:<8} {result.directory}: {result.message}")
+    counts = {
+        status: sum(1 for r in results if r.status == status)
+        for status in ("created", "skipped", "failed")
+    }
+    print(
+        f"Initialized {counts['created']} project(s), "
+        f"skipped {counts['skipped']}, failed {counts['failed']}"
+    )
+    if counts["skipped"] or counts["failed"]:
+        sys.exit(1)
+
+
+def _print_progress(received: int, total: int | None) -> None:
+    """Show template download progress on stderr."""
+    done = f"{received / 1024**2:.1f} MiB"
+    if total:
+        done += f" / {total / 1024**2:.1f} MiB"
+    end = "\n" if total is not None and received >= total else ""
+    print(f"\r  {done}", end=end, file=sys.stderr, flush=True)
+
+
+# Kept by `acpack cache prune` unless --max-size or --all is given
+DEFAULT_CACHE_BUDGET = "1G"
+
+cache_app = cyclopts.App(name="cache", help="Manage the template cache.")
+app.command(cache_app)
+
+
+@cache_app.command(name="list")
+def cache_list() -> None:
+    """List cached template archives."""
+    template_cache = TemplateCache()
+    entries = sorted(template_cache.entries(), key=lambda e: e.key)
+    for entry in entries:
+        print(f"{entry.key}  {entry.size} bytes  {entry.digest[:12]}")
+    print(f"Cache directory: {template_cache.root}")
+
+
+@cache_app.command(name="prune")
+def cache_prune(
+    *,
+    max_size: str | None = None,
+    clear_all: Annotated[bool, Parameter(name="--all")] = False,
+) -> None:
+    """Evict least recently used templates until the cache fits a size.
+
+    Args:
+        max_size: Maximum cache size to keep, e.g. 500M or 2G
+            (default: 1G).
+        clear_all: Remove every cached template.
+    """
+    if clear_all and max_size is not None:
+        print("Error: --all and --max-size are mutually exclusive", file=sys.stderr)
+        sys.exit(1)
+    try:
+        limit = 0 if clear_all else parse_size(max_size or DEFAULT_CACHE_BUDGET)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    result = TemplateCache().prune(limit)
+    for key in result.removed:
+        print(f"  - Removed {key}")
+    print(f"Freed {result.freed} bytes, {result.remaining} bytes remaining")
+
+
+firewall_app = cyclopts.App(name="firewall", help="Manage the devcontainer firewall.")
+app.command(firewall_app)
+
+
+@firewall_app.command(name="resolve")
+def firewall_resolve(
+    *,
+    directory: Path = Path("."),
+    output_format: Annotated[
+        Literal["ipset", "nft", "none"], Parameter(name="--format")
+    ] = "ipset",
+    refresh: bool = False,
+) -> None:
+    """Pre-resolve allowlisted domains into a cached set of CIDRs.
+
+    Args:
+        directory: Project directory.
+        output_format: Batch file for the firewall script to load.
+        refresh: Resolve every domain even if its cached addresses are fresh.
     """
     directory = directory.resolve()
 
-    # Check for existing files
-    if not force:
-        if (directory / "agentpack.yml").exists():
+    try:
+        manifest = load_manifest(directory)
+    except ManifestNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except ManifestParseError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    result = resolve_firewall(
+        manifest, directory, refresh=refresh, set_format=output_format
+    )
+    for domain, error in sorted(result.errors.items()):
+        print(f"Warning: Could not resolve {domain}: {error}", file=sys.stderr)
+    print(
+        f"Resolved {len(result.resolved)} domain(s), "
+        f"{len(result.reused)} cached, {len(result.errors)} failed: "
+        f"{len(result.cache.cidrs)} CIDR(s)"
+    )
+    for path in result.written:
+        print(f"  - {path.relative_to(directory)}")
+
+
+bench_app = cyclopts.App(name="bench", help="Benchmark the project setup.")
+app.command(bench_app)
+
+
+@bench_app.command(name="mcp")
+def bench_mcp(
+    *,
+    directory: Path = Path("."),
+    server: list[str] | None = None,
+    trials: int = DEFAULT_TRIALS,
+    timeout: float = DEFAULT_PROBE_TIMEOUT,
+    output: Path | None = None,
+) -> None:
+    """Measure cold and warm start latency of the configured MCP servers.
+
+    Each server is started ``trials`` times in turn. Every trial times the
+    initialize handshake (from process spawn) and tools/list, and samples
+    the server's resident memory. The first trial is the cold start;
+    percentiles are computed over the rest. Exits non-zero if any trial
+    fails.
+
+    Args:
+        directory: Project directory.
+        server: Benchmark only these servers.
+        trials: Starts per server.
+        timeout: Seconds a single trial may take.
+        output: Write the full results as JSON to this file.
+    """
+    directory = directory.resolve()
+
+    try:
+        manifest = load_manifest(directory)
+    except ManifestNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except ManifestParseError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        results = run_bench(
+            manifest, directory, names=server, trials=trials, timeout=timeout
+        )
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    reports = [r.to_dict() for r in results]
+    for report in reports:
+        print(f"{report['name']} ({report['transport']})")
+        if cold := report["cold"]:
             print(
-                "Error: agentpack.yml already exists. Use --force to overwrite.",
-                file=sys.stderr,
+                f"  cold   initialize {cold['initialize_ms']:.1f} ms, "
+                f"tools/list {cold['tools_list_ms']:.1f} ms"
             )
-            sys.exit(1)
-        if (directory / ".devcontainer").exists():
+        warm = report["warm"]
+        for label, key in (
+            ("initialize", "initialize_ms"),
+            ("tools/list", "tools_list_ms"),
+        ):
+            if stats := warm[key]:
+                print(
+                    f"  warm   {label} p50 {stats['p50']:.1f} / p95 {stats['p95']:.1f} "
+                    f"/ p99 {stats['p99']:.1f} ms"
+                )
+        if rss := warm["rss_bytes"]:
+            print(f"  rss    p50 {rss['p50'] / 1024**2:.1f} MiB")
+        elif cold and cold["rss_bytes"]:
+            print(f"  rss    {cold['rss_bytes'] / 1024**2:.1f} MiB")
+        for error in dict.fromkeys(report["errors"]):
+            print(f"  error  {error}", file=sys.stderr)
+
+    if output is not None:
+        output.write_text(
+            json.dumps({"trials": trials, "servers": reports}, indent=2) + "\n"
+        )
+        print(f"Results written to {output}")
+
+    if any(r.errors for r in results):
+        sys.exit(1)
+
+
+mcp_app = cyclopts.App(name="mcp", help="Inspect the configured MCP servers.")
+app.command(mcp_app)
+
+
+@mcp_app.command(name="footprint")
+def mcp_footprint(
+    *,
+    directory: Path = Path("."),
+    server: list[str] | None = None,
+    budget: int = DEFAULT_TOKEN_BUDGET,
+    timeout: float = DEFAULT_PROBE_TIMEOUT,
+    output_format: Annotated[Literal["text", "json"], Parameter(name="--format")] = (
+        "text"
+    ),
+) -> None:
+    """Estimate how much agent context each MCP server's tools take.
+
+    Every server is connected concurrently and its tools/list catalog is
+    measured in bytes and approximate tokens, per server and per tool.
+    Tools hidden by enabled_tools/disabled_tools are left out of the totals.
+    Exits non-zero if a server fails or the total exceeds the budget.
+
+    Args:
+        directory: Project directory.
+        server: Measure only these servers.
+        budget: Token budget for all tool catalogs together.
+        timeout: Seconds each server gets to list its tools.
+        output_format: Output format (text or json).
+    """
+    directory = directory.resolve()
+
+    try:
+        manifest = load_manifest(directory)
+    except ManifestNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except ManifestParseError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        results = run_footprint(manifest, directory, names=server, timeout=timeout)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    total_tokens = sum(r.tokens for r in results)
+    over_budget = total_tokens > budget
+    failed = [r for r in results if r.error]
+
+    if output_format == "json":
+        report = {
+            "budget": budget,
+            "total_tokens": total_tokens,
+            "total_bytes": sum(r.bytes for r in results),
+            "within_budget": not over_budget,
+            "servers": [
+                {
+                    "name": r.name,
+                    "transport": r.transport,
+                    "bytes": r.bytes,
+                    "tokens": r.tokens,
+                    "unfiltered_tokens": r.unfiltered_tokens,
+                    "error": r.error,
+                    "tools": [
+                        {"name": t.name, "bytes": t.bytes, "tokens": t.tokens}
+                        for t in r.tools
+                    ],
+                    "hidden_tools": [t.name for t in r.hidden],
+                }
+                for r in results
+            ],
+        }
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        for r in results:
+            if r.error:
+                print(f"{r.name} ({r.transport}): failed: {r.error}")
+                continue
+            hidden = (
+                f" ({len(r.hidden)} hidden, ~{r.unfiltered_tokens:,} unfiltered)"
+                if r.hidden
+                else ""
+            )
+            print(
+                f"{r.name} ({r.transport}): {len(r.tools)} tool(s), "
+                f"{r.bytes:,} bytes, ~{r.tokens:,} tokens{hidden}"
+            )
+            for tool in sorted(r.tools, key=lambda t: t.tokens, reverse=True):
+                print(f"    {tool.name:<32} {tool.bytes:>8,} bytes  ~{tool.tokens:,}")
+        share = f" ({total_tokens / budget:.0%})" if budget > 0 else ""
+        print(f"Total: ~{total_tokens:,} / {budget:,} tokens{share}")
+        if over_budget:
             print(
-                "Error: .devcontainer already exists. Use --force to overwrite.",
+                f"Error: Tool catalogs exceed the budget by "
+                f"~{total_tokens - budget:,} tokens",
                 file=sys.stderr,
             )
-            sys.exit(1)
 
-    directory.mkdir(parents=True, exist_ok=True)
+    if failed or over_budget:
+        sys.exit(1)
+
+
+@mcp_app.command(name="serve")
+def mcp_serve(
+    *,
+    directory: Path = Path("."),
+    server: list[str] | None = None,
+    host: str | None = None,
+    port: int | None = None,
+) -> None:
+    """Run shared stdio MCP servers once for every agent session.
+
+    Each server marked shared: true is started once and exposed over
+    Streamable HTTP at http://<host>:<port>/mcp/<name>, which is where
+    the generated configs point. Runs until interrupted.
+
+    Args:
+        directory: Project directory.
+        server: Serve these stdio servers instead of the shared ones.
+        host: Address to listen on (default: mcp.proxy.host, 127.0.0.1).
+        port: Port to listen on (default: mcp.proxy.port, 8765).
+    """
+    directory = directory.resolve()
 
     try:
-        source = parse_template_source(template)
-        print(f"Downloading template from {template}...")
-        download_template(source, directory)
-    except ValueError as e:
+        manifest = load_manifest(directory)
+    except ManifestNotFoundError as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
-    except httpx.HTTPStatusError as e:
-        print(f"Error downloading template: {e}", file=sys.stderr)
+    except ManifestParseError as e:
+        print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
 
-    # Only generate skeleton if template didn't include agentpack.yml
-    if not (directory / "agentpack.yml").exists():
-        generate_skeleton(directory, stack)
+    try:
+        proxy = MCPProxy.from_manifest(manifest, directory, server)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(2)
+
+    async def serve() -> None:
+        try:
+            errors = await proxy.start(
+                host or manifest.mcp.proxy.host, port or manifest.mcp.proxy.port
+            )
+            listening = MCPProxyConfig(
+                host=host or manifest.mcp.proxy.host, port=proxy.port
+            )
+            for name, error in errors.items():
+                if error:
+                    print(f"Warning: {name} failed to start: {error}", file=sys.stderr)
+                print(f"  - {name}: {proxy_url(listening, name)}", flush=True)
+            print("Serving shared MCP servers (Ctrl+C to stop)", flush=True)
+            await proxy.serve_forever()
+        finally:
+            await proxy.close()
 
-    print(f"Initialized agentpack project in {directory}")
-    print("  - .devcontainer/")
-    print("  - agentpack.yml")
-    print()
-    print("Next steps:")
-    print("  1. Edit agentpack.yml (project name, commands, MCP servers)")
-    print("  2. Run: acpack generate --write")
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Error: Cannot listen: {e}", file=sys.stderr)
+        sys.exit(1)
 
 
 if __name__ == "__main__":
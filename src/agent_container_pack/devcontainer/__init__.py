@@ -1,5 +1,55 @@
 """Devcontainer configuration utilities."""
 
-from agent_container_pack.devcontainer.firewall import update_firewall
+from agent_container_pack.devcontainer.firewall import (
+    allowlist_domains,
+    dnsmasq_domains,
+    fold_domains,
+    read_allowlist,
+    render_dnsmasq_ipset,
+    render_domains_file,
+    render_ipset_restore,
+    render_nft_set,
+    update_firewall,
+)
+from agent_container_pack.devcontainer.packages import (
+    check_preinstall,
+    parse_package_command,
+    preinstall_packages,
+    preinstalled_command,
+    render_install_script,
+    update_preinstall,
+)
+from agent_container_pack.devcontainer.resolve import (
+    AddressCache,
+    ResolvedAddress,
+    Resolver,
+    SystemResolver,
+    collapse_cidrs,
+    resolve_domains,
+    resolve_firewall,
+)
 
-__all__ = ["update_firewall"]
+__all__ = [
+    "AddressCache",
+    "ResolvedAddress",
+    "Resolver",
+    "SystemResolver",
+    "allowlist_domains",
+    "check_preinstall",
+    "collapse_cidrs",
+    "dnsmasq_domains",
+    "fold_domains",
+    "parse_package_command",
+    "preinstall_packages",
+    "preinstalled_command",
+    "read_allowlist",
+    "render_dnsmasq_ipset",
+    "render_domains_file",
+    "render_install_script",
+    "render_ipset_restore",
+    "render_nft_set",
+    "resolve_domains",
+    "resolve_firewall",
+    "update_firewall",
+    "update_preinstall",
+]
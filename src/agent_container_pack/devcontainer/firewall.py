@@ -1,12 +1,31 @@
 """Update init-firewall.sh with MCP server domains."""
 
+import difflib
+import ipaddress
 import re
-from dataclasses import dataclass
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
 from pathlib import Path
 from urllib.parse import urlparse
 
 from agent_container_pack.manifest.schema import Manifest, MCPServerHTTP
 
+# Domain list loaded by firewall scripts that reference it
+DOMAINS_FILE = "allowed-domains.txt"
+DOMAINS_FILE_HEADER = "# Generated by acpack from agentpack.yml. One domain per line.\n"
+
+# dnsmasq ipset config; written when the firewall script loads it
+DNSMASQ_FILE = "allowed-domains.dnsmasq"
+DNSMASQ_FILE_HEADER = "# Generated by acpack from agentpack.yml. Do not edit.\n"
+
+DEFAULT_SET_NAME = "allowed-domains"
+
+# Entries between these markers are owned by acpack
+MANAGED_BEGIN = "# BEGIN acpack managed"
+MANAGED_END = "# END acpack managed"
+
+ALLOWED_DOMAINS_PATTERN = re.compile(r"(ALLOWED_DOMAINS=\(\s*\n)(.*?)(\))", re.DOTALL)
+
 
 @dataclass
 class FirewallUpdateResult:
@@ -15,6 +34,13 @@ class FirewallUpdateResult:
     success: bool
     message: str
     domains_added: int = 0
+    domains_removed: int = 0
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+    diff: str = ""
+    path: Path | None = None
+    # Set when firewall.allow rules could not be applied
+    warning: str | None = None
 
 
 def extract_domains(manifest: Manifest) -> set[str]:
@@ -37,65 +63,403 @@ def extract_domains(manifest: Manifest) -> set[str]:
     return domains
 
 
-def update_firewall(manifest: Manifest, project_dir: Path) -> FirewallUpdateResult:
-    """Update init-firewall.sh with MCP server domains.
+def is_wildcard(rule: str) -> bool:
+    """Check whether an allowlist entry is a ``*.domain`` or ``.domain`` rule."""
+    return rule.startswith(("*.", "."))
+
+
+def fold_domains(hostnames: Iterable[str], rules: Iterable[str]) -> set[str]:
+    """Fold hostnames covered by wildcard or suffix rules into the rules.
+
+    ``*.vendor.com`` covers every subdomain of ``vendor.com``;
+    ``.vendor.com`` also covers ``vendor.com`` itself. Each hostname is
+    checked against its own suffixes, so the cost does not grow with the
+    number of rules.
 
     Args:
-        manifest: Validated manifest.
-        project_dir: Project directory.
+        hostnames: Exact hostnames, e.g. from MCP server URLs.
+        rules: Allow rules from the manifest.
+
+    Returns:
+        The rules plus every hostname no rule covers.
+    """
+    rules = set(rules)
+    subdomains = {rule[2:] for rule in rules if rule.startswith("*.")}
+    suffixes = {rule[1:] for rule in rules if rule.startswith(".")}
+
+    def covered(hostname: str) -> bool:
+        labels = hostname.lower().rstrip(".").split(".")
+        for i in range(len(labels)):
+            suffix = ".".join(labels[i:])
+            if suffix in suffixes or (i > 0 and suffix in subdomains):
+                return True
+        return False
+
+    return rules | {hostname for hostname in hostnames if not covered(hostname)}
+
+
+def allowlist_domains(manifest: Manifest) -> set[str]:
+    """Resolvable allowlist entries: MCP hosts plus exact-host allow rules.
+
+    Wildcard and suffix rules are left out, since a firewall that resolves
+    each entry (``dig`` in ``init-firewall.sh``, :func:`resolve_firewall`)
+    cannot resolve them; hostnames they cover are kept individually.
+    """
+    rules = {rule for rule in manifest.firewall.allow if not is_wildcard(rule)}
+    return extract_domains(manifest) | rules
+
+
+def dnsmasq_domains(manifest: Manifest) -> set[str]:
+    """Allowlist entries for dnsmasq, with hosts folded into allow rules."""
+    return fold_domains(extract_domains(manifest), manifest.firewall.allow)
+
+
+def read_domains_file(path: Path) -> set[str]:
+    """Read a domain list, ignoring blank lines and ``#`` comments."""
+    if not path.exists():
+        return set()
+    return {
+        line.strip()
+        for line in path.read_text().splitlines()
+        if line.strip() and not line.lstrip().startswith("#")
+    }
+
+
+def read_allowlist(project_dir: Path) -> set[str]:
+    """Read the domains already allowed by the devcontainer firewall.
+
+    Combines the ``ALLOWED_DOMAINS`` array of ``init-firewall.sh`` and
+    ``allowed-domains.txt``.
+    """
+    devcontainer = project_dir / ".devcontainer"
+    domains = read_domains_file(devcontainer / DOMAINS_FILE)
+    script = devcontainer / "init-firewall.sh"
+    if script.exists():
+        match = ALLOWED_DOMAINS_PATTERN.search(script.read_text())
+        if match:
+            domains |= set(re.findall(r'"([^"]+)"', match.group(2)))
+    return domains
+
+
+def render_domains_file(domains: Iterable[str]) -> str:
+    """Render a domain list with every domain in the managed section."""
+    lines = _with_managed([], sorted(set(domains)), str, "")
+    return DOMAINS_FILE_HEADER + "".join(f"{line}\n" for line in lines)
+
+
+def render_dnsmasq_ipset(
+    domains: Iterable[str], set_name: str = DEFAULT_SET_NAME
+) -> str:
+    """Render dnsmasq ``ipset=`` lines for an allowlist.
+
+    dnsmasq adds the addresses it resolves for a domain and all of its
+    subdomains to the set, which is how wildcard and suffix rules can be
+    enforced by an IP-based firewall.
+
+    Args:
+        domains: Allowlist entries (hostnames, ``*.domain`` or ``.domain``).
+        set_name: ipset to add resolved addresses to.
+
+    Returns:
+        dnsmasq configuration lines.
+    """
+    names = sorted({domain.removeprefix("*.").lstrip(".") for domain in domains})
+    return "".join(f"ipset=/{name}/{set_name}\n" for name in names)
+
+
+def _split_networks(
+    addresses: Iterable[str],
+) -> tuple[list[ipaddress.IPv4Network], list[ipaddress.IPv6Network]]:
+    networks = {ipaddress.ip_network(address, strict=False) for address in addresses}
+    v4 = sorted(n for n in networks if isinstance(n, ipaddress.IPv4Network))
+    v6 = sorted(n for n in networks if isinstance(n, ipaddress.IPv6Network))
+    return v4, v6
+
+
+def render_ipset_restore(
+    addresses: Iterable[str], set_name: str = DEFAULT_SET_NAME
+) -> str:
+    """Render an ``ipset restore`` batch for resolved addresses.
+
+    Each set is filled under a temporary name and swapped in, so packet
+    matching never sees a partially loaded set. IPv6 addresses go to a
+    ``<set_name>-v6`` set.
+
+    Args:
+        addresses: IP addresses or CIDR networks.
+        set_name: Name of the IPv4 set.
+
+    Returns:
+        Input for ``ipset restore``.
+
+    Raises:
+        ValueError: If an address is invalid.
+    """
+    v4, v6 = _split_networks(addresses)
+    lines: list[str] = []
+    for name, family, networks in (
+        (set_name, "inet", v4),
+        (f"{set_name}-v6", "inet6", v6),
+    ):
+        if family == "inet6" and not networks:
+            continue
+        tmp = f"{name}-tmp"
+        lines.append(f"create {name} hash:net family {family} -exist")
+        lines.append(f"create {tmp} hash:net family {family} -exist")
+        lines.append(f"flush {tmp}")
+        lines.extend(f"add {tmp} {network} -exist" for network in networks)
+        lines.append(f"swap {tmp} {name}")
+        lines.append(f"destroy {tmp}")
+    return "\n".join(lines) + "\n"
+
+
+def render_nft_set(
+    addresses: Iterable[str],
+    set_name: str = DEFAULT_SET_NAME,
+    *,
+    table: str = "filter",
+    family: str = "inet",
+) -> str:
+    """Render an ``nft -f`` script loading resolved addresses into sets.
+
+    ``nft -f`` applies the whole file as one transaction. IPv6 addresses go
+    to a ``<set_name>-v6`` set.
+
+    Args:
+        addresses: IP addresses or CIDR networks.
+        set_name: Name of the IPv4 set.
+        table: nftables table holding the sets.
+        family: nftables table family.
 
     Returns:
-        Result of update operation.
+        Input for ``nft -f``.
+
+    Raises:
+        ValueError: If an address is invalid.
     """
-    domains = extract_domains(manifest)
+    v4, v6 = _split_networks(addresses)
+    lines = [f"add table {family} {table}"]
+    for name, addr_type, networks in (
+        (set_name, "ipv4_addr", v4),
+        (f"{set_name}-v6", "ipv6_addr", v6),
+    ):
+        lines.append(
+            f"add set {family} {table} {name} {{ type {addr_type}; flags interval; }}"
+        )
+        lines.append(f"flush set {family} {table} {name}")
+        if networks:
+            elements = ", ".join(str(network) for network in networks)
+            lines.append(f"add element {family} {table} {name} {{ {elements} }}")
+    return "\n".join(lines) + "\n"
+
+
+def _split_managed(
+    lines: list[str], extract: Callable[[str], list[str]]
+) -> tuple[list[str], list[str]]:
+    """Split lines into hand-written lines and acpack-managed domains."""
+    manual: list[str] = []
+    managed: list[str] = []
+    inside = False
+    for line in lines:
+        marker = line.strip()
+        if marker == MANAGED_BEGIN:
+            inside = True
+        elif marker == MANAGED_END:
+            inside = False
+        elif inside:
+            managed.extend(extract(line))
+        else:
+            manual.append(line)
+    return manual, managed
+
+
+def _with_managed(
+    manual: list[str], domains: list[str], render: Callable[[str], str], indent: str
+) -> list[str]:
+    """Append a managed section holding ``domains`` to hand-written lines."""
     if not domains:
+        return manual
+    return [
+        *manual,
+        f"{indent}{MANAGED_BEGIN}",
+        *(f"{indent}{render(domain)}" for domain in domains),
+        f"{indent}{MANAGED_END}",
+    ]
+
+
+def _script_domains(line: str) -> list[str]:
+    return re.findall(r'"([^"]+)"', line)
+
+
+def _file_domains(line: str) -> list[str]:
+    line = line.strip()
+    return [line] if line and not line.startswith("#") else []
+
+
+def _sync_managed(
+    path: Path,
+    content: str,
+    lines: list[str],
+    domains: set[str],
+    *,
+    extract: Callable[[str], list[str]],
+    render: Callable[[str], str],
+    indent: str,
+    rebuild: Callable[[list[str]], str],
+) -> FirewallUpdateResult:
+    """Replace the managed section of an allowlist if its domains changed.
+
+    Hand-written entries are kept verbatim and never duplicated in the
+    managed section. Managed entries no longer in ``domains`` are pruned.
+    """
+    manual, old_managed = _split_managed(lines, extract)
+    manual_domains = {d for line in manual for d in extract(line)}
+    managed = sorted(domains - manual_domains)
+
+    added = sorted(set(managed) - set(old_managed))
+    removed = sorted(set(old_managed) - set(managed))
+    if managed == old_managed and path.exists():
         return FirewallUpdateResult(
             success=True,
-            message="No HTTP MCP servers to add",
+            message="Managed domains unchanged",
             domains_added=0,
         )
 
+    new_content = rebuild(_with_managed(manual, managed, render, indent))
+    path.write_text(new_content)
+    diff = "".join(
+        difflib.unified_diff(
+            content.splitlines(keepends=True),
+            new_content.splitlines(keepends=True),
+            fromfile=f"a/{path.name}",
+            tofile=f"b/{path.name}",
+        )
+    )
+    changes = [f"+{d}" for d in added] + [f"-{d}" for d in removed]
+    return FirewallUpdateResult(
+        success=True,
+        message=f"Updated domains: {', '.join(changes) or 'reordered'}",
+        domains_added=len(added),
+        domains_removed=len(removed),
+        added=added,
+        removed=removed,
+        diff=diff,
+        path=path,
+    )
+
+
+def _update_domains_file(domains: set[str], path: Path) -> FirewallUpdateResult:
+    """Sync domains into the data file loaded by the firewall script."""
+    content = path.read_text() if path.exists() else ""
+    lines = content.splitlines() if content else [DOMAINS_FILE_HEADER.rstrip("\n")]
+    return _sync_managed(
+        path,
+        content,
+        lines,
+        domains,
+        extract=_file_domains,
+        render=str,
+        indent="",
+        rebuild=lambda lines: "".join(f"{line}\n" for line in lines),
+    )
+
+
+def update_firewall(manifest: Manifest, project_dir: Path) -> FirewallUpdateResult:
+    """Sync MCP server domains into the devcontainer firewall allowlist.
+
+    The allowlist only gets entries that resolve (see
+    :func:`allowlist_domains`). If the script references
+    ``allowed-domains.dnsmasq``, the ``ipset=`` config for every domain is
+    written there, with hostnames folded into the ``firewall.allow``
+    wildcard and suffix rules that cover them (see :func:`fold_domains`);
+    dnsmasq then fills the set with each subdomain as it is resolved, and
+    only uncovered hosts stay in the allowlist. Without it, wildcard and
+    suffix rules cannot be applied and the result carries a warning.
+
+    Domains written by acpack live between ``# BEGIN acpack managed`` and
+    ``# END acpack managed`` markers; everything else is hand-written and
+    left untouched. Managed domains that are no longer in the manifest are
+    removed, and the file is only rewritten when the managed set changes.
+
+    If the script references ``allowed-domains.txt``, the domains are
+    written to ``.devcontainer/allowed-domains.txt`` for the script to
+    load in one batch and the script itself is left untouched. Otherwise
+    they are kept in its ``ALLOWED_DOMAINS`` array.
+
+    Args:
+        manifest: Validated manifest.
+        project_dir: Project directory.
+
+    Returns:
+        Result of update operation, with a diff of the change.
+    """
     firewall_script = project_dir / ".devcontainer" / "init-firewall.sh"
+    domains = allowlist_domains(manifest)
     if not firewall_script.exists():
+        if not domains:
+            return FirewallUpdateResult(
+                success=True,
+                message="No HTTP MCP servers to add",
+                domains_added=0,
+            )
         return FirewallUpdateResult(
             success=False,
             message=f"Firewall script not found: {firewall_script}",
         )
 
     content = firewall_script.read_text()
+    warning = None
+    if DNSMASQ_FILE in content:
+        folded = dnsmasq_domains(manifest)
+        config = DNSMASQ_FILE_HEADER + render_dnsmasq_ipset(folded)
+        dnsmasq = firewall_script.parent / DNSMASQ_FILE
+        if not dnsmasq.exists() or dnsmasq.read_text() != config:
+            dnsmasq.write_text(config)
+        domains = {domain for domain in folded if not is_wildcard(domain)}
+    elif wildcards := sorted(filter(is_wildcard, manifest.firewall.allow)):
+        warning = (
+            f"{firewall_script.name} does not load {DNSMASQ_FILE}, so wildcard "
+            f"rules are not applied: {', '.join(wildcards)}"
+        )
+
+    result = _update_script(firewall_script, content, domains)
+    result.warning = warning
+    return result
+
+
+def _update_script(
+    firewall_script: Path, content: str, domains: set[str]
+) -> FirewallUpdateResult:
+    """Write ``domains`` to the domains file or the script's array."""
+    if DOMAINS_FILE in content:
+        return _update_domains_file(domains, firewall_script.parent / DOMAINS_FILE)
 
     # Find ALLOWED_DOMAINS array
-    pattern = r"(ALLOWED_DOMAINS=\(\s*\n)(.*?)(\))"
-    match = re.search(pattern, content, re.DOTALL)
+    match = ALLOWED_DOMAINS_PATTERN.search(content)
 
     if not match:
+        if not domains:
+            return FirewallUpdateResult(
+                success=True,
+                message="No HTTP MCP servers to add",
+                domains_added=0,
+            )
         return FirewallUpdateResult(
             success=False,
             message="Could not find ALLOWED_DOMAINS array in firewall script",
         )
 
-    # Get existing domains
-    existing_block = match.group(2)
-    existing_domains = set(re.findall(r'"([^"]+)"', existing_block))
+    def rebuild(lines: list[str]) -> str:
+        block = "".join(f"{line}\n" for line in lines)
+        return content[: match.start(2)] + block + content[match.end(2) :]
 
-    # Add new domains
-    new_domains = domains - existing_domains
-    if not new_domains:
-        return FirewallUpdateResult(
-            success=True,
-            message="All domains already present",
-            domains_added=0,
-        )
-
-    # Build new array content
-    all_domains = sorted(existing_domains | new_domains)
-    new_block = "\n".join(f'    "{domain}"' for domain in all_domains)
-
-    new_content = content[: match.start(2)] + new_block + content[match.end(2) :]
-    firewall_script.write_text(new_content)
-
-    return FirewallUpdateResult(
-        success=True,
-        message=f"Added domains: {sorted(new_domains)}",
-        domains_added=len(new_domains),
+    return _sync_managed(
+        firewall_script,
+        content,
+        match.group(2).splitlines(),
+        domains,
+        extract=_script_domains,
+        render=lambda domain: f'"{domain}"',
+        indent="    ",
+        rebuild=rebuild,
     )
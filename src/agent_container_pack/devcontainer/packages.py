@@ -0,0 +1,328 @@
+"""Pre-install npx/uvx MCP server packages at devcontainer build time."""
+
+import re
+import shlex
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Literal
+
+from agent_container_pack.manifest.schema import Manifest, MCPServerStdio
+
+INSTALL_SCRIPT = "install-mcp-servers.sh"
+
+# Install prefix inside the image; every server gets a launcher in bin/
+PREINSTALL_PREFIX = "/opt/acpack/mcp"
+
+# Dockerfile lines between these markers are owned by acpack
+MANAGED_BEGIN = "# BEGIN acpack managed"
+MANAGED_END = "# END acpack managed"
+
+NPX_FLAGS = {"-y", "--yes", "-q", "--quiet"}
+
+BUILD_CONTEXT_PATTERN = re.compile(r'"context"\s*:\s*"([^"]*)"')
+
+# Resolves the executable npx would run for a package (same rules as npx)
+RESOLVE_NPM_BIN = (
+    "const [file, name] = process.argv.slice(1);"
+    " const bin = require(file).bin;"
+    ' const base = name.split("/").pop();'
+    ' const names = typeof bin === "string" ? [base] : Object.keys(bin || {});'
+    " const found = names.length === 1 ? names[0] : names.find((n) => n === base);"
+    " if (!found) process.exit(1);"
+    " console.log(found);"
+)
+
+
+@dataclass
+class PackageCommand:
+    """A stdio server launched through ``npx`` or ``uvx``."""
+
+    runner: Literal["npx", "uvx"]
+    # Install spec, e.g. "@upstash/context7-mcp@latest" or "mcp-server-fetch==1.0"
+    package: str
+    # Executable to link: npm package name, or the uv tool's command
+    executable: str
+    args: list[str] = field(default_factory=list)
+
+
+@dataclass
+class PreinstallUpdateResult:
+    """Result of writing the install script and Dockerfile step."""
+
+    success: bool
+    message: str
+    packages: list[str] = field(default_factory=list)
+    path: Path | None = None
+
+
+def _package_name(spec: str) -> str:
+    """npm package name without its version (``@scope/name@1`` -> ``@scope/name``)."""
+    at = spec.find("@", 1)
+    return spec[:at] if at > 0 else spec
+
+
+def _tool_name(spec: str) -> str:
+    """uv tool command name without version or extras."""
+    return re.split(r"[@=<>!~\[; ]", spec, maxsplit=1)[0]
+
+
+def parse_package_command(command: list[str]) -> PackageCommand | None:
+    """Recognize ``npx [-y] pkg ...`` and ``uvx [--from spec] pkg ...``.
+
+    Commands with other runner options (``npx -p``, ``uvx --with``, ...)
+    are not recognized, since the package they run cannot be pre-installed
+    as a single executable.
+
+    Returns:
+        The package command, or None if ``command`` is not one.
+    """
+    runner, *rest = command
+    runner_name = Path(runner).name
+    if runner_name == "npx":
+        while rest and rest[0] in NPX_FLAGS:
+            rest = rest[1:]
+        if not rest or rest[0].startswith("-"):
+            return None
+        package, *args = rest
+        return PackageCommand("npx", package, _package_name(package), args)
+    if runner_name == "uvx":
+        source = None
+        if rest and rest[0] == "--from" and len(rest) > 1:
+            source, rest = rest[1], rest[2:]
+        elif rest and rest[0].startswith("--from="):
+            source, rest = rest[0].removeprefix("--from="), rest[1:]
+        if not rest or rest[0].startswith("-"):
+            return None
+        tool, *args = rest
+        return PackageCommand("uvx", source or tool, _tool_name(tool), args)
+    return None
+
+
+def launcher_path(name: str) -> str:
+    """Path of the pre-installed launcher for a server."""
+    return f"{PREINSTALL_PREFIX}/bin/{re.sub(r'[^A-Za-z0-9._-]', '_', name)}"
+
+
+def preinstall_packages(manifest: Manifest) -> dict[str, PackageCommand]:
+    """Stdio servers whose packages can be pre-installed, in manifest order."""
+    packages: dict[str, PackageCommand] = {}
+    for name, server in manifest.mcp.servers.items():
+        if isinstance(server, MCPServerStdio):
+            package = parse_package_command(server.command)
+            if package is not None:
+                packages[name] = package
+    return packages
+
+
+def check_preinstall(manifest: Manifest, project_dir: Path) -> bool:
+    """Check whether the generated configs can run pre-installed launchers.
+
+    Launchers only exist once :func:`update_preinstall` has added the
+    install step to ``.devcontainer/Dockerfile`` and the image is rebuilt.
+
+    Returns:
+        True if ``mcp.preinstall`` is enabled and there are packages to
+        install, False if configs should keep the original commands.
+
+    Raises:
+        ValueError: If ``mcp.preinstall`` is enabled but there is no
+            Dockerfile to add the install step to (e.g. an image-based
+            devcontainer).
+    """
+    if not manifest.mcp.preinstall or not preinstall_packages(manifest):
+        return False
+    dockerfile = project_dir / ".devcontainer" / "Dockerfile"
+    if not dockerfile.exists():
+        raise ValueError(
+            f"mcp.preinstall needs a Dockerfile to add the install step to, "
+            f"but {dockerfile} does not exist"
+        )
+    return True
+
+
+def preinstalled_command(
+    manifest: Manifest, name: str, server: MCPServerStdio
+) -> list[str]:
+    """Command that launches a server, using its launcher if pre-installed.
+
+    The launcher is only used when ``mcp.preinstall`` is enabled and the
+    command runs an npx or uvx package. Callers must make sure the install
+    step exists (see :func:`check_preinstall`).
+    """
+    if not manifest.mcp.preinstall:
+        return server.command
+    package = parse_package_command(server.command)
+    if package is None:
+        return server.command
+    return [launcher_path(name), *package.args]
+
+
+def render_install_script(packages: dict[str, PackageCommand]) -> str:
+    """Render the build step installing every package and linking launchers.
+
+    npm packages go into one prefix with a single ``npm install``; uv
+    tools get their own environments (and a shared managed Python) under
+    the same root, so nothing lands in a user's home directory. The step
+    runs as root before the image's ``USER``, so the script first checks
+    that the tools it needs are on root's PATH at that point.
+    """
+    npm = {name: p for name, p in packages.items() if p.runner == "npx"}
+    uv = {name: p for name, p in packages.items() if p.runner == "uvx"}
+    tools = (["npm", "node"] if npm else []) + (["uv"] if uv else [])
+    prefix = PREINSTALL_PREFIX
+    lines = [
+        "#!/usr/bin/env bash",
+        "# Generated by acpack from agentpack.yml. Do not edit.",
+        "# Installs the npx/uvx MCP server packages into the image so agent",
+        "# sessions start them without downloading anything.",
+        "set -euo pipefail",
+        "",
+        f"for tool in {' '.join(tools)}; do",
+        '    if ! command -v "$tool" >/dev/null 2>&1; then',
+        f'        echo "{INSTALL_SCRIPT}: $tool is not on PATH for $(id -un)." \\',
+        f"            \"Install it in the Dockerfile before the '{MANAGED_BEGIN}' block.\" >&2",
+        "        exit 1",
+        "    fi",
+        "done",
+        "",
+        f"PREFIX={prefix}",
+        'mkdir -p "$PREFIX/bin"',
+    ]
+    if npm:
+        specs = " ".join(
+            shlex.quote(p) for p in dict.fromkeys(p.package for p in npm.values())
+        )
+        lines += [
+            "",
+            "# npm packages (run via npx)",
+            f'npm install --prefix "$PREFIX/npm" --no-audit --no-fund {specs}',
+            "link_npm() {",
+            "    local bin",
+            f"    bin=$(node -e {shlex.quote(RESOLVE_NPM_BIN)} \\",
+            '        "$PREFIX/npm/node_modules/$2/package.json" "$2")',
+            '    ln -sf "$PREFIX/npm/node_modules/.bin/$bin" "$PREFIX/bin/$1"',
+            "}",
+        ]
+        lines += [
+            f"link_npm {shlex.quote(Path(launcher_path(name)).name)} "
+            f"{shlex.quote(p.executable)}"
+            for name, p in npm.items()
+        ]
+    if uv:
+        lines += [
+            "",
+            "# uv tools (run via uvx)",
+            'export UV_TOOL_DIR="$PREFIX/uv/tools" UV_TOOL_BIN_DIR="$PREFIX/uv/bin"',
+            'export UV_PYTHON_INSTALL_DIR="$PREFIX/uv/python"',
+        ]
+        lines += [
+            f"uv tool install {shlex.quote(spec)}"
+            for spec in dict.fromkeys(p.package for p in uv.values())
+        ]
+        lines += [
+            f'ln -sf "$PREFIX/uv/bin/"{shlex.quote(p.executable)} '
+            f'"$PREFIX/bin/"{shlex.quote(Path(launcher_path(name)).name)}'
+            for name, p in uv.items()
+        ]
+    lines += ["", 'chmod -R a+rX "$PREFIX"', ""]
+    return "\n".join(lines)
+
+
+def _script_source(devcontainer: Path) -> str:
+    """Path of the install script relative to the Docker build context.
+
+    The context comes from ``build.context`` in devcontainer.json and
+    defaults to the ``.devcontainer`` directory itself.
+    """
+    config = devcontainer / "devcontainer.json"
+    context = devcontainer.resolve()
+    if config.exists() and (match := BUILD_CONTEXT_PATTERN.search(config.read_text())):
+        context = (devcontainer / match.group(1)).resolve()
+    script = (devcontainer / INSTALL_SCRIPT).resolve()
+    try:
+        return script.relative_to(context).as_posix()
+    except ValueError:
+        return INSTALL_SCRIPT
+
+
+def render_dockerfile_step(source: str) -> list[str]:
+    """Managed Dockerfile lines running the install script."""
+    return [
+        MANAGED_BEGIN,
+        f"COPY {source} /tmp/acpack/{INSTALL_SCRIPT}",
+        f"RUN bash /tmp/acpack/{INSTALL_SCRIPT} && rm -rf /tmp/acpack",
+        MANAGED_END,
+    ]
+
+
+def _insert_step(lines: list[str], step: list[str]) -> list[str]:
+    """Replace the managed block, or add one before the final stage's USER.
+
+    An empty ``step`` removes the managed block.
+
+    Installing before the image switches to an unprivileged user keeps the
+    step running as root without changing the user the image ends with.
+    """
+    if MANAGED_BEGIN in lines and MANAGED_END in lines:
+        begin, end = lines.index(MANAGED_BEGIN), lines.index(MANAGED_END)
+        rest = lines[end + 1 :]
+        if not step and rest[:1] == [""]:
+            rest = rest[1:]
+        return lines[:begin] + step + rest
+    instructions = [line.strip().upper() for line in lines]
+    stage = max(
+        (i for i, line in enumerate(instructions) if line.startswith("FROM ")),
+        default=0,
+    )
+    for i in range(stage, len(lines)):
+        if instructions[i].startswith("USER "):
+            return lines[:i] + step + [""] + lines[i:]
+    return [*lines, "", *step] if lines else step
+
+
+def update_preinstall(manifest: Manifest, project_dir: Path) -> PreinstallUpdateResult:
+    """Write the install script and add its step to the devcontainer Dockerfile.
+
+    Does nothing unless ``mcp.preinstall`` is enabled. The script is
+    copied on its own, so the image layer is rebuilt only when the
+    package set changes. A managed block (and script) left behind by an
+    earlier run is removed when no package is left to install.
+
+    Args:
+        manifest: Validated manifest.
+        project_dir: Project directory.
+
+    Returns:
+        Result of the update, listing the pre-installed packages.
+    """
+    devcontainer = project_dir / ".devcontainer"
+    dockerfile = devcontainer / "Dockerfile"
+    packages = preinstall_packages(manifest) if manifest.mcp.preinstall else {}
+    specs = list(dict.fromkeys(p.package for p in packages.values()))
+
+    if not packages:
+        if dockerfile.exists():
+            lines = dockerfile.read_text().splitlines()
+            if MANAGED_BEGIN in lines and MANAGED_END in lines:
+                dockerfile.write_text("\n".join(_insert_step(lines, [])) + "\n")
+                (devcontainer / INSTALL_SCRIPT).unlink(missing_ok=True)
+        return PreinstallUpdateResult(
+            success=True, message="No MCP server packages to pre-install"
+        )
+    if not dockerfile.exists():
+        return PreinstallUpdateResult(
+            success=False, message=f"Dockerfile not found: {dockerfile}"
+        )
+
+    (devcontainer / INSTALL_SCRIPT).write_text(render_install_script(packages))
+    content = dockerfile.read_text()
+    step = render_dockerfile_step(_script_source(devcontainer))
+    updated = "\n".join(_insert_step(content.splitlines(), step)) + "\n"
+    if updated != content:
+        dockerfile.write_text(updated)
+    return PreinstallUpdateResult(
+        success=True,
+        message=f"Pre-installing {len(specs)} MCP server packages",
+        packages=specs,
+        path=dockerfile,
+    )
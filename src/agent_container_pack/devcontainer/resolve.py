@@ -0,0 +1,274 @@
+"""Pre-resolve firewall domains into a cached set of CIDRs."""
+
+import ipaddress
+import json
+import socket
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Literal, Protocol
+
+from agent_container_pack.devcontainer.firewall import (
+    allowlist_domains,
+    is_wildcard,
+    read_allowlist,
+    render_ipset_restore,
+    render_nft_set,
+)
+from agent_container_pack.manifest.schema import Manifest
+
+# Resolved addresses, stored next to init-firewall.sh
+ADDRESSES_FILE = "allowed-addresses.json"
+IPSET_FILE = "allowed-addresses.ipset"
+NFT_FILE = "allowed-addresses.nft"
+
+SetFormat = Literal["ipset", "nft", "none"]
+
+# getaddrinfo does not expose record TTLs
+DEFAULT_TTL = 300
+
+MAX_RESOLVE_WORKERS = 16
+
+
+@dataclass(frozen=True)
+class ResolvedAddress:
+    """One address record of a domain."""
+
+    address: str
+    ttl: int = DEFAULT_TTL
+
+
+class Resolver(Protocol):
+    """Resolves a domain to its address records."""
+
+    def resolve(self, domain: str) -> list[ResolvedAddress]:
+        """Return the domain's addresses.
+
+        Raises:
+            OSError: If the domain cannot be resolved.
+        """
+        ...
+
+
+class SystemResolver:
+    """Resolver using the system's ``getaddrinfo``.
+
+    Record TTLs are not available through ``getaddrinfo``; every address
+    gets ``ttl``.
+    """
+
+    def __init__(self, ttl: int = DEFAULT_TTL) -> None:
+        self.ttl = ttl
+
+    def resolve(self, domain: str) -> list[ResolvedAddress]:
+        infos = socket.getaddrinfo(domain, None, proto=socket.IPPROTO_TCP)
+        addresses = dict.fromkeys(str(info[4][0]) for info in infos)
+        return [ResolvedAddress(address, self.ttl) for address in addresses]
+
+
+@dataclass
+class DomainEntry:
+    """Cached resolution of one domain."""
+
+    addresses: list[str]
+    ttl: int
+    resolved_at: float
+
+    @property
+    def expires_at(self) -> float:
+        """Time after which the entry must be resolved again."""
+        return self.resolved_at + self.ttl
+
+
+@dataclass
+class AddressCache:
+    """Resolved addresses of all allowlisted domains."""
+
+    domains: dict[str, DomainEntry] = field(default_factory=dict)
+    cidrs: list[str] = field(default_factory=list)
+
+    @property
+    def expires_at(self) -> float | None:
+        """Earliest expiry of any domain, or None if empty."""
+        return min((e.expires_at for e in self.domains.values()), default=None)
+
+    @classmethod
+    def load(cls, path: Path) -> "AddressCache":
+        """Load a cache file; a missing or corrupt file gives an empty cache."""
+        try:
+            data = json.loads(path.read_text())
+            domains = {
+                domain: DomainEntry(**entry)
+                for domain, entry in data.get("domains", {}).items()
+            }
+        except (OSError, ValueError, TypeError):
+            return cls()
+        return cls(domains=domains, cidrs=list(data.get("cidrs", [])))
+
+    def dump(self) -> str:
+        """Serialize the cache as JSON."""
+        data = {
+            "expires_at": self.expires_at,
+            "cidrs": self.cidrs,
+            "domains": {
+                domain: asdict(entry) for domain, entry in sorted(self.domains.items())
+            },
+        }
+        return json.dumps(data, indent=2) + "\n"
+
+
+@dataclass
+class ResolveResult:
+    """Result of resolving the allowlist."""
+
+    cache: AddressCache
+    resolved: list[str]
+    reused: list[str]
+    errors: dict[str, str]
+    written: list[Path] = field(default_factory=list)
+
+
+def collapse_cidrs(addresses: Iterable[str]) -> list[str]:
+    """Collapse addresses into the minimal list of CIDR networks.
+
+    IPv4 networks are listed before IPv6 networks.
+
+    Raises:
+        ValueError: If an address is invalid.
+    """
+    networks = [ipaddress.ip_network(a, strict=False) for a in addresses]
+    v4 = [n for n in networks if isinstance(n, ipaddress.IPv4Network)]
+    v6 = [n for n in networks if isinstance(n, ipaddress.IPv6Network)]
+    return [
+        str(network)
+        for group in (v4, v6)
+        for network in ipaddress.collapse_addresses(group)
+    ]
+
+
+def resolve_domains(
+    domains: Iterable[str],
+    resolver: Resolver,
+    *,
+    cache: AddressCache | None = None,
+    refresh: bool = False,
+    now: float | None = None,
+    max_workers: int = MAX_RESOLVE_WORKERS,
+) -> ResolveResult:
+    """Resolve domains concurrently, reusing unexpired cache entries.
+
+    Domains that fail to resolve keep their previous (possibly expired)
+    entry, so a transient DNS failure does not drop addresses.
+
+    Args:
+        domains: Domains to resolve.
+        resolver: Resolver to use.
+        cache: Previous results.
+        refresh: Resolve every domain even if its entry is still fresh.
+        now: Current time (defaults to ``time.time()``).
+        max_workers: Maximum concurrent lookups.
+
+    Returns:
+        New cache covering exactly ``domains``, with collapsed CIDRs.
+    """
+    now = time.time() if now is None else now
+    previous = cache.domains if cache else {}
+    wanted = sorted(set(domains))
+
+    reused = [
+        d
+        for d in wanted
+        if not refresh and d in previous and previous[d].expires_at > now
+    ]
+    pending = [d for d in wanted if d not in set(reused)]
+
+    def lookup(domain: str) -> tuple[str, list[ResolvedAddress] | str]:
+        try:
+            return domain, resolver.resolve(domain)
+        except (OSError, UnicodeError) as e:
+            return domain, str(e) or type(e).__name__
+
+    entries = {d: previous[d] for d in reused}
+    resolved: list[str] = []
+    errors: dict[str, str] = {}
+    if pending:
+        workers = max(1, min(max_workers, len(pending)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for domain, outcome in pool.map(lookup, pending):
+                if isinstance(outcome, str) or not outcome:
+                    errors[domain] = outcome or "No addresses"
+                    if domain in previous:
+                        entries[domain] = previous[domain]
+                    continue
+                entries[domain] = DomainEntry(
+                    addresses=sorted({r.address for r in outcome}),
+                    ttl=min(r.ttl for r in outcome),
+                    resolved_at=now,
+                )
+                resolved.append(domain)
+
+    new_cache = AddressCache(
+        domains=entries,
+        cidrs=collapse_cidrs(a for entry in entries.values() for a in entry.addresses),
+    )
+    return ResolveResult(
+        cache=new_cache, resolved=resolved, reused=reused, errors=errors
+    )
+
+
+def resolve_firewall(
+    manifest: Manifest,
+    project_dir: Path,
+    *,
+    resolver: Resolver | None = None,
+    refresh: bool = False,
+    set_format: SetFormat = "ipset",
+) -> ResolveResult:
+    """Resolve the firewall allowlist and store the addresses.
+
+    Resolves the HTTP MCP server domains plus the domains already in the
+    firewall allowlist (wildcard and suffix rules are skipped), and writes
+    ``.devcontainer/allowed-addresses.json`` (per-domain addresses with
+    TTLs and the collapsed CIDRs). With
+    ``set_format`` ``ipset`` or ``nft``, a batch file the firewall script
+    can load directly is written as well.
+
+    Args:
+        manifest: Validated manifest.
+        project_dir: Project directory.
+        resolver: Resolver to use (system resolver by default).
+        refresh: Ignore unexpired cache entries.
+        set_format: Batch file to write alongside the JSON cache.
+
+    Returns:
+        Resolution result, including the files written.
+    """
+    devcontainer = project_dir / ".devcontainer"
+    cache_path = devcontainer / ADDRESSES_FILE
+    # Wildcard and suffix rules (e.g. from a hand-written allowlist) have no
+    # addresses of their own
+    domains = {
+        domain
+        for domain in allowlist_domains(manifest) | read_allowlist(project_dir)
+        if not is_wildcard(domain)
+    }
+
+    result = resolve_domains(
+        domains,
+        resolver or SystemResolver(),
+        cache=AddressCache.load(cache_path),
+        refresh=refresh,
+    )
+
+    devcontainer.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(result.cache.dump())
+    result.written.append(cache_path)
+    if set_format == "ipset":
+        (devcontainer / IPSET_FILE).write_text(render_ipset_restore(result.cache.cidrs))
+        result.written.append(devcontainer / IPSET_FILE)
+    elif set_format == "nft":
+        (devcontainer / NFT_FILE).write_text(render_nft_set(result.cache.cidrs))
+        result.written.append(devcontainer / NFT_FILE)
+    return result
@@ -1,7 +1,15 @@
 """Output generators for agentpack."""
 
 from agent_container_pack.generators.codex_config import generate_codex_config
-from agent_container_pack.generators.markdown import generate_claude_md
+from agent_container_pack.generators.markdown import (
+    generate_claude_md,
+    generate_package_md,
+)
 from agent_container_pack.generators.settings import generate_settings_json
 
-__all__ = ["generate_claude_md", "generate_codex_config", "generate_settings_json"]
+__all__ = [
+    "generate_claude_md",
+    "generate_codex_config",
+    "generate_package_md",
+    "generate_settings_json",
+]
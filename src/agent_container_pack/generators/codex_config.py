@@ -1,6 +1,16 @@
 """Generate codex.config.toml from manifest."""
 
-from agent_container_pack.manifest.schema import Manifest, MCPServerHTTP, MCPServerStdio
+from collections.abc import Sequence
+
+from agent_container_pack.devcontainer.packages import preinstalled_command
+from agent_container_pack.manifest.schema import (
+    Manifest,
+    MCPServerHTTP,
+    MCPServerOptions,
+    MCPServerStdio,
+    proxy_url,
+)
+from agent_container_pack.stack.servers import stack_mcp_servers
 
 
 def _escape_toml_string(value: str) -> str:
@@ -33,28 +43,71 @@ def _format_toml_value(value: str | list[str] | dict[str, str]) -> str:
     return str(value)
 
 
-def generate_codex_config(manifest: Manifest) -> str:
+def _format_seconds(value: float) -> str:
+    """Format a duration in seconds, without a fraction when it is whole."""
+    return str(int(value)) if value.is_integer() else str(value)
+
+
+def _server_options(server: MCPServerOptions) -> list[str]:
+    """Render timeouts and tool filters, which Codex supports natively."""
+    lines: list[str] = []
+    if server.startup_timeout_sec is not None:
+        lines.append(
+            f"startup_timeout_sec = {_format_seconds(server.startup_timeout_sec)}"
+        )
+    if server.tool_timeout_sec is not None:
+        lines.append(f"tool_timeout_sec = {_format_seconds(server.tool_timeout_sec)}")
+    if server.enabled_tools is not None:
+        lines.append(f"enabled_tools = {_format_toml_value(server.enabled_tools)}")
+    if server.disabled_tools:
+        lines.append(f"disabled_tools = {_format_toml_value(server.disabled_tools)}")
+    return lines
+
+
+def generate_codex_config(
+    manifest: Manifest,
+    stacks: Sequence[str] | None = None,
+    *,
+    preinstalled: bool = False,
+) -> str:
     """Generate codex.config.toml content from manifest.
 
     Codex CLI supports both stdio and HTTP servers.
-    - stdio: command, args, env, cwd
+    - stdio: command, args, env, cwd (the pre-installed launcher when
+      ``preinstalled``)
     - HTTP: url (env is not valid for HTTP in Codex)
+    - shared stdio: url of the `acpack mcp serve` proxy
+    - both: startup_timeout_sec, tool_timeout_sec, enabled_tools,
+      disabled_tools
 
     Args:
         manifest: Validated manifest object.
+        stacks: Only include the MCP servers these stacks need (see
+            :func:`stack_mcp_servers`).
+        preinstalled: The devcontainer install step exists (see
+            :func:`check_preinstall`).
 
     Returns:
         Generated TOML content.
     """
     lines: list[str] = []
 
-    for name, server in manifest.mcp.servers.items():
+    for name, server in stack_mcp_servers(manifest, stacks).items():
         lines.append(f"[mcp_servers.{name}]")
 
-        if isinstance(server, MCPServerStdio):
-            lines.append(f'command = "{_escape_toml_string(server.command[0])}"')
-            if len(server.command) > 1:
-                lines.append(f"args = {_format_toml_value(server.command[1:])}")
+        if isinstance(server, MCPServerStdio) and server.shared:
+            # Served once by `acpack mcp serve` for every session
+            url = proxy_url(manifest.mcp.proxy, name)
+            lines.append(f'url = "{_escape_toml_string(url)}"')
+        elif isinstance(server, MCPServerStdio):
+            command = (
+                preinstalled_command(manifest, name, server)
+                if preinstalled
+                else server.command
+            )
+            lines.append(f'command = "{_escape_toml_string(command[0])}"')
+            if len(command) > 1:
+                lines.append(f"args = {_format_toml_value(command[1:])}")
             if server.env:
                 lines.append(f"env = {_format_toml_value(server.env)}")
             if server.cwd:
@@ -63,6 +116,7 @@ def generate_codex_config(manifest: Manifest) -> str:
             # Codex HTTP servers use url only (env is not valid for HTTP)
             lines.append(f'url = "{_escape_toml_string(server.url)}"')
 
+        lines.extend(_server_options(server))
         lines.append("")
 
     return "\n".join(lines)
@@ -1,6 +1,8 @@
 """Generate CLAUDE.md / AGENTS.md from manifest."""
 
-from agent_container_pack.manifest.schema import Manifest, SafetyConfig
+from collections.abc import Mapping
+
+from agent_container_pack.manifest.schema import Manifest, SafetyConfig, StackConfig
 
 SAFETY_PRESET_DEFAULT = [
     "secrets禁止（API_KEY等を直書きしない）",
@@ -25,11 +27,34 @@ def _generate_safety_section(safety: SafetyConfig) -> str:
     return "## Safety\n\n" + "\n".join(lines) + "\n"
 
 
-def generate_claude_md(manifest: Manifest) -> str:
+def _generate_commands_section(stack_config: StackConfig) -> str:
+    """Generate commands section."""
+    commands: list[str] = []
+    if stack_config.deps:
+        commands.append(f"- **deps**: `{stack_config.deps}`")
+    if stack_config.lint:
+        commands.append(f"- **lint**: `{stack_config.lint}`")
+    if stack_config.typecheck:
+        commands.append(f"- **typecheck**: `{stack_config.typecheck}`")
+    if stack_config.test:
+        commands.append(f"- **test**: `{stack_config.test}`")
+    if stack_config.run:
+        commands.append(f"- **run**: `{stack_config.run}`")
+
+    if not commands:
+        return ""
+
+    return "## Commands\n\n" + "\n".join(commands) + "\n"
+
+
+def generate_claude_md(
+    manifest: Manifest, *, packages: Mapping[str, str] | None = None
+) -> str:
     """Generate CLAUDE.md content from manifest.
 
     Args:
         manifest: Validated manifest object.
+        packages: Workspace packages (relative path -> stack ID) to list.
 
     Returns:
         Generated markdown content.
@@ -49,21 +74,16 @@ def generate_claude_md(manifest: Manifest) -> str:
         stack_config = next(iter(manifest.stacks.values()))
 
     if stack_config:
-        commands: list[str] = []
-        if stack_config.deps:
-            commands.append(f"- **deps**: `{stack_config.deps}`")
-        if stack_config.lint:
-            commands.append(f"- **lint**: `{stack_config.lint}`")
-        if stack_config.typecheck:
-            commands.append(f"- **typecheck**: `{stack_config.typecheck}`")
-        if stack_config.test:
-            commands.append(f"- **test**: `{stack_config.test}`")
-        if stack_config.run:
-            commands.append(f"- **run**: `{stack_config.run}`")
-
-        if commands:
-            sections.append("## Commands\n")
-            sections.append("\n".join(commands) + "\n")
+        commands_section = _generate_commands_section(stack_config)
+        if commands_section:
+            sections.append(commands_section)
+
+    # Packages section (workspace mode)
+    if packages:
+        sections.append("## Packages\n")
+        for path, stack_id in sorted(packages.items()):
+            sections.append(f"- `{path}` ({stack_id})")
+        sections.append("")
 
     # Workflows section
     if manifest.workflows:
@@ -91,3 +111,27 @@ def generate_claude_md(manifest: Manifest) -> str:
         sections.append(manifest.custom_content.rstrip() + "\n")
 
     return "\n".join(sections)
+
+
+def generate_package_md(manifest: Manifest, package_path: str, stack_id: str) -> str:
+    """Generate a nested CLAUDE.md for one workspace package.
+
+    Only package-specific instructions are included; shared sections stay in
+    the root document.
+
+    Args:
+        manifest: Validated manifest object.
+        package_path: Package directory relative to the workspace root.
+        stack_id: Stack detected for the package.
+
+    Returns:
+        Generated markdown content.
+    """
+    sections: list[str] = [f"# {manifest.project.name}: {package_path}\n"]
+    sections.append(f"Stack: {stack_id}\n")
+
+    commands_section = _generate_commands_section(manifest.stacks[stack_id])
+    if commands_section:
+        sections.append(commands_section)
+
+    return "\n".join(sections)
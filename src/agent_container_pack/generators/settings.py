@@ -1,27 +1,82 @@
 """Generate .claude/settings.json from manifest."""
 
 import json
+from collections.abc import Sequence
 from typing import Any
 
-from agent_container_pack.manifest.schema import Manifest, MCPServerHTTP, MCPServerStdio
+from agent_container_pack.devcontainer.packages import preinstalled_command
+from agent_container_pack.manifest.schema import (
+    Manifest,
+    MCPServerHTTP,
+    MCPServerStdio,
+    proxy_url,
+)
+from agent_container_pack.stack.servers import stack_mcp_servers
 
 
-def generate_settings_json(manifest: Manifest) -> str:
+def _tool_rule(server: str, tool: str) -> str:
+    """Permission rule naming one MCP tool."""
+    return f"mcp__{server}__{tool}"
+
+
+def _timeout_ms(seconds: list[float | None]) -> str | None:
+    """Largest configured timeout in milliseconds, as an env var value."""
+    configured = [s for s in seconds if s is not None]
+    return str(round(max(configured) * 1000)) if configured else None
+
+
+def generate_settings_json(
+    manifest: Manifest,
+    stacks: Sequence[str] | None = None,
+    *,
+    preinstalled: bool = False,
+) -> str:
     """Generate .claude/settings.json content from manifest.
 
+    With ``preinstalled``, npx/uvx stdio servers run their pre-installed
+    launcher (see :func:`preinstalled_command`).
+
+    Claude Code has no per-server timeouts or tool filters, so they are
+    mapped onto its global equivalents:
+
+    - ``startup_timeout_sec`` / ``tool_timeout_sec``: the ``MCP_TIMEOUT`` /
+      ``MCP_TOOL_TIMEOUT`` env settings (milliseconds), using the largest
+      value so no server gets less time than configured
+    - ``disabled_tools``: ``permissions.deny`` rules
+    - ``enabled_tools``: not emitted, since Claude Code has no per-server
+      tool allowlist (``permissions.allow`` would pre-approve the tools
+      rather than limit the server to them); only an empty list, which
+      denies the whole server, has an effect
+
     Args:
         manifest: Validated manifest object.
+        stacks: Only include the MCP servers these stacks need (see
+            :func:`stack_mcp_servers`).
+        preinstalled: The devcontainer install step exists (see
+            :func:`check_preinstall`).
 
     Returns:
         Generated JSON content.
     """
     mcp_servers: dict[str, Any] = {}
 
-    for name, server in manifest.mcp.servers.items():
-        if isinstance(server, MCPServerStdio):
+    servers = stack_mcp_servers(manifest, stacks)
+    for name, server in servers.items():
+        if isinstance(server, MCPServerStdio) and server.shared:
+            # Served once by `acpack mcp serve` for every session
             server_config: dict[str, Any] = {
-                "command": server.command[0],
-                "args": server.command[1:],
+                "type": "http",
+                "url": proxy_url(manifest.mcp.proxy, name),
+            }
+        elif isinstance(server, MCPServerStdio):
+            command = (
+                preinstalled_command(manifest, name, server)
+                if preinstalled
+                else server.command
+            )
+            server_config = {
+                "command": command[0],
+                "args": command[1:],
             }
             if server.env:
                 server_config["env"] = server.env
@@ -40,8 +95,28 @@ def generate_settings_json(manifest: Manifest) -> str:
 
         mcp_servers[name] = server_config
 
+    env = {
+        "MCP_TIMEOUT": _timeout_ms([s.startup_timeout_sec for s in servers.values()]),
+        "MCP_TOOL_TIMEOUT": _timeout_ms([s.tool_timeout_sec for s in servers.values()]),
+    }
+    permissions = {
+        "deny": [
+            # An empty enabled_tools list disables the whole server
+            *(f"mcp__{name}" for name, s in servers.items() if s.enabled_tools == []),
+            *(
+                _tool_rule(name, tool)
+                for name, server in servers.items()
+                for tool in server.disabled_tools
+            ),
+        ],
+    }
+
     settings: dict[str, Any] = {}
     if mcp_servers:
         settings["mcpServers"] = mcp_servers
+    if env := {k: v for k, v in env.items() if v is not None}:
+        settings["env"] = env
+    if permissions := {k: v for k, v in permissions.items() if v}:
+        settings["permissions"] = permissions
 
     return json.dumps(settings, indent=2, ensure_ascii=False) + "\n"
@@ -1,15 +1,46 @@
 """Template initialization."""
 
+from agent_container_pack.init.bulk import (
+    init_projects,
+    InitResult,
+    read_targets_file,
+    target_conflict,
+)
+from agent_container_pack.init.cache import parse_size, TemplateCache
+from agent_container_pack.init.http import (
+    create_async_client,
+    create_client,
+    HttpConfig,
+)
+from agent_container_pack.init.local import LocalTemplateSource
 from agent_container_pack.init.template import (
     download_template,
+    fetch_archive,
+    fetch_archive_async,
     generate_skeleton,
     parse_template_source,
+    TemplateNotCachedError,
     TemplateSource,
+    TemplateTooLargeError,
 )
 
 __all__ = [
+    "create_async_client",
+    "create_client",
     "download_template",
+    "fetch_archive",
+    "fetch_archive_async",
     "generate_skeleton",
+    "HttpConfig",
+    "init_projects",
+    "InitResult",
+    "LocalTemplateSource",
+    "parse_size",
     "parse_template_source",
+    "read_targets_file",
+    "target_conflict",
+    "TemplateCache",
+    "TemplateNotCachedError",
     "TemplateSource",
+    "TemplateTooLargeError",
 ]
@@ -0,0 +1,199 @@
+"""Index and extract template zip archives."""
+
+import shutil
+import tarfile
+import zipfile
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+
+EXTRACT_BUFFER_SIZE = 1024 * 1024
+MAX_EXTRACT_WORKERS = 8
+
+
+@dataclass
+class TemplateIndex:
+    """Members of a template archive relevant to ``acpack init``."""
+
+    devcontainer: dict[str, zipfile.ZipInfo] = field(default_factory=dict)
+    manifest: zipfile.ZipInfo | None = None
+
+
+def has_root_dir(names: Iterable[str], subdir: str | None = None) -> bool:
+    """Check whether an archive wraps the template in a root directory.
+
+    GitHub archives always do (``repo-branch/``); locally built archives may
+    hold ``.devcontainer/`` and ``agentpack.yml`` (or ``subdir``) at the top.
+    """
+    top_level = {".devcontainer", "agentpack.yml"}
+    if subdir:
+        top_level.add(subdir.strip("/").split("/")[0])
+    return not any(name.removeprefix("./").split("/")[0] in top_level for name in names)
+
+
+def index_archive(
+    zf: zipfile.ZipFile, subdir: str | None = None, *, root_dir: bool = True
+) -> TemplateIndex:
+    """Index a template archive in a single pass over its members.
+
+    GitHub archives have one root directory (usually ``repo-branch``); the
+    template lives in it, or in ``subdir`` below it.
+
+    Args:
+        zf: Open zip archive.
+        subdir: Template subdirectory within the repository.
+        root_dir: Whether members are wrapped in a single root directory.
+
+    Returns:
+        Index of ``.devcontainer/`` files (keyed by path relative to
+        ``.devcontainer``) and the template ``agentpack.yml``.
+
+    Raises:
+        ValueError: If the archive is empty or has no root directory.
+    """
+    index = TemplateIndex()
+    template_prefix: str | None = None
+    if not root_dir:
+        template_prefix = f"{subdir.strip('/')}/" if subdir else ""
+
+    for info in zf.infolist():
+        if template_prefix is None:
+            root, sep, _ = info.filename.partition("/")
+            if not sep:
+                continue
+            template_prefix = f"{root}/{subdir.strip('/')}/" if subdir else f"{root}/"
+
+        if not info.filename.startswith(template_prefix):
+            continue
+        rel_path = info.filename[len(template_prefix) :]
+
+        if rel_path == "agentpack.yml":
+            index.manifest = info
+        elif rel_path.startswith(".devcontainer/") and not info.is_dir():
+            index.devcontainer[rel_path[len(".devcontainer/") :]] = info
+
+    if template_prefix is None:
+        raise ValueError("Empty or invalid zip archive")
+
+    return index
+
+
+def safe_target(base: Path, rel_path: str) -> Path:
+    """Resolve an archive member path below ``base``.
+
+    Raises:
+        ValueError: If the path escapes ``base``.
+    """
+    parts = PurePosixPath(rel_path).parts
+    if not parts or rel_path.startswith("/") or ".." in parts or "\\" in rel_path:
+        raise ValueError(f"Unsafe path in template archive: {rel_path}")
+    target = base.joinpath(*parts)
+    if not target.resolve().is_relative_to(base.resolve()):
+        raise ValueError(f"Unsafe path in template archive: {rel_path}")
+    return target
+
+
+def _extract_member(zf: zipfile.ZipFile, info: zipfile.ZipInfo, target: Path) -> None:
+    """Stream one member to disk without reading it fully into memory."""
+    with zf.open(info) as src, target.open("wb") as dst:
+        shutil.copyfileobj(src, dst, EXTRACT_BUFFER_SIZE)
+
+
+def extract_template(
+    zf: zipfile.ZipFile,
+    index: TemplateIndex,
+    target_dir: Path,
+    *,
+    max_workers: int = MAX_EXTRACT_WORKERS,
+) -> None:
+    """Extract indexed template members into ``target_dir``.
+
+    All paths are validated before anything is written. Members are then
+    streamed to disk concurrently on a thread pool.
+
+    Args:
+        zf: Open zip archive the index was built from.
+        index: Archive index.
+        target_dir: Project directory to extract into.
+        max_workers: Maximum number of extraction threads.
+
+    Raises:
+        ValueError: If a member path escapes the target directory.
+    """
+    target_devcontainer = target_dir / ".devcontainer"
+    target_devcontainer.mkdir(parents=True, exist_ok=True)
+
+    jobs = [
+        (info, safe_target(target_devcontainer, rel_path))
+        for rel_path, info in index.devcontainer.items()
+    ]
+    if index.manifest is not None:
+        jobs.append((index.manifest, target_dir / "agentpack.yml"))
+
+    for parent in {target.parent for _, target in jobs}:
+        parent.mkdir(parents=True, exist_ok=True)
+
+    workers = min(max_workers, len(jobs))
+    if workers <= 1:
+        for info, target in jobs:
+            _extract_member(zf, info, target)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_extract_member, zf, info, target) for info, target in jobs
+        ]
+        for future in futures:
+            future.result()
+
+
+def extract_tar_template(
+    path: Path, target_dir: Path, subdir: str | None = None
+) -> None:
+    """Extract a template from a ``.tar.gz`` (or other tar) archive.
+
+    Tar archives are read sequentially, so members are streamed to disk in
+    archive order rather than on a thread pool.
+
+    Args:
+        path: Tar archive path.
+        target_dir: Project directory to extract into.
+        subdir: Template subdirectory within the archive.
+
+    Raises:
+        ValueError: If a member path escapes the target directory.
+    """
+    target_devcontainer = target_dir / ".devcontainer"
+
+    with tarfile.open(path, "r:*") as tf:
+        members = tf.getmembers()
+        names = [member.name for member in members]
+        if has_root_dir(names, subdir):
+            root = names[0].removeprefix("./").split("/")[0] if names else ""
+            prefix = f"{root}/{subdir.strip('/')}/" if subdir else f"{root}/"
+        else:
+            prefix = f"{subdir.strip('/')}/" if subdir else ""
+
+        jobs: list[tuple[tarfile.TarInfo, Path]] = []
+        for member in members:
+            name = member.name.removeprefix("./")
+            if not member.isfile() or not name.startswith(prefix):
+                continue
+            rel_path = name[len(prefix) :]
+            if rel_path == "agentpack.yml":
+                jobs.append((member, target_dir / "agentpack.yml"))
+            elif rel_path.startswith(".devcontainer/"):
+                target = safe_target(
+                    target_devcontainer, rel_path[len(".devcontainer/") :]
+                )
+                jobs.append((member, target))
+
+        target_devcontainer.mkdir(parents=True, exist_ok=True)
+        for member, target in jobs:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            src = tf.extractfile(member)
+            if src is None:
+                continue
+            with src, target.open("wb") as dst:
+                shutil.copyfileobj(src, dst, EXTRACT_BUFFER_SIZE)
@@ -0,0 +1,167 @@
+"""Initialize many project directories from a single template fetch."""
+
+import tempfile
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal
+
+from agent_container_pack.init.cache import TemplateCache
+from agent_container_pack.init.http import HttpConfig
+from agent_container_pack.init.layers import compose_template
+from agent_container_pack.init.local import LocalTemplateSource, copy_template_dir
+from agent_container_pack.init.template import (
+    GITHUB_URL,
+    ProgressCallback,
+    TemplateSource,
+    generate_skeleton,
+)
+
+MAX_INIT_WORKERS = 16
+
+
+@dataclass
+class InitResult:
+    """Outcome of initializing one target directory."""
+
+    directory: Path
+    status: Literal["created", "skipped", "failed"]
+    message: str | None = None
+
+
+def target_conflict(directory: Path) -> str | None:
+    """Check whether a directory already holds an agentpack project.
+
+    Returns:
+        Reason the directory needs ``--force``, or None if it is free.
+    """
+    for name in ("agentpack.yml", ".devcontainer"):
+        if (directory / name).exists():
+            return f"{name} already exists. Use --force to overwrite."
+    return None
+
+
+def read_targets_file(path: Path) -> list[Path]:
+    """Read target directories from a file, one per line.
+
+    Blank lines and lines starting with ``#`` are ignored.
+    """
+    return [
+        Path(line.strip())
+        for line in path.read_text().splitlines()
+        if line.strip() and not line.lstrip().startswith("#")
+    ]
+
+
+def _materialize(
+    template_dir: Path, directory: Path, *, stack: str | None, link: bool
+) -> InitResult:
+    """Copy a prepared template into one target directory."""
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        copy_template_dir(template_dir, directory, link=link, max_workers=1)
+        # Only generate skeleton if template didn't include agentpack.yml
+        if not (directory / "agentpack.yml").exists():
+            generate_skeleton(directory, stack)
+    except (OSError, ValueError) as e:
+        return InitResult(directory, "failed", str(e))
+    return InitResult(directory, "created")
+
+
+def init_projects(
+    source: TemplateSource
+    | LocalTemplateSource
+    | Sequence[TemplateSource | LocalTemplateSource],
+    directories: list[Path],
+    *,
+    stack: str | None = None,
+    force: bool = False,
+    cache: TemplateCache | None = None,
+    offline: bool = False,
+    base_url: str = GITHUB_URL,
+    partial: bool = False,
+    link: bool = False,
+    progress: ProgressCallback | None = None,
+    http_config: HttpConfig | None = None,
+    max_workers: int = MAX_INIT_WORKERS,
+) -> list[InitResult]:
+    """Initialize several project directories from one template.
+
+    The template is fetched and extracted once into a staging directory
+    (a local directory template is used in place), then copied into every
+    target concurrently. A sequence of sources is composed into one
+    template first (see :func:`compose_template`). Targets that already contain ``agentpack.yml`` or
+    ``.devcontainer`` are skipped unless ``force`` is set.
+
+    Args:
+        source: Parsed template source, or ordered template layers.
+        directories: Target directories.
+        stack: Stack for the skeleton when the template has no agentpack.yml.
+        force: Overwrite existing files.
+        cache: Template cache, or None to always download.
+        offline: Only use the cache, never the network.
+        base_url: GitHub base URL.
+        partial: Fetch only the needed archive members when possible.
+        link: Allow hardlinking files of local directory templates.
+        progress: Called with (bytes received, total bytes or None).
+        http_config: HTTP timeouts, pooling and retries.
+        max_workers: Maximum number of targets initialized concurrently.
+
+    Returns:
+        One result per distinct target, in input order.
+
+    Raises:
+        ValueError: If the template cannot be fetched or parsed.
+        httpx.HTTPStatusError: If the template download fails.
+    """
+    targets = list(dict.fromkeys(directory.resolve() for directory in directories))
+    results: dict[Path, InitResult] = {}
+    pending: list[Path] = []
+    for directory in targets:
+        conflict = None if force else target_conflict(directory)
+        if conflict:
+            results[directory] = InitResult(directory, "skipped", conflict)
+        else:
+            pending.append(directory)
+
+    if pending:
+        with tempfile.TemporaryDirectory(prefix="acpack-template-") as staging:
+            layers = (
+                [source]
+                if isinstance(source, TemplateSource | LocalTemplateSource)
+                else list(source)
+            )
+            if (
+                len(layers) == 1
+                and isinstance(layers[0], LocalTemplateSource)
+                and layers[0].kind == "dir"
+            ):
+                template_dir = layers[0].template_dir
+            else:
+                template_dir = Path(staging) / "template"
+                template_dir.mkdir()
+                compose_template(
+                    layers,
+                    template_dir,
+                    Path(staging) / "layers",
+                    cache=cache,
+                    offline=offline,
+                    base_url=base_url,
+                    partial=partial,
+                    progress=progress,
+                    http_config=http_config,
+                )
+                # Staged files are private copies; hardlinking them would
+                # make every target share one set of inodes
+                link = False
+
+            workers = max(1, min(max_workers, len(pending)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for result in pool.map(
+                    lambda d: _materialize(template_dir, d, stack=stack, link=link),
+                    pending,
+                ):
+                    results[result.directory] = result
+
+    return [results[directory] for directory in targets]
@@ -0,0 +1,216 @@
+"""Content-addressed on-disk cache for template archives."""
+
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+SIZE_PATTERN = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?\s*$", re.IGNORECASE)
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+# Unreferenced blobs younger than this may be a concurrent store that has
+# renamed its blob but not yet updated the index, so prune keeps them
+PRUNE_GRACE_PERIOD = 60.0
+
+
+def default_cache_dir() -> Path:
+    """Return the user cache directory for acpack.
+
+    ``ACPACK_CACHE_DIR`` overrides the platform default.
+    """
+    if override := os.environ.get("ACPACK_CACHE_DIR"):
+        return Path(override)
+    if sys.platform == "win32" and (local := os.environ.get("LOCALAPPDATA")):
+        return Path(local) / "acpack" / "Cache"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "acpack"
+    if xdg := os.environ.get("XDG_CACHE_HOME"):
+        return Path(xdg) / "acpack"
+    return Path.home() / ".cache" / "acpack"
+
+
+def parse_size(value: str) -> int:
+    """Parse a human readable size such as ``500M`` or ``2GiB`` into bytes.
+
+    Raises:
+        ValueError: If the size cannot be parsed.
+    """
+    match = SIZE_PATTERN.match(value)
+    if not match:
+        raise ValueError(f"Invalid size: {value}")
+    number, unit = match.groups()
+    return int(float(number) * SIZE_UNITS[unit.upper()])
+
+
+@dataclass
+class CacheEntry:
+    """Cached template archive for one owner/repo/ref key."""
+
+    key: str
+    digest: str
+    size: int
+    etag: str | None = None
+    last_used: float = 0.0
+
+
+@dataclass
+class PruneResult:
+    """Result of a cache prune."""
+
+    removed: list[str]
+    freed: int
+    remaining: int
+
+
+class TemplateCache:
+    """Template archives stored by SHA-256 under ``<root>/templates``.
+
+    ``index.json`` maps keys (``owner/repo@ref``) to blobs in ``objects/``.
+    Several keys may share one blob. Writes go through temp files and
+    ``os.replace`` so concurrent inits never observe partial files.
+    """
+
+    def __init__(self, root: Path | None = None) -> None:
+        """Create a cache rooted at ``root`` (default: user cache dir)."""
+        self.root = (root or default_cache_dir()) / "templates"
+        self.objects_dir = self.root / "objects"
+        self.index_path = self.root / "index.json"
+        # Serializes index updates from concurrent downloads in this process
+        self._lock = threading.Lock()
+
+    def _load_index(self) -> dict[str, CacheEntry]:
+        try:
+            data = json.loads(self.index_path.read_text())
+        except (OSError, ValueError):
+            return {}
+        return {key: CacheEntry(**entry) for key, entry in data.items()}
+
+    def _save_index(self, index: dict[str, CacheEntry]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        data = {key: asdict(entry) for key, entry in sorted(index.items())}
+        fd, tmp = tempfile.mkstemp(dir=self.root, prefix=".index-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, self.index_path)
+
+    def entries(self) -> list[CacheEntry]:
+        """Return all cache entries."""
+        return list(self._load_index().values())
+
+    def blob_path(self, entry: CacheEntry) -> Path:
+        """Return the path of an entry's archive."""
+        return self.objects_dir / entry.digest
+
+    def lookup(self, key: str) -> CacheEntry | None:
+        """Return the entry for ``key`` if its archive is present."""
+        entry = self._load_index().get(key)
+        if entry is None or not self.blob_path(entry).exists():
+            return None
+        return entry
+
+    def touch(self, key: str) -> None:
+        """Mark an entry as recently used."""
+        with self._lock:
+            index = self._load_index()
+            if key in index:
+                index[key].last_used = time.time()
+                self._save_index(index)
+
+    def store(
+        self, key: str, data: bytes | BinaryIO, etag: str | None = None
+    ) -> CacheEntry:
+        """Store an archive for ``key``.
+
+        File objects are copied in chunks from their current position, so
+        large archives never have to be held in memory.
+
+        Args:
+            key: Cache key (``owner/repo@ref``).
+            data: Archive bytes or a readable binary file.
+            etag: ETag returned by the server, for revalidation.
+
+        Returns:
+            The new cache entry.
+        """
+        if isinstance(data, bytes):
+            data = io.BytesIO(data)
+
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.objects_dir, prefix=".blob-")
+        sha256 = hashlib.sha256()
+        size = 0
+        with os.fdopen(fd, "wb") as f:
+            while chunk := data.read(COPY_CHUNK_SIZE):
+                sha256.update(chunk)
+                f.write(chunk)
+                size += len(chunk)
+        digest = sha256.hexdigest()
+        os.replace(tmp, self.objects_dir / digest)
+
+        entry = CacheEntry(
+            key=key, digest=digest, size=size, etag=etag, last_used=time.time()
+        )
+        with self._lock:
+            index = self._load_index()
+            index[key] = entry
+            self._save_index(index)
+        return entry
+
+    def prune(self, max_size: int = 0) -> PruneResult:
+        """Evict least recently used archives until the cache fits ``max_size``.
+
+        Blobs no entry references are deleted too; those that were never
+        indexed are kept while younger than ``PRUNE_GRACE_PERIOD`` seconds.
+
+        Args:
+            max_size: Maximum total size in bytes to keep (0 clears the cache).
+
+        Returns:
+            Evicted keys and bytes freed.
+        """
+        index = self._load_index()
+        evicted = {entry.digest for entry in index.values()}
+        removed: list[str] = []
+
+        def total(entries: Iterable[CacheEntry]) -> int:
+            return sum(blob.size for blob in {e.digest: e for e in entries}.values())
+
+        for entry in sorted(index.values(), key=lambda e: e.last_used):
+            if total(index.values()) <= max_size:
+                break
+            del index[entry.key]
+            removed.append(entry.key)
+
+        # Delete blobs no longer referenced by any key
+        live = {entry.digest for entry in index.values()}
+        evicted -= live
+        cutoff = time.time() - PRUNE_GRACE_PERIOD
+        freed = 0
+        if self.objects_dir.exists():
+            for blob in self.objects_dir.iterdir():
+                # Dot-files are in-flight writes of concurrent inits
+                if blob.name in live or blob.name.startswith("."):
+                    continue
+                stat = blob.stat()
+                # Never indexed: maybe stored, but not indexed yet
+                if blob.name not in evicted and stat.st_mtime > cutoff:
+                    continue
+                freed += stat.st_size
+                blob.unlink()
+
+        if self.root.exists():
+            self._save_index(index)
+        return PruneResult(
+            removed=removed, freed=freed, remaining=total(index.values())
+        )
@@ -0,0 +1,187 @@
+"""Shared HTTP clients for template downloads."""
+
+import asyncio
+import importlib.util
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+import httpx
+
+# Transient statuses worth retrying for idempotent requests
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_METHODS = frozenset({"GET", "HEAD"})
+
+# HTTP/2 needs the optional "h2" package (httpx[http2])
+H2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+@dataclass(frozen=True)
+class HttpConfig:
+    """Timeouts, pooling and retry policy for template downloads."""
+
+    connect_timeout: float = 10.0
+    read_timeout: float = 30.0
+    write_timeout: float = 30.0
+    # Waiting for a free pooled connection; generous because a saturated
+    # pool may be busy streaming whole archives (e.g. layered templates)
+    pool_timeout: float = 60.0
+    max_connections: int = 10
+    max_keepalive_connections: int = 5
+    retries: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 8.0
+    http2: bool = True
+
+    @property
+    def timeout(self) -> httpx.Timeout:
+        """Timeouts as an httpx.Timeout."""
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.write_timeout,
+            pool=self.pool_timeout,
+        )
+
+    @property
+    def limits(self) -> httpx.Limits:
+        """Connection pool limits as an httpx.Limits."""
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+        )
+
+    def retry_delay(self, attempt: int, response: httpx.Response | None) -> float:
+        """Seconds to wait before retry number ``attempt`` (starting at 0).
+
+        ``Retry-After`` (in seconds) is honoured up to ``max_backoff``;
+        otherwise the delay is exponential backoff with full jitter.
+        """
+        retry_after = response.headers.get("retry-after", "") if response else ""
+        if retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+
+def _should_retry(request: httpx.Request, response: httpx.Response) -> bool:
+    return request.method in RETRY_METHODS and response.status_code in RETRY_STATUSES
+
+
+class RetryTransport(httpx.BaseTransport):
+    """Transport retrying connection errors and transient statuses."""
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport,
+        config: HttpConfig,
+        *,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.transport = transport
+        self.config = config
+        self.sleep = sleep
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        for attempt in range(self.config.retries + 1):
+            last = attempt == self.config.retries
+            try:
+                response = self.transport.handle_request(request)
+            except httpx.TransportError:
+                if last or request.method not in RETRY_METHODS:
+                    raise
+                self.sleep(self.config.retry_delay(attempt, None))
+                continue
+            if last or not _should_retry(request, response):
+                return response
+            response.close()
+            self.sleep(self.config.retry_delay(attempt, response))
+        raise AssertionError("unreachable")
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncRetryTransport(httpx.AsyncBaseTransport):
+    """Async transport retrying connection errors and transient statuses."""
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        config: HttpConfig,
+        *,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self.transport = transport
+        self.config = config
+        self.sleep = sleep
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        for attempt in range(self.config.retries + 1):
+            last = attempt == self.config.retries
+            try:
+                response = await self.transport.handle_async_request(request)
+            except httpx.TransportError:
+                if last or request.method not in RETRY_METHODS:
+                    raise
+                await self.sleep(self.config.retry_delay(attempt, None))
+                continue
+            if last or not _should_retry(request, response):
+                return response
+            await response.aclose()
+            await self.sleep(self.config.retry_delay(attempt, response))
+        raise AssertionError("unreachable")
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def create_client(
+    config: HttpConfig | None = None,
+    *,
+    transport: httpx.BaseTransport | None = None,
+) -> httpx.Client:
+    """Create a pooled client with timeouts and retries.
+
+    Args:
+        config: HTTP settings (defaults if omitted).
+        transport: Transport to send requests with, e.g. an
+            ``httpx.MockTransport`` in tests. Retries wrap it.
+
+    Returns:
+        Client following redirects. The caller closes it.
+    """
+    config = config or HttpConfig()
+    transport = transport or httpx.HTTPTransport(
+        http2=config.http2 and H2_AVAILABLE, limits=config.limits
+    )
+    return httpx.Client(
+        transport=RetryTransport(transport, config),
+        timeout=config.timeout,
+        follow_redirects=True,
+    )
+
+
+def create_async_client(
+    config: HttpConfig | None = None,
+    *,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> httpx.AsyncClient:
+    """Create a pooled async client with timeouts and retries.
+
+    Args:
+        config: HTTP settings (defaults if omitted).
+        transport: Async transport to send requests with. Retries wrap it.
+
+    Returns:
+        Async client following redirects. The caller closes it.
+    """
+    config = config or HttpConfig()
+    transport = transport or httpx.AsyncHTTPTransport(
+        http2=config.http2 and H2_AVAILABLE, limits=config.limits
+    )
+    return httpx.AsyncClient(
+        transport=AsyncRetryTransport(transport, config),
+        timeout=config.timeout,
+        follow_redirects=True,
+    )
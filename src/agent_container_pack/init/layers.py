@@ -0,0 +1,188 @@
+"""Compose a template from several ordered layers."""
+
+import asyncio
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from agent_container_pack.init.cache import TemplateCache
+from agent_container_pack.init.http import (
+    HttpConfig,
+    create_async_client,
+    create_client,
+)
+from agent_container_pack.init.local import (
+    LocalTemplateSource,
+    copy_local_template,
+    copy_template_dir,
+)
+from agent_container_pack.init.template import (
+    GITHUB_URL,
+    ProgressCallback,
+    TemplateSource,
+    download_template,
+    extract_archive,
+    fetch_archive_async,
+)
+
+
+def deep_merge(base: dict[str, Any], override: dict[str, Any]) -> dict[str, Any]:
+    """Merge ``override`` into ``base`` without modifying either.
+
+    Mappings are merged recursively; any other value (including lists)
+    from ``override`` replaces the one in ``base``.
+    """
+    merged = dict(base)
+    for key, value in override.items():
+        if isinstance(merged.get(key), dict) and isinstance(value, dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def merge_manifests(paths: Sequence[Path]) -> str:
+    """Deep-merge agentpack.yml files, later files taking precedence.
+
+    Raises:
+        ValueError: If a manifest is not valid YAML or not a mapping.
+    """
+    merged: dict[str, Any] = {}
+    for path in paths:
+        try:
+            data = yaml.safe_load(path.read_text()) or {}
+        except yaml.YAMLError as e:
+            raise ValueError(f"Failed to parse {path}: {e}") from e
+        if not isinstance(data, dict):
+            # Malformed template content, reported like a parse error
+            raise ValueError(f"Template manifest is not a mapping: {path}")  # noqa: TRY004
+        merged = deep_merge(merged, data)
+    return yaml.safe_dump(merged, sort_keys=False, allow_unicode=True)
+
+
+async def _fetch_layers(
+    sources: Sequence[TemplateSource | LocalTemplateSource],
+    staging_dir: Path,
+    *,
+    config: HttpConfig,
+    cache: TemplateCache | None,
+    offline: bool,
+    base_url: str,
+    partial: bool,
+    progress: ProgressCallback | None,
+) -> list[Path]:
+    """Fetch every layer concurrently; returns one template directory each."""
+    semaphore = asyncio.Semaphore(config.max_connections)
+
+    async with create_async_client(config) as async_client:
+        # Range requests (partial) are only implemented on the sync client
+        with create_client(config) as client:
+
+            async def fetch(
+                i: int, source: TemplateSource | LocalTemplateSource
+            ) -> Path:
+                if isinstance(source, LocalTemplateSource) and source.kind == "dir":
+                    return source.template_dir
+
+                layer_dir = staging_dir / f"layer-{i}"
+                layer_dir.mkdir(parents=True)
+                if isinstance(source, LocalTemplateSource):
+                    await asyncio.to_thread(copy_local_template, source, layer_dir)
+                elif partial and not offline:
+                    async with semaphore:
+                        await asyncio.to_thread(
+                            download_template,
+                            source,
+                            layer_dir,
+                            cache=cache,
+                            base_url=base_url,
+                            partial=True,
+                            client=client,
+                        )
+                else:
+                    async with semaphore:
+                        archive = await fetch_archive_async(
+                            source,
+                            client=async_client,
+                            cache=cache,
+                            offline=offline,
+                            base_url=base_url,
+                            progress=progress,
+                        )
+                    await asyncio.to_thread(
+                        extract_archive, archive, layer_dir, source.subdir
+                    )
+                return layer_dir
+
+            async with asyncio.TaskGroup() as group:
+                tasks = [
+                    group.create_task(fetch(i, source))
+                    for i, source in enumerate(sources)
+                ]
+
+    return [task.result() for task in tasks]
+
+
+def compose_template(
+    sources: Sequence[TemplateSource | LocalTemplateSource],
+    target_dir: Path,
+    staging_dir: Path,
+    *,
+    cache: TemplateCache | None = None,
+    offline: bool = False,
+    base_url: str = GITHUB_URL,
+    partial: bool = False,
+    progress: ProgressCallback | None = None,
+    http_config: HttpConfig | None = None,
+) -> None:
+    """Fetch template layers concurrently and merge them into ``target_dir``.
+
+    Layers are downloaded at once on an event loop over one pooled async
+    client, bounded by ``http_config.max_connections``. They are then
+    applied in order: a ``.devcontainer/`` file from a later layer replaces
+    the same file from an earlier one, and the layers' ``agentpack.yml``
+    files are deep-merged (see :func:`deep_merge`).
+
+    Args:
+        sources: Template layers, base first.
+        target_dir: Directory to write the composed template to.
+        staging_dir: Scratch directory for downloaded layers.
+        cache: Template cache, or None to always download.
+        offline: Only use the cache, never the network.
+        base_url: GitHub base URL.
+        partial: Fetch only the needed archive members when possible.
+        progress: Called with (bytes received, total bytes or None).
+        http_config: HTTP timeouts, pooling and retries.
+
+    Raises:
+        ValueError: If a layer cannot be fetched or its manifest is invalid.
+        httpx.HTTPStatusError: If a layer download fails.
+    """
+    try:
+        layer_dirs = asyncio.run(
+            _fetch_layers(
+                sources,
+                staging_dir,
+                config=http_config or HttpConfig(),
+                cache=cache,
+                offline=offline,
+                base_url=base_url,
+                partial=partial,
+                progress=progress,
+            )
+        )
+    except ExceptionGroup as group:
+        # Report the first failure like a serial download would
+        raise group.exceptions[0] from None
+
+    for layer_dir in layer_dirs:
+        copy_template_dir(layer_dir, target_dir)
+
+    manifests = [d / "agentpack.yml" for d in layer_dirs]
+    manifests = [path for path in manifests if path.is_file()]
+    # A single manifest is kept verbatim, comments included
+    if len(manifests) > 1:
+        (target_dir / "agentpack.yml").unlink()
+        (target_dir / "agentpack.yml").write_text(merge_manifests(manifests))
@@ -0,0 +1,184 @@
+"""Templates from local directories and archives."""
+
+import os
+import shutil
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal
+
+from agent_container_pack.init.archive import (
+    MAX_EXTRACT_WORKERS,
+    extract_tar_template,
+    extract_template,
+    has_root_dir,
+    index_archive,
+    safe_target,
+)
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
+# Linux ioctl sharing the extents of one file with another (btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+CopyMethod = Literal["reflink", "hardlink", "copy"]
+
+
+@dataclass
+class LocalTemplateSource:
+    """Template in a local directory or archive."""
+
+    path: Path
+    subdir: str | None = None
+
+    @property
+    def template_dir(self) -> Path:
+        """Directory holding the template of a directory source."""
+        return self.path / self.subdir.strip("/") if self.subdir else self.path
+
+    @property
+    def kind(self) -> Literal["dir", "zip", "tar"]:
+        """Type of the template source.
+
+        Raises:
+            ValueError: If the path is missing or not a supported archive.
+        """
+        if self.path.is_dir():
+            return "dir"
+        if not self.path.is_file():
+            raise ValueError(f"Template not found: {self.path}")
+        name = self.path.name.lower()
+        if name.endswith(".zip"):
+            return "zip"
+        if name.endswith(TAR_SUFFIXES):
+            return "tar"
+        raise ValueError(f"Unsupported template archive: {self.path}")
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    """Clone ``src`` into a new file ``dst`` without copying data."""
+    if fcntl is None:
+        return False
+    with src.open("rb") as s, dst.open("wb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+            return True
+        except OSError:
+            pass
+    dst.unlink()
+    return False
+
+
+def copy_file(src: Path, dst: Path, *, link: bool = False) -> CopyMethod:
+    """Copy a file, sharing its data with the source where possible.
+
+    A reflink (copy-on-write clone) is tried first. With ``link``, a
+    hardlink is tried next; hardlinked files share edits with the template,
+    so this is opt-in. Otherwise the bytes are copied. Any existing ``dst``
+    is replaced, never written through.
+
+    Args:
+        src: Source file.
+        dst: Destination path.
+        link: Allow hardlinking when reflinks are not supported.
+
+    Returns:
+        How the file was copied.
+    """
+    dst.unlink(missing_ok=True)
+
+    if _reflink(src, dst):
+        method: CopyMethod = "reflink"
+    else:
+        if link:
+            try:
+                os.link(src, dst)
+                return "hardlink"
+            except OSError:
+                pass
+        shutil.copyfile(src, dst)
+        method = "copy"
+
+    shutil.copymode(src, dst)
+    return method
+
+
+def copy_template_dir(
+    template_dir: Path,
+    target_dir: Path,
+    *,
+    link: bool = False,
+    max_workers: int = MAX_EXTRACT_WORKERS,
+) -> list[CopyMethod]:
+    """Copy ``.devcontainer/`` and ``agentpack.yml`` from a template directory.
+
+    Args:
+        template_dir: Directory containing the template.
+        target_dir: Project directory to copy into.
+        link: Allow hardlinking when reflinks are not supported.
+        max_workers: Maximum number of copy threads.
+
+    Returns:
+        How each file was copied.
+
+    Raises:
+        ValueError: If the template directory does not exist.
+    """
+    if not template_dir.is_dir():
+        raise ValueError(f"Template not found: {template_dir}")
+
+    source_devcontainer = template_dir / ".devcontainer"
+    target_devcontainer = target_dir / ".devcontainer"
+    target_devcontainer.mkdir(parents=True, exist_ok=True)
+
+    jobs: list[tuple[Path, Path]] = []
+    for root, _, files in os.walk(source_devcontainer):
+        for name in files:
+            src = Path(root) / name
+            rel_path = src.relative_to(source_devcontainer).as_posix()
+            jobs.append((src, safe_target(target_devcontainer, rel_path)))
+    if (template_dir / "agentpack.yml").is_file():
+        jobs.append((template_dir / "agentpack.yml", target_dir / "agentpack.yml"))
+
+    for parent in {dst.parent for _, dst in jobs}:
+        parent.mkdir(parents=True, exist_ok=True)
+
+    workers = min(max_workers, len(jobs))
+    if workers <= 1:
+        return [copy_file(src, dst, link=link) for src, dst in jobs]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda job: copy_file(*job, link=link), jobs))
+
+
+def copy_local_template(
+    source: LocalTemplateSource, target_dir: Path, *, link: bool = False
+) -> None:
+    """Copy a template from a local directory, zip or tar archive.
+
+    Args:
+        source: Local template source.
+        target_dir: Project directory to copy into.
+        link: Allow hardlinking directory templates.
+
+    Raises:
+        ValueError: If the source is missing, unsupported or unsafe.
+    """
+    kind = source.kind
+    subdir = source.subdir.strip("/") if source.subdir else None
+
+    if kind == "dir":
+        copy_template_dir(source.template_dir, target_dir, link=link)
+    elif kind == "zip":
+        with zipfile.ZipFile(source.path) as zf:
+            root_dir = has_root_dir(zf.namelist(), subdir)
+            index = index_archive(zf, subdir, root_dir=root_dir)
+            extract_template(zf, index, target_dir)
+    else:
+        extract_tar_template(source.path, target_dir, subdir)
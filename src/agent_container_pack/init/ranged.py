@@ -0,0 +1,213 @@
+"""Partial template downloads using HTTP Range requests."""
+
+import io
+import re
+import zipfile
+from pathlib import Path
+
+import httpx
+
+from agent_container_pack.init.archive import extract_template, index_archive
+from agent_container_pack.init.http import create_client
+
+# End of central directory record plus the largest possible zip comment
+EOCD_SEARCH_SIZE = 22 + 65535
+
+# Member ranges closer than this are fetched in one request
+COALESCE_GAP = 64 * 1024
+
+# Minimum size of an on-demand range request
+MIN_FETCH_SIZE = 64 * 1024
+
+# Local file headers are 30 bytes plus name and extra field; the local extra
+# field may be larger than the central directory copy
+LOCAL_HEADER_SIZE = 30
+LOCAL_EXTRA_SLACK = 1024
+
+CONTENT_RANGE_PATTERN = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+
+class RangeNotSupportedError(Exception):
+    """Server does not honour HTTP Range requests for the archive."""
+
+
+class HTTPRangeFile(io.RawIOBase):
+    """Read-only, seekable file backed by HTTP Range requests.
+
+    Fetched byte ranges are kept in memory and reads are served from them;
+    missing ranges are requested on demand. Every request after the first
+    carries ``If-Range`` so a changed archive is detected instead of mixed.
+    """
+
+    def __init__(
+        self,
+        client: httpx.Client,
+        url: str,
+        *,
+        size: int,
+        etag: str | None,
+        segment: tuple[int, bytes],
+    ) -> None:
+        super().__init__()
+        self.client = client
+        self.url = url
+        self.size = size
+        self.etag = etag
+        self.requests = 1
+        self.bytes_fetched = len(segment[1])
+        self._segments = [segment]
+        self._pos = 0
+
+    @classmethod
+    def open(cls, client: httpx.Client, url: str) -> "HTTPRangeFile":
+        """Open a remote zip by fetching its tail (end of central directory).
+
+        Raises:
+            RangeNotSupportedError: If the server ignores the Range header.
+        """
+        headers = {"Range": f"bytes=-{EOCD_SEARCH_SIZE}"}
+        with client.stream("GET", url, headers=headers) as response:
+            response.raise_for_status()
+            match = CONTENT_RANGE_PATTERN.match(
+                response.headers.get("content-range", "")
+            )
+            if response.status_code != httpx.codes.PARTIAL_CONTENT or not match:
+                raise RangeNotSupportedError(f"Range requests not supported: {url}")
+            data = response.read()
+
+        return cls(
+            client,
+            str(response.url),
+            size=int(match.group(3)),
+            etag=response.headers.get("etag"),
+            segment=(int(match.group(1)), data),
+        )
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self.size
+        self._pos = max(offset, 0)
+        return self._pos
+
+    def fetch(self, start: int, end: int) -> None:
+        """Fetch bytes ``[start, end)`` into memory.
+
+        Raises:
+            RangeNotSupportedError: If the range was not honoured or the
+                archive changed since it was opened.
+        """
+        headers = {"Range": f"bytes={start}-{end - 1}"}
+        if self.etag:
+            headers["If-Range"] = self.etag
+        # Streamed so a full 200 response is dropped without reading its body
+        with self.client.stream("GET", self.url, headers=headers) as response:
+            response.raise_for_status()
+            if response.status_code != httpx.codes.PARTIAL_CONTENT:
+                raise RangeNotSupportedError(f"Range request not honoured: {self.url}")
+            data = response.read()
+
+        self.requests += 1
+        self.bytes_fetched += len(data)
+        self._segments.append((start, data))
+
+    def prefetch(self, ranges: list[tuple[int, int]]) -> None:
+        """Fetch several ``[start, end)`` ranges, coalescing nearby ones."""
+        merged: list[list[int]] = []
+        for start, end in sorted(ranges):
+            if merged and start - merged[-1][1] <= COALESCE_GAP:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        for start, end in merged:
+            self.fetch(start, min(end, self.size))
+
+    def _lookup(self, start: int, end: int) -> bytes | None:
+        for seg_start, data in self._segments:
+            if seg_start <= start and end <= seg_start + len(data):
+                return data[start - seg_start : end - seg_start]
+        return None
+
+    def read(self, size: int = -1) -> bytes:
+        start = self._pos
+        end = self.size if size is None or size < 0 else min(start + size, self.size)
+        if start >= end:
+            return b""
+
+        data = self._lookup(start, end)
+        if data is None:
+            self.fetch(start, min(max(end, start + MIN_FETCH_SIZE), self.size))
+            data = self._lookup(start, end) or b""
+        self._pos = start + len(data)
+        return data
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:  # type: ignore[override]
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+def _member_range(info: zipfile.ZipInfo, size: int) -> tuple[int, int]:
+    """Byte range holding a member's local header and compressed data."""
+    start = info.header_offset
+    end = (
+        start
+        + LOCAL_HEADER_SIZE
+        + len(info.orig_filename.encode())
+        + len(info.extra)
+        + LOCAL_EXTRA_SLACK
+        + info.compress_size
+    )
+    return start, min(end, size)
+
+
+def extract_remote_template(
+    url: str,
+    target_dir: Path,
+    *,
+    subdir: str | None = None,
+    client: httpx.Client | None = None,
+) -> HTTPRangeFile:
+    """Extract a template by fetching only the parts of the zip it needs.
+
+    The end of central directory record and the central directory are
+    read first; then only the byte ranges of ``.devcontainer/`` members and
+    ``agentpack.yml`` are requested.
+
+    Args:
+        url: Archive URL.
+        target_dir: Directory to extract template to.
+        subdir: Template subdirectory within the repository.
+        client: HTTP client to use (a new one is created if omitted).
+
+    Returns:
+        The remote file, for inspecting request statistics.
+
+    Raises:
+        RangeNotSupportedError: If the server does not support ranges.
+    """
+    own_client = client is None
+    client = client or create_client()
+    try:
+        remote = HTTPRangeFile.open(client, url)
+        with zipfile.ZipFile(remote) as zf:
+            index = index_archive(zf, subdir)
+            members = list(index.devcontainer.values())
+            if index.manifest is not None:
+                members.append(index.manifest)
+            remote.prefetch([_member_range(info, remote.size) for info in members])
+            extract_template(zf, index, target_dir)
+        return remote
+    finally:
+        if own_client:
+            client.close()
@@ -1,17 +1,44 @@
 """Template download and extraction."""
 
-import io
+import asyncio
+import contextlib
 import re
+import tempfile
 import zipfile
+from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
+from typing import BinaryIO
 
 import httpx
 
+from agent_container_pack.init.archive import extract_template, index_archive
+from agent_container_pack.init.cache import CacheEntry, TemplateCache
+from agent_container_pack.init.http import create_client
+from agent_container_pack.init.local import LocalTemplateSource, copy_local_template
+from agent_container_pack.init.ranged import (
+    RangeNotSupportedError,
+    extract_remote_template,
+)
+
+GITHUB_URL = "https://github.com"
+
+# Upper bound for a template archive download
+MAX_ARCHIVE_SIZE = 512 * 1024 * 1024
+
+# Downloads are kept in memory up to this size, then spill to disk
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+ProgressCallback = Callable[[int, int | None], None]
+
 GITHUB_PATTERN = re.compile(
     r"^github:(?P<owner>[^/]+)/(?P<repo>[^@#]+)(?:@(?P<branch>[^#]+))?(?:#(?P<subdir>.+))?$"
 )
 
+LOCAL_PATTERN = re.compile(r"^(?:file|dir):(?P<path>[^#]+)(?:#(?P<subdir>.+))?$")
+
 
 @dataclass
 class TemplateSource:
@@ -22,12 +49,35 @@ class TemplateSource:
     branch: str | None = None
     subdir: str | None = None
 
+    @property
+    def ref(self) -> str:
+        """Branch to download (defaults to main)."""
+        return self.branch or "main"
+
+    @property
+    def cache_key(self) -> str:
+        """Key identifying the archive in the template cache."""
+        return f"{self.owner}/{self.repo}@{self.ref}"
 
-def parse_template_source(source: str) -> TemplateSource:
+    def archive_url(self, base_url: str = GITHUB_URL) -> str:
+        """URL of the repository zip archive."""
+        return f"{base_url}/{self.owner}/{self.repo}/archive/refs/heads/{self.ref}.zip"
+
+
+class TemplateNotCachedError(ValueError):
+    """Template is not available in the cache in offline mode."""
+
+
+class TemplateTooLargeError(ValueError):
+    """Template archive exceeds the size limit."""
+
+
+def parse_template_source(source: str) -> TemplateSource | LocalTemplateSource:
     """Parse template source string.
 
     Args:
-        source: Template source (e.g., "github:owner/repo@branch#subdir")
+        source: Template source (e.g., "github:owner/repo@branch#subdir",
+            "dir:path/to/template" or "file:template.tar.gz#subdir")
 
     Returns:
         Parsed template source.
@@ -35,6 +85,12 @@ def parse_template_source(source: str) -> TemplateSource:
     Raises:
         ValueError: If source format is invalid.
     """
+    if match := LOCAL_PATTERN.match(source):
+        return LocalTemplateSource(
+            path=Path(match.group("path")).expanduser(),
+            subdir=match.group("subdir"),
+        )
+
     match = GITHUB_PATTERN.match(source)
     if not match:
         raise ValueError(f"Invalid template source: {source}")
@@ -47,55 +103,301 @@ def parse_template_source(source: str) -> TemplateSource:
     )
 
 
-def download_template(source: TemplateSource, target_dir: Path) -> None:
-    """Download template from GitHub.
+def _expected_size(response: httpx.Response, max_size: int) -> int | None:
+    """Return the announced body size, rejecting oversized archives early."""
+    length = response.headers.get("content-length")
+    total = int(length) if length and length.isdigit() else None
+    if total is not None and total > max_size:
+        raise TemplateTooLargeError(
+            f"Template archive is {total} bytes, limit is {max_size} bytes"
+        )
+    return total
+
+
+def _check_received(received: int, max_size: int) -> None:
+    if received > max_size:
+        raise TemplateTooLargeError(
+            f"Template archive exceeds limit of {max_size} bytes"
+        )
+
+
+def _stream_to_file(
+    response: httpx.Response,
+    out: BinaryIO,
+    *,
+    max_size: int,
+    progress: ProgressCallback | None,
+) -> None:
+    """Copy a streamed response body into a file, enforcing a size cap."""
+    total = _expected_size(response, max_size)
+    received = 0
+    for chunk in response.iter_bytes(DOWNLOAD_CHUNK_SIZE):
+        received += len(chunk)
+        _check_received(received, max_size)
+        out.write(chunk)
+        if progress:
+            progress(received, total)
+    out.seek(0)
+
+
+async def _astream_to_file(
+    response: httpx.Response,
+    out: BinaryIO,
+    *,
+    max_size: int,
+    progress: ProgressCallback | None,
+) -> None:
+    """Async variant of :func:`_stream_to_file`."""
+    total = _expected_size(response, max_size)
+    received = 0
+    async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+        received += len(chunk)
+        _check_received(received, max_size)
+        out.write(chunk)
+        if progress:
+            progress(received, total)
+    out.seek(0)
+
+
+def _cached_entry(
+    source: TemplateSource, cache: TemplateCache | None, offline: bool
+) -> CacheEntry | None:
+    """Look up the cached archive, failing in offline mode if there is none."""
+    entry = cache.lookup(source.cache_key) if cache else None
+    if offline and entry is None:
+        raise TemplateNotCachedError(
+            f"Template {source.cache_key} is not cached (offline mode)"
+        )
+    return entry
+
+
+def _revalidation_headers(entry: CacheEntry | None) -> dict[str, str]:
+    return {"If-None-Match": entry.etag} if entry and entry.etag else {}
+
+
+def _open_cached(
+    source: TemplateSource, cache: TemplateCache, entry: CacheEntry
+) -> BinaryIO:
+    cache.touch(source.cache_key)
+    return cache.blob_path(entry).open("rb")
+
+
+def _finish_download(
+    source: TemplateSource,
+    cache: TemplateCache | None,
+    spooled: BinaryIO,
+    etag: str | None,
+) -> BinaryIO:
+    """Store a downloaded archive in the cache and reopen it from there."""
+    if cache is None:
+        return spooled
+    with spooled:
+        entry = cache.store(source.cache_key, spooled, etag)
+    return cache.blob_path(entry).open("rb")
+
+
+def fetch_archive(
+    source: TemplateSource,
+    *,
+    cache: TemplateCache | None = None,
+    offline: bool = False,
+    base_url: str = GITHUB_URL,
+    max_size: int = MAX_ARCHIVE_SIZE,
+    progress: ProgressCallback | None = None,
+    client: httpx.Client | None = None,
+) -> BinaryIO:
+    """Fetch the template archive, going through the cache if given.
+
+    The response is streamed into a spooled temporary file, so memory use
+    stays flat regardless of archive size. A cached archive is revalidated
+    with ``If-None-Match``; a 304 response reuses it without downloading
+    again.
 
     Args:
         source: Parsed template source.
+        cache: Template cache, or None to always download.
+        offline: Only use the cache, never the network.
+        base_url: GitHub base URL.
+        max_size: Maximum archive size in bytes.
+        progress: Called with (bytes received, total bytes or None).
+        client: HTTP client to reuse (see :func:`create_client`); a new one
+            with the default configuration is used if omitted.
+
+    Returns:
+        Open binary file positioned at the start of the zip archive. The
+        caller is responsible for closing it.
+
+    Raises:
+        TemplateNotCachedError: If offline and the template is not cached.
+        TemplateTooLargeError: If the archive exceeds ``max_size``.
+    """
+    entry = _cached_entry(source, cache, offline)
+    if offline and cache and entry:
+        return _open_cached(source, cache, entry)
+
+    with contextlib.ExitStack() as stack:
+        if client is None:
+            client = stack.enter_context(create_client())
+        response = stack.enter_context(
+            client.stream(
+                "GET",
+                source.archive_url(base_url),
+                headers=_revalidation_headers(entry),
+            )
+        )
+        if cache and entry and response.status_code == httpx.codes.NOT_MODIFIED:
+            return _open_cached(source, cache, entry)
+        response.raise_for_status()
+
+        # Returned to the caller, so not a context manager; closed on error
+        spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)  # noqa: SIM115
+        try:
+            _stream_to_file(response, spooled, max_size=max_size, progress=progress)
+        except BaseException:
+            spooled.close()
+            raise
+
+    return _finish_download(source, cache, spooled, response.headers.get("etag"))
+
+
+async def fetch_archive_async(
+    source: TemplateSource,
+    *,
+    client: httpx.AsyncClient,
+    cache: TemplateCache | None = None,
+    offline: bool = False,
+    base_url: str = GITHUB_URL,
+    max_size: int = MAX_ARCHIVE_SIZE,
+    progress: ProgressCallback | None = None,
+) -> BinaryIO:
+    """Async variant of :func:`fetch_archive` on a shared async client.
+
+    Args:
+        source: Parsed template source.
+        client: Async HTTP client (see :func:`create_async_client`).
+        cache: Template cache, or None to always download.
+        offline: Only use the cache, never the network.
+        base_url: GitHub base URL.
+        max_size: Maximum archive size in bytes.
+        progress: Called with (bytes received, total bytes or None).
+
+    Returns:
+        Open binary file positioned at the start of the zip archive. The
+        caller is responsible for closing it.
+
+    Raises:
+        TemplateNotCachedError: If offline and the template is not cached.
+        TemplateTooLargeError: If the archive exceeds ``max_size``.
+    """
+    entry = _cached_entry(source, cache, offline)
+    if offline and cache and entry:
+        return _open_cached(source, cache, entry)
+
+    async with client.stream(
+        "GET", source.archive_url(base_url), headers=_revalidation_headers(entry)
+    ) as response:
+        if cache and entry and response.status_code == httpx.codes.NOT_MODIFIED:
+            return _open_cached(source, cache, entry)
+        response.raise_for_status()
+
+        # Returned to the caller, so not a context manager; closed on error
+        spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)  # noqa: SIM115
+        try:
+            await _astream_to_file(
+                response, spooled, max_size=max_size, progress=progress
+            )
+        except BaseException:
+            spooled.close()
+            raise
+
+    # Hashing and copying into the cache is blocking file I/O
+    return await asyncio.to_thread(
+        _finish_download, source, cache, spooled, response.headers.get("etag")
+    )
+
+
+def download_template(
+    source: TemplateSource | LocalTemplateSource,
+    target_dir: Path,
+    *,
+    cache: TemplateCache | None = None,
+    offline: bool = False,
+    base_url: str = GITHUB_URL,
+    max_size: int = MAX_ARCHIVE_SIZE,
+    progress: ProgressCallback | None = None,
+    partial: bool = False,
+    link: bool = False,
+    client: httpx.Client | None = None,
+) -> None:
+    """Download template from GitHub, or copy it from a local source.
+
+    Local sources never touch the network or the cache.
+
+    Args:
+        source: Parsed template source.
+        target_dir: Directory to extract template to.
+        cache: Template cache, or None to always download.
+        offline: Only use the cache, never the network.
+        base_url: GitHub base URL.
+        max_size: Maximum archive size in bytes.
+        progress: Called with (bytes received, total bytes or None).
+        partial: On a cache miss, fetch only the needed archive members with
+            HTTP Range requests when the server supports them. Partial
+            fetches are not cached; the full download is the fallback.
+        link: Allow hardlinking files of local directory templates.
+        client: HTTP client to reuse (see :func:`create_client`); a new one
+            with the default configuration is used if omitted.
+    """
+    if isinstance(source, LocalTemplateSource):
+        copy_local_template(source, target_dir, link=link)
+        return
+
+    with contextlib.ExitStack() as stack:
+        if client is None:
+            client = stack.enter_context(create_client())
+
+        if (
+            partial
+            and not offline
+            and (cache is None or cache.lookup(source.cache_key) is None)
+        ):
+            try:
+                extract_remote_template(
+                    source.archive_url(base_url),
+                    target_dir,
+                    subdir=source.subdir,
+                    client=client,
+                )
+                return
+            except RangeNotSupportedError:
+                pass
+
+        archive = fetch_archive(
+            source,
+            cache=cache,
+            offline=offline,
+            base_url=base_url,
+            max_size=max_size,
+            progress=progress,
+            client=client,
+        )
+
+    extract_archive(archive, target_dir, source.subdir)
+
+
+def extract_archive(
+    archive: BinaryIO, target_dir: Path, subdir: str | None = None
+) -> None:
+    """Extract a fetched template archive and close it.
+
+    Args:
+        archive: Open zip archive, as returned by :func:`fetch_archive`.
         target_dir: Directory to extract template to.
+        subdir: Template subdirectory within the repository.
     """
-    branch = source.branch or "main"
-    url = f"https://github.com/{source.owner}/{source.repo}/archive/refs/heads/{branch}.zip"
-
-    response = httpx.get(url, follow_redirects=True)
-    response.raise_for_status()
-
-    with zipfile.ZipFile(io.BytesIO(response.content)) as zf:
-        # Find the root directory in zip (usually repo-branch)
-        root_prefix = None
-        for name in zf.namelist():
-            parts = name.split("/")
-            if len(parts) > 1:
-                root_prefix = parts[0]
-                break
-
-        if not root_prefix:
-            raise ValueError("Empty or invalid zip archive")
-
-        # Determine source directory in zip
-        if source.subdir:
-            zip_prefix = f"{root_prefix}/{source.subdir}/"
-        else:
-            zip_prefix = f"{root_prefix}/"
-
-        # Extract .devcontainer contents
-        devcontainer_prefix = f"{zip_prefix}.devcontainer/"
-        target_devcontainer = target_dir / ".devcontainer"
-        target_devcontainer.mkdir(parents=True, exist_ok=True)
-
-        for name in zf.namelist():
-            if name.startswith(devcontainer_prefix) and not name.endswith("/"):
-                # Get relative path within .devcontainer
-                rel_path = name[len(devcontainer_prefix) :]
-                if rel_path:
-                    target_file = target_devcontainer / rel_path
-                    target_file.parent.mkdir(parents=True, exist_ok=True)
-                    target_file.write_bytes(zf.read(name))
-
-        # Extract agentpack.yml from template
-        agentpack_yml_path = f"{zip_prefix}agentpack.yml"
-        if agentpack_yml_path in zf.namelist():
-            (target_dir / "agentpack.yml").write_bytes(zf.read(agentpack_yml_path))
+    with archive, zipfile.ZipFile(archive) as zf:
+        index = index_archive(zf, subdir)
+        extract_template(zf, index, target_dir)
 
 
 def generate_skeleton(target_dir: Path, stack: str | None = None) -> None:
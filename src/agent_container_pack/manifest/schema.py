@@ -2,9 +2,19 @@
 
 from __future__ import annotations
 
+import re
 from typing import Literal
+from urllib.parse import quote
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+# Hostname, optionally prefixed by "*." (subdomains) or "." (domain and subdomains)
+ALLOW_RULE_PATTERN = re.compile(
+    r"^(\*\.|\.)?([a-z0-9]([a-z0-9-]*[a-z0-9])?\.)*[a-z0-9]([a-z0-9-]*[a-z0-9])?$"
+)
+
+# Shared servers are served by `acpack mcp serve` under this path
+PROXY_PATH = "/mcp/"
 
 
 class ProjectConfig(BaseModel):
@@ -17,7 +27,7 @@ class ProjectConfig(BaseModel):
 class DocsConfig(BaseModel):
     """Documentation generation configuration."""
 
-    mode: Literal["single-stack", "multi-stack"] = "single-stack"
+    mode: Literal["single-stack", "multi-stack", "workspace"] = "single-stack"
     defaultStack: str = "auto"
     maxLines: int = 250
 
@@ -38,6 +48,8 @@ class StackConfig(BaseModel):
     test: str | None = None
     run: str | None = None
     skills: dict[str, list[str]] = Field(default_factory=dict)
+    # MCP servers the stack needs; None means all of them
+    mcp: list[str] | None = None
 
 
 class SkillsConfig(BaseModel):
@@ -46,16 +58,28 @@ class SkillsConfig(BaseModel):
     root: str = ".claude/skills"
 
 
-class MCPServerStdio(BaseModel):
+class MCPServerOptions(BaseModel):
+    """Timeouts and tool filters shared by all MCP server transports."""
+
+    startup_timeout_sec: float | None = Field(default=None, gt=0)
+    tool_timeout_sec: float | None = Field(default=None, gt=0)
+    # None exposes every tool; disabled_tools is applied afterwards
+    enabled_tools: list[str] | None = None
+    disabled_tools: list[str] = Field(default_factory=list)
+
+
+class MCPServerStdio(MCPServerOptions):
     """STDIO MCP server configuration."""
 
     transport: Literal["stdio"] = "stdio"
     command: list[str] = Field(min_length=1)
     env: dict[str, str] = Field(default_factory=dict)
     cwd: str | None = None
+    # Run one instance behind `acpack mcp serve` for all agent sessions
+    shared: bool = False
 
 
-class MCPServerHTTP(BaseModel):
+class MCPServerHTTP(MCPServerOptions):
     """HTTP MCP server configuration."""
 
     transport: Literal["http"]
@@ -66,10 +90,43 @@ class MCPServerHTTP(BaseModel):
 MCPServer = MCPServerStdio | MCPServerHTTP
 
 
+class MCPProxyConfig(BaseModel):
+    """Address of the shared MCP server proxy (`acpack mcp serve`)."""
+
+    host: str = "127.0.0.1"
+    port: int = Field(default=8765, ge=1, le=65535)
+
+
+def proxy_url(proxy: MCPProxyConfig, name: str) -> str:
+    """URL under which the proxy serves a shared server."""
+    host = f"[{proxy.host}]" if ":" in proxy.host else proxy.host
+    return f"http://{host}:{proxy.port}{PROXY_PATH}{quote(name, safe='')}"
+
+
 class MCPConfig(BaseModel):
     """MCP configuration."""
 
     servers: dict[str, MCPServer] = Field(default_factory=dict)
+    proxy: MCPProxyConfig = Field(default_factory=MCPProxyConfig)
+    # Install npx/uvx server packages into the devcontainer image
+    preinstall: bool = False
+
+
+class FirewallConfig(BaseModel):
+    """Devcontainer firewall configuration."""
+
+    allow: list[str] = Field(default_factory=list)
+
+    @field_validator("allow")
+    @classmethod
+    def _check_allow_rules(cls, rules: list[str]) -> list[str]:
+        normalized = [rule.strip().lower().rstrip(".") for rule in rules]
+        for rule in normalized:
+            if not ALLOW_RULE_PATTERN.match(rule):
+                raise ValueError(
+                    f"Invalid allow rule {rule!r}: expected host, *.domain or .domain"
+                )
+        return normalized
 
 
 class WorkflowConfig(BaseModel):
@@ -96,7 +153,19 @@ class Manifest(BaseModel):
     stacks: dict[str, StackConfig] = Field(default_factory=dict)
     skills: SkillsConfig = Field(default_factory=SkillsConfig)
     mcp: MCPConfig = Field(default_factory=MCPConfig)
+    firewall: FirewallConfig = Field(default_factory=FirewallConfig)
     workflows: list[WorkflowConfig] = Field(default_factory=list)
     pre_commit: list[str] = Field(default_factory=list)
     safety: SafetyConfig = Field(default_factory=SafetyConfig)
     custom_content: str | None = None
+
+    @model_validator(mode="after")
+    def _check_stack_servers(self) -> Manifest:
+        for stack_id, stack in self.stacks.items():
+            unknown = [n for n in stack.mcp or [] if n not in self.mcp.servers]
+            if unknown:
+                raise ValueError(
+                    f"Stack {stack_id!r} references unknown MCP server(s): "
+                    f"{', '.join(unknown)}"
+                )
+        return self
@@ -0,0 +1,59 @@
+"""MCP server probing, benchmarks, footprints and the shared server proxy."""
+
+from agent_container_pack.manifest.schema import proxy_url
+from agent_container_pack.mcp.bench import (
+    ServerBenchmark,
+    bench_servers,
+    percentile,
+    run_bench,
+)
+from agent_container_pack.mcp.client import (
+    HttpSession,
+    MCPError,
+    StdioClient,
+    expand_variables,
+    list_tools,
+    select_servers,
+)
+from agent_container_pack.mcp.doctor import (
+    ProbeResult,
+    probe_http,
+    probe_servers,
+    probe_stdio,
+    run_doctor,
+)
+from agent_container_pack.mcp.footprint import (
+    ServerFootprint,
+    ToolFootprint,
+    estimate_tokens,
+    measure_footprints,
+    run_footprint,
+)
+from agent_container_pack.mcp.proxy import MCPProxy, SharedServer, shared_servers
+
+__all__ = [
+    "HttpSession",
+    "MCPError",
+    "MCPProxy",
+    "ProbeResult",
+    "ServerBenchmark",
+    "ServerFootprint",
+    "SharedServer",
+    "StdioClient",
+    "ToolFootprint",
+    "bench_servers",
+    "estimate_tokens",
+    "expand_variables",
+    "list_tools",
+    "measure_footprints",
+    "percentile",
+    "probe_http",
+    "probe_servers",
+    "probe_stdio",
+    "proxy_url",
+    "run_bench",
+    "run_doctor",
+    "run_footprint",
+    "select_servers",
+    "shared_servers",
+]
@@ -0,0 +1,277 @@
+"""Benchmark MCP server startup latency and memory."""
+
+import asyncio
+import math
+import statistics
+import time
+from collections.abc import Sequence
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Literal
+
+import httpx
+
+from agent_container_pack.init.http import HttpConfig, create_async_client
+from agent_container_pack.manifest.schema import (
+    Manifest,
+    MCPServer,
+    MCPServerHTTP,
+    MCPServerStdio,
+)
+from agent_container_pack.mcp.client import (
+    HttpSession,
+    MCPError,
+    StdioClient,
+    list_tools,
+    select_servers,
+)
+from agent_container_pack.mcp.doctor import DEFAULT_PROBE_TIMEOUT
+
+DEFAULT_TRIALS = 10
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Percentile with linear interpolation between closest ranks.
+
+    Raises:
+        ValueError: If ``values`` is empty.
+    """
+    if not values:
+        raise ValueError("percentile of empty data")
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values: Sequence[float]) -> dict[str, float] | None:
+    """p50/p95/p99, min, max and mean of a sample, or None if empty."""
+    if not values:
+        return None
+    summary = {f"p{q}": percentile(values, q) for q in PERCENTILES}
+    summary.update(min=min(values), max=max(values), mean=statistics.fmean(values))
+    return summary
+
+
+def read_rss(pid: int) -> int | None:
+    """Resident set size of a process in bytes, from ``/proc`` (Linux only)."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        return None
+    return None
+
+
+def process_tree(pid: int) -> list[int]:
+    """A process and all its descendants, from ``/proc`` (Linux only).
+
+    Servers started through ``npx``, ``uvx`` or a shell wrapper run as
+    children of the spawned process, so the whole tree is the server.
+    """
+    pids = [pid]
+    for current in pids:
+        for children in Path(f"/proc/{current}/task").glob("*/children"):
+            try:
+                pids.extend(int(child) for child in children.read_text().split())
+            except (OSError, ValueError):
+                continue
+    return list(dict.fromkeys(pids))
+
+
+def read_tree_rss(pid: int) -> int | None:
+    """Resident set size of a process and its descendants in bytes."""
+    sizes = [rss for p in process_tree(pid) if (rss := read_rss(p)) is not None]
+    return sum(sizes) if sizes else None
+
+
+@dataclass
+class Trial:
+    """Timings of one start of a server, in seconds."""
+
+    initialize: float
+    tools_list: float
+    tools: int
+    # Summed over the server's process tree; only known for stdio servers on Linux
+    rss: int | None = None
+
+
+@dataclass
+class ServerBenchmark:
+    """All trials of one server.
+
+    The first trial is the cold start (package caches, bytecode and page
+    cache may still be empty); the remaining trials are warm starts.
+    """
+
+    name: str
+    transport: Literal["stdio", "http"]
+    trials: list[Trial] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def cold(self) -> Trial | None:
+        """The first successful trial."""
+        return self.trials[0] if self.trials else None
+
+    @property
+    def warm(self) -> list[Trial]:
+        """Every trial after the first."""
+        return self.trials[1:]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize with millisecond timings and warm-start percentiles."""
+
+        def ms(values: Sequence[float]) -> dict[str, float] | None:
+            summary = summarize([v * 1000 for v in values])
+            return {k: round(v, 3) for k, v in summary.items()} if summary else None
+
+        rss = [t.rss for t in self.warm if t.rss is not None]
+        cold = self.cold
+        return {
+            "name": self.name,
+            "transport": self.transport,
+            "errors": self.errors,
+            "cold": {
+                "initialize_ms": round(cold.initialize * 1000, 3),
+                "tools_list_ms": round(cold.tools_list * 1000, 3),
+                "rss_bytes": cold.rss,
+            }
+            if cold
+            else None,
+            "warm": {
+                "initialize_ms": ms([t.initialize for t in self.warm]),
+                "tools_list_ms": ms([t.tools_list for t in self.warm]),
+                "rss_bytes": summarize(rss),
+            },
+            "trials": [
+                {
+                    "initialize_ms": round(t.initialize * 1000, 3),
+                    "tools_list_ms": round(t.tools_list * 1000, 3),
+                    "tools": t.tools,
+                    "rss_bytes": t.rss,
+                }
+                for t in self.trials
+            ],
+        }
+
+
+async def _trial_stdio(server: MCPServerStdio, project_dir: Path) -> Trial:
+    start = time.perf_counter()
+    async with StdioClient(server, project_dir) as client:
+        await client.initialize()
+        initialized = time.perf_counter()
+        tools = await list_tools(client)
+        listed = time.perf_counter()
+        rss = read_tree_rss(client.pid) if client.pid else None
+    return Trial(initialized - start, listed - initialized, len(tools), rss)
+
+
+async def _trial_http(
+    server: MCPServerHTTP, project_dir: Path, client: httpx.AsyncClient
+) -> Trial:
+    start = time.perf_counter()
+    async with HttpSession(server, project_dir, client) as session:
+        await session.initialize()
+        initialized = time.perf_counter()
+        tools = await list_tools(session)
+        listed = time.perf_counter()
+    return Trial(initialized - start, listed - initialized, len(tools))
+
+
+async def bench_server(
+    name: str,
+    server: MCPServer,
+    project_dir: Path,
+    client: httpx.AsyncClient,
+    *,
+    trials: int = DEFAULT_TRIALS,
+    timeout: float = DEFAULT_PROBE_TIMEOUT,
+) -> ServerBenchmark:
+    """Start a server ``trials`` times, one after another.
+
+    Each trial spawns the process (or opens a new HTTP session), times
+    the ``initialize`` handshake and a full ``tools/list``, and samples
+    the RSS of the process tree before stopping it. Failed trials are recorded as
+    errors and excluded from the timings.
+    """
+    result = ServerBenchmark(name, server.transport)
+    for _ in range(trials):
+        trial = (
+            _trial_stdio(server, project_dir)
+            if isinstance(server, MCPServerStdio)
+            else _trial_http(server, project_dir, client)
+        )
+        try:
+            result.trials.append(await asyncio.wait_for(trial, timeout))
+        except TimeoutError:
+            result.errors.append(f"Timed out after {timeout:g}s")
+        except (OSError, MCPError, httpx.HTTPError) as e:
+            result.errors.append(str(e) or type(e).__name__)
+    return result
+
+
+async def bench_servers(
+    manifest: Manifest,
+    project_dir: Path,
+    *,
+    names: Sequence[str] | None = None,
+    trials: int = DEFAULT_TRIALS,
+    timeout: float = DEFAULT_PROBE_TIMEOUT,
+    client: httpx.AsyncClient | None = None,
+) -> list[ServerBenchmark]:
+    """Benchmark MCP servers one at a time.
+
+    Servers run sequentially so they do not compete for CPU and skew each
+    other's startup times.
+
+    Args:
+        manifest: Validated manifest.
+        project_dir: Project directory (working directory of stdio servers).
+        names: Servers to benchmark (default: all).
+        trials: Starts per server; the first one is the cold start.
+        timeout: Seconds a single trial may take.
+        client: Pooled client for HTTP servers (created if omitted).
+
+    Returns:
+        One benchmark per server, in manifest order.
+
+    Raises:
+        ValueError: If a requested server is not configured or trials < 1.
+    """
+    if trials < 1:
+        raise ValueError("trials must be at least 1")
+    selected = select_servers(manifest, names)
+
+    results: list[ServerBenchmark] = []
+    async with AsyncExitStack() as stack:
+        if client is None:
+            config = HttpConfig(read_timeout=timeout, retries=0)
+            client = await stack.enter_async_context(create_async_client(config))
+        for name, server in selected.items():
+            results.append(
+                await bench_server(
+                    name, server, project_dir, client, trials=trials, timeout=timeout
+                )
+            )
+    return results
+
+
+def run_bench(
+    manifest: Manifest,
+    project_dir: Path,
+    *,
+    names: Sequence[str] | None = None,
+    trials: int = DEFAULT_TRIALS,
+    timeout: float = DEFAULT_PROBE_TIMEOUT,
+) -> list[ServerBenchmark]:
+    """Synchronous wrapper around :func:`bench_servers`."""
+    return asyncio.run(
+        bench_servers(
+            manifest, project_dir, names=names, trials=trials, timeout=timeout
+        )
+    )
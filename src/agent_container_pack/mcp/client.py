@@ -0,0 +1,424 @@
+"""Minimal MCP clients for probing configured servers."""
+
+import asyncio
+import contextlib
+import json
+import os
+import re
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import Any, Self
+
+import httpx
+
+from agent_container_pack import __version__
+from agent_container_pack.manifest.schema import (
+    Manifest,
+    MCPServer,
+    MCPServerHTTP,
+    MCPServerStdio,
+)
+
+PROTOCOL_VERSION = "2025-06-18"
+CLIENT_INFO = {"name": "acpack", "version": __version__}
+
+# ${workspaceFolder}, ${env:VAR} or ${VAR}
+VARIABLE_PATTERN = re.compile(
+    r"\$\{(workspaceFolder|(?:env:)?[A-Za-z_][A-Za-z0-9_]*)\}"
+)
+
+# Stdio messages are newline-delimited; tools/list results can be large
+STDIO_LINE_LIMIT = 64 * 1024 * 1024
+# stderr kept per server, for error messages
+STDERR_LIMIT = 64 * 1024
+
+
+class MCPError(Exception):
+    """Raised when an MCP server returns an error or breaks the protocol."""
+
+
+def expand_variables(
+    value: str, project_dir: Path, env: Mapping[str, str] | None = None
+) -> str:
+    """Expand ``${workspaceFolder}``, ``${env:VAR}`` and ``${VAR}``.
+
+    Unknown variables are left as they are.
+    """
+    env = os.environ if env is None else env
+
+    def replace(match: re.Match[str]) -> str:
+        name = match.group(1)
+        if name == "workspaceFolder":
+            return str(project_dir)
+        return env.get(name.removeprefix("env:"), match.group(0))
+
+    return VARIABLE_PATTERN.sub(replace, value)
+
+
+def select_servers(
+    manifest: Manifest, names: Sequence[str] | None = None
+) -> dict[str, MCPServer]:
+    """Pick servers by name, in manifest order (all if ``names`` is None).
+
+    Raises:
+        ValueError: If a requested server is not configured.
+    """
+    servers = manifest.mcp.servers
+    unknown = sorted(set(names or ()) - servers.keys())
+    if unknown:
+        raise ValueError(f"Unknown MCP server(s): {', '.join(unknown)}")
+    return {n: s for n, s in servers.items() if names is None or n in names}
+
+
+def initialize_params() -> dict[str, Any]:
+    """Parameters of the ``initialize`` request sent by acpack."""
+    return {
+        "protocolVersion": PROTOCOL_VERSION,
+        "capabilities": {},
+        "clientInfo": CLIENT_INFO,
+    }
+
+
+def _result(message: dict[str, Any]) -> dict[str, Any]:
+    """Return a response's result, raising MCPError for error responses."""
+    if "error" in message:
+        error = message["error"]
+        raise MCPError(f"{error.get('message', 'Unknown error')} ({error.get('code')})")
+    result = message.get("result")
+    if not isinstance(result, dict):
+        raise MCPError("Response has no result")
+    return result
+
+
+class StdioClient:
+    """JSON-RPC client for an MCP server speaking over stdin/stdout.
+
+    A reader task matches responses to requests by ID, so several
+    requests may be in flight at once. Use as an async context manager::
+
+        async with StdioClient(server, project_dir) as client:
+            await client.initialize()
+    """
+
+    def __init__(self, server: MCPServerStdio, project_dir: Path) -> None:
+        self.server = server
+        self.project_dir = project_dir
+        self.process: asyncio.subprocess.Process | None = None
+        self._next_id = 1
+        self._pending: dict[int, asyncio.Future[dict[str, Any]]] = {}
+        self._closed_error: MCPError | None = None
+        self._stderr = bytearray()
+        self._stderr_task: asyncio.Task[None] | None = None
+        self._reader_task: asyncio.Task[None] | None = None
+
+    @property
+    def pid(self) -> int | None:
+        """Process ID of the running server."""
+        return self.process.pid if self.process else None
+
+    @property
+    def running(self) -> bool:
+        """Whether the server process is alive and its stdout open."""
+        return (
+            self.process is not None
+            and self.process.returncode is None
+            and self._closed_error is None
+        )
+
+    @property
+    def stderr(self) -> str:
+        """The last ``STDERR_LIMIT`` bytes the server wrote to stderr."""
+        return self._stderr.decode(errors="replace")
+
+    async def start(self) -> None:
+        """Start the server process.
+
+        Raises:
+            OSError: If the command cannot be executed.
+        """
+        command = [
+            expand_variables(arg, self.project_dir) for arg in self.server.command
+        ]
+        env = dict(os.environ)
+        env.update(
+            {
+                k: expand_variables(v, self.project_dir)
+                for k, v in self.server.env.items()
+            }
+        )
+        cwd = self.project_dir
+        if self.server.cwd:
+            cwd = self.project_dir / expand_variables(self.server.cwd, self.project_dir)
+
+        self.process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=env,
+            cwd=cwd,
+            limit=STDIO_LINE_LIMIT,
+        )
+        self._stderr_task = asyncio.create_task(self._drain_stderr())
+        self._reader_task = asyncio.create_task(self._read_messages())
+
+    async def _drain_stderr(self) -> None:
+        """Collect stderr so a chatty server never blocks on a full pipe."""
+        assert self.process and self.process.stderr
+        while chunk := await self.process.stderr.read(65536):
+            self._stderr += chunk
+            del self._stderr[:-STDERR_LIMIT]
+
+    async def _send(self, message: dict[str, Any]) -> None:
+        assert self.process and self.process.stdin
+        self.process.stdin.write(json.dumps(message).encode() + b"\n")
+        await self.process.stdin.drain()
+
+    async def _read_messages(self) -> None:
+        """Route responses to waiting requests until stdout closes.
+
+        Notifications are ignored; requests from the server are answered
+        with an error.
+        """
+        assert self.process and self.process.stdout
+        error = MCPError("Server closed stdout")
+        try:
+            while line := await self.process.stdout.readline():
+                if not line.strip():
+                    continue
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError as e:
+                    error = MCPError(f"Invalid JSON from server: {e}")
+                    break
+                if not isinstance(message, dict):
+                    continue
+                if "method" in message:
+                    if "id" in message:
+                        await self._send(
+                            {
+                                "jsonrpc": "2.0",
+                                "id": message["id"],
+                                "error": {
+                                    "code": -32601,
+                                    "message": "Method not found",
+                                },
+                            }
+                        )
+                    continue
+                request_id = message.get("id")
+                future = (
+                    self._pending.pop(request_id, None)
+                    if isinstance(request_id, int)
+                    else None
+                )
+                if future and not future.done():
+                    future.set_result(message)
+        except (OSError, ValueError) as e:
+            error = MCPError(str(e) or type(e).__name__)
+        self._closed_error = error
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+
+    async def call(
+        self, method: str, params: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Send a request and return the raw response message.
+
+        The response carries either ``result`` or ``error``; its ``id`` is
+        the one this client assigned.
+
+        Raises:
+            MCPError: If the server exits before responding.
+        """
+        if self._closed_error:
+            raise self._closed_error
+        request_id = self._next_id
+        self._next_id += 1
+        message: dict[str, Any] = {"jsonrpc": "2.0", "id": request_id, "method": method}
+        if params is not None:
+            message["params"] = params
+        future: asyncio.Future[dict[str, Any]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        self._pending[request_id] = future
+        try:
+            await self._send(message)
+            return await future
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def request(
+        self, method: str, params: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Send a request and wait for its result.
+
+        Raises:
+            MCPError: If the server returns an error or exits.
+        """
+        return _result(await self.call(method, params))
+
+    async def notify(self, method: str, params: dict[str, Any] | None = None) -> None:
+        """Send a notification."""
+        message: dict[str, Any] = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        await self._send(message)
+
+    async def initialize(self) -> dict[str, Any]:
+        """Perform the MCP initialize handshake.
+
+        Returns:
+            The server's initialize result.
+        """
+        result = await self.request("initialize", initialize_params())
+        await self.notify("notifications/initialized")
+        return result
+
+    async def close(self) -> None:
+        """Close stdin and stop the server, killing it if it lingers."""
+        if self.process is None:
+            return
+        if self.process.stdin and not self.process.stdin.is_closing():
+            self.process.stdin.close()
+        if self.process.returncode is None:
+            try:
+                await asyncio.wait_for(self.process.wait(), timeout=1.0)
+            except TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+        for task in (self._reader_task, self._stderr_task):
+            if task:
+                # Grandchildren (e.g. npx -> node) may keep the pipes open
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(task, timeout=1.0)
+
+    async def __aenter__(self) -> Self:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+
+def _parse_http_response(response: httpx.Response) -> dict[str, Any]:
+    """Extract the JSON-RPC message from a JSON or SSE response."""
+    content_type = response.headers.get("content-type", "")
+    if content_type.startswith("text/event-stream"):
+        for line in response.text.splitlines():
+            if line.startswith("data:"):
+                message = json.loads(line.removeprefix("data:").strip())
+                if isinstance(message, dict) and "method" not in message:
+                    return message
+        raise MCPError("No response in event stream")
+    message = response.json()
+    if not isinstance(message, dict):
+        raise MCPError("Response is not a JSON-RPC message")
+    return message
+
+
+class HttpSession:
+    """MCP session over Streamable HTTP, sharing a pooled client.
+
+    Mirrors :class:`StdioClient`: ``initialize()`` then ``request()``.
+    Variables in the server URL are expanded the same way as in stdio
+    commands.
+    """
+
+    def __init__(
+        self, server: MCPServerHTTP, project_dir: Path, client: httpx.AsyncClient
+    ) -> None:
+        self.server = server
+        self.url = expand_variables(server.url, project_dir)
+        self.client = client
+        self.session_id: str | None = None
+        self.protocol_version: str | None = None
+        self._next_id = 1
+
+    def _headers(self) -> dict[str, str]:
+        headers = {"Accept": "application/json, text/event-stream"}
+        if self.session_id:
+            headers["Mcp-Session-Id"] = self.session_id
+        if self.protocol_version:
+            headers["MCP-Protocol-Version"] = self.protocol_version
+        return headers
+
+    async def request(
+        self, method: str, params: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """Send a request and return its result.
+
+        Raises:
+            MCPError: If the server returns an error or an invalid response.
+            httpx.HTTPError: If the request fails.
+        """
+        message: dict[str, Any] = {
+            "jsonrpc": "2.0",
+            "id": self._next_id,
+            "method": method,
+        }
+        self._next_id += 1
+        if params is not None:
+            message["params"] = params
+        response = await self.client.post(
+            self.url, json=message, headers=self._headers()
+        )
+        response.raise_for_status()
+        self.session_id = response.headers.get("mcp-session-id", self.session_id)
+        try:
+            return _result(_parse_http_response(response))
+        except ValueError as e:
+            raise MCPError(f"Invalid JSON from server: {e}") from e
+
+    async def notify(self, method: str, params: dict[str, Any] | None = None) -> None:
+        """Send a notification."""
+        message: dict[str, Any] = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        response = await self.client.post(
+            self.url, json=message, headers=self._headers()
+        )
+        response.raise_for_status()
+
+    async def initialize(self) -> dict[str, Any]:
+        """Perform the MCP initialize handshake.
+
+        Returns:
+            The server's initialize result.
+        """
+        result = await self.request("initialize", initialize_params())
+        self.protocol_version = result.get("protocolVersion")
+        await self.notify("notifications/initialized")
+        return result
+
+    async def close(self) -> None:
+        """End the session on the server, if it issued one."""
+        if self.session_id:
+            with contextlib.suppress(httpx.HTTPError):
+                await self.client.delete(self.url, headers=self._headers())
+            self.session_id = None
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
+
+
+async def list_tools(session: StdioClient | HttpSession) -> list[dict[str, Any]]:
+    """Fetch the complete tool catalog, following ``nextCursor`` pages.
+
+    Raises:
+        MCPError: If the server returns an error.
+    """
+    tools: list[dict[str, Any]] = []
+    params: dict[str, Any] | None = None
+    while True:
+        result = await session.request("tools/list", params)
+        tools.extend(t for t in result.get("tools", []) if isinstance(t, dict))
+        cursor = result.get("nextCursor")
+        if not cursor:
+            return tools
+        params = {"cursor": cursor}
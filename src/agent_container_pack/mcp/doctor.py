@@ -0,0 +1,157 @@
+"""Health probes for the MCP servers configured in a manifest."""
+
+import asyncio
+import time
+from collections.abc import Sequence
+from contextlib import AsyncExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal
+
+import httpx
+
+from agent_container_pack.init.http import HttpConfig, create_async_client
+from agent_container_pack.manifest.schema import Manifest, MCPServerHTTP, MCPServerStdio
+from agent_container_pack.mcp.client import (
+    HttpSession,
+    MCPError,
+    StdioClient,
+    select_servers,
+)
+
+DEFAULT_PROBE_TIMEOUT = 10.0
+
+
+@dataclass
+class ProbeResult:
+    """Outcome of probing one MCP server."""
+
+    name: str
+    transport: Literal["stdio", "http"]
+    ok: bool
+    # Seconds until the initialize response arrived (or the failure)
+    latency: float
+    server_info: dict[str, Any] | None = None
+    protocol_version: str | None = None
+    error: str | None = None
+
+
+def _probe_result(
+    name: str, transport: Literal["stdio", "http"], start: float, result: dict[str, Any]
+) -> ProbeResult:
+    info = result.get("serverInfo")
+    return ProbeResult(
+        name=name,
+        transport=transport,
+        ok=True,
+        latency=time.perf_counter() - start,
+        server_info=info if isinstance(info, dict) else None,
+        protocol_version=result.get("protocolVersion"),
+    )
+
+
+async def probe_stdio(
+    name: str,
+    server: MCPServerStdio,
+    project_dir: Path,
+    *,
+    timeout: float = DEFAULT_PROBE_TIMEOUT,
+) -> ProbeResult:
+    """Start a stdio server and time its initialize handshake.
+
+    The server is stopped afterwards. Its stderr is included in the error
+    when the handshake fails.
+    """
+    start = time.perf_counter()
+    client = StdioClient(server, project_dir)
+    try:
+        await client.start()
+        result = await asyncio.wait_for(client.initialize(), timeout)
+    except (OSError, MCPError, TimeoutError) as e:
+        error = (
+            f"Timed out after {timeout:g}s" if isinstance(e, TimeoutError) else str(e)
+        )
+        await client.close()
+        if stderr := client.stderr.strip():
+            error += f": {stderr.splitlines()[-1]}"
+        return ProbeResult(
+            name, "stdio", False, time.perf_counter() - start, error=error
+        )
+    probe = _probe_result(name, "stdio", start, result)
+    await client.close()
+    return probe
+
+
+async def probe_http(
+    name: str,
+    server: MCPServerHTTP,
+    project_dir: Path,
+    client: httpx.AsyncClient,
+    *,
+    timeout: float = DEFAULT_PROBE_TIMEOUT,
+) -> ProbeResult:
+    """Time the initialize handshake of an HTTP server."""
+    start = time.perf_counter()
+    try:
+        async with HttpSession(server, project_dir, client) as session:
+            result = await asyncio.wait_for(session.initialize(), timeout)
+            probe = _probe_result(name, "http", start, result)
+    except (httpx.HTTPError, MCPError, TimeoutError) as e:
+        error = (
+            f"Timed out after {timeout:g}s" if isinstance(e, TimeoutError) else str(e)
+        )
+        return ProbeResult(
+            name, "http", False, time.perf_counter() - start, error=error
+        )
+    return probe
+
+
+async def probe_servers(
+    manifest: Manifest,
+    project_dir: Path,
+    *,
+    names: Sequence[str] | None = None,
+    timeout: float = DEFAULT_PROBE_TIMEOUT,
+    client: httpx.AsyncClient | None = None,
+) -> list[ProbeResult]:
+    """Probe MCP servers concurrently.
+
+    Args:
+        manifest: Validated manifest.
+        project_dir: Project directory (working directory of stdio servers).
+        names: Servers to probe (default: all).
+        timeout: Seconds each server gets to answer ``initialize``.
+        client: Pooled client for HTTP servers (created if omitted).
+
+    Returns:
+        One result per server, in manifest order.
+
+    Raises:
+        ValueError: If a requested server is not configured.
+    """
+    selected = select_servers(manifest, names)
+
+    async with AsyncExitStack() as stack:
+        if client is None:
+            config = HttpConfig(read_timeout=timeout, retries=0)
+            client = await stack.enter_async_context(create_async_client(config))
+        probes = [
+            probe_stdio(name, server, project_dir, timeout=timeout)
+            if isinstance(server, MCPServerStdio)
+            else probe_http(name, server, project_dir, client, timeout=timeout)
+            for name, server in selected.items()
+        ]
+        return list(await asyncio.gather(*probes))
+
+
+def run_doctor(
+    manifest: Manifest,
+    project_dir: Path,
+    *,
+    names: Sequence[str] | None = None,
+    timeout: float = DEFAULT_PROBE_TIMEOUT,
+) -> list[ProbeResult]:
+    """Synchronous wrapper around :func:`probe_servers`."""
+    return asyncio.run(
+        probe_servers(manifest, project_dir, names=names, timeout=timeout)
+    )
@@ -0,0 +1,184 @@
+"""Estimate the context cost of each MCP server's tool catalog."""
+
+import asyncio
+import json
+import math
+from collections.abc import Sequence
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Literal
+
+import httpx
+
+from agent_container_pack.init.http import HttpConfig, create_async_client
+from agent_container_pack.manifest.schema import Manifest, MCPServer, MCPServerStdio
+from agent_container_pack.mcp.client import (
+    HttpSession,
+    MCPError,
+    StdioClient,
+    list_tools,
+    select_servers,
+)
+from agent_container_pack.mcp.doctor import DEFAULT_PROBE_TIMEOUT
+
+# Rough average for JSON schema text across current tokenizers
+CHARS_PER_TOKEN = 4
+
+DEFAULT_TOKEN_BUDGET = 20_000
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the token count of a text (about four characters each)."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+@dataclass
+class ToolFootprint:
+    """Serialized size of one tool definition."""
+
+    name: str
+    bytes: int
+    tokens: int
+
+    @classmethod
+    def from_tool(cls, tool: dict[str, Any]) -> "ToolFootprint":
+        """Measure a tool as it appears in a compact ``tools/list`` result."""
+        text = json.dumps(tool, ensure_ascii=False, separators=(",", ":"))
+        return cls(
+            name=str(tool.get("name", "")),
+            bytes=len(text.encode()),
+            tokens=estimate_tokens(text),
+        )
+
+
+@dataclass
+class ServerFootprint:
+    """Tool catalog size of one server.
+
+    ``tools`` are the tools agents see; tools removed by the server's
+    ``enabled_tools`` / ``disabled_tools`` are kept in ``hidden``.
+    """
+
+    name: str
+    transport: Literal["stdio", "http"]
+    tools: list[ToolFootprint] = field(default_factory=list)
+    hidden: list[ToolFootprint] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def bytes(self) -> int:
+        """Total size of the catalog in bytes."""
+        return sum(t.bytes for t in self.tools)
+
+    @property
+    def tokens(self) -> int:
+        """Approximate token cost of the catalog."""
+        return sum(t.tokens for t in self.tools)
+
+    @property
+    def unfiltered_tokens(self) -> int:
+        """Approximate token cost including hidden tools."""
+        return self.tokens + sum(t.tokens for t in self.hidden)
+
+
+def _tool_exposed(server: MCPServer, tool: str) -> bool:
+    """Whether ``enabled_tools`` / ``disabled_tools`` let agents see a tool."""
+    if server.enabled_tools is not None and tool not in server.enabled_tools:
+        return False
+    return tool not in server.disabled_tools
+
+
+async def _fetch_tools(
+    server: MCPServer, project_dir: Path, client: httpx.AsyncClient
+) -> list[dict[str, Any]]:
+    if isinstance(server, MCPServerStdio):
+        async with StdioClient(server, project_dir) as stdio:
+            await stdio.initialize()
+            return await list_tools(stdio)
+    async with HttpSession(server, project_dir, client) as session:
+        await session.initialize()
+        return await list_tools(session)
+
+
+async def measure_server(
+    name: str,
+    server: MCPServer,
+    project_dir: Path,
+    client: httpx.AsyncClient,
+    *,
+    timeout: float = DEFAULT_PROBE_TIMEOUT,
+) -> ServerFootprint:
+    """Fetch one server's tool catalog and measure every tool.
+
+    Tools the server's ``enabled_tools`` / ``disabled_tools`` hide are
+    measured separately, since agents do not pay for them.
+    """
+    result = ServerFootprint(name, server.transport)
+    try:
+        tools = await asyncio.wait_for(
+            _fetch_tools(server, project_dir, client), timeout
+        )
+    except TimeoutError:
+        result.error = f"Timed out after {timeout:g}s"
+    except (OSError, MCPError, httpx.HTTPError) as e:
+        result.error = str(e) or type(e).__name__
+    else:
+        for footprint in map(ToolFootprint.from_tool, tools):
+            if _tool_exposed(server, footprint.name):
+                result.tools.append(footprint)
+            else:
+                result.hidden.append(footprint)
+    return result
+
+
+async def measure_footprints(
+    manifest: Manifest,
+    project_dir: Path,
+    *,
+    names: Sequence[str] | None = None,
+    timeout: float = DEFAULT_PROBE_TIMEOUT,
+    client: httpx.AsyncClient | None = None,
+) -> list[ServerFootprint]:
+    """Fetch the tool catalogs of MCP servers concurrently.
+
+    Args:
+        manifest: Validated manifest.
+        project_dir: Project directory (working directory of stdio servers).
+        names: Servers to measure (default: all).
+        timeout: Seconds each server gets to list its tools.
+        client: Pooled client for HTTP servers (created if omitted).
+
+    Returns:
+        One footprint per server, in manifest order.
+
+    Raises:
+        ValueError: If a requested server is not configured.
+    """
+    selected = select_servers(manifest, names)
+
+    async with AsyncExitStack() as stack:
+        if client is None:
+            config = HttpConfig(read_timeout=timeout, retries=0)
+            client = await stack.enter_async_context(create_async_client(config))
+        return list(
+            await asyncio.gather(
+                *(
+                    measure_server(name, server, project_dir, client, timeout=timeout)
+                    for name, server in selected.items()
+                )
+            )
+        )
+
+
+def run_footprint(
+    manifest: Manifest,
+    project_dir: Path,
+    *,
+    names: Sequence[str] | None = None,
+    timeout: float = DEFAULT_PROBE_TIMEOUT,
+) -> list[ServerFootprint]:
+    """Synchronous wrapper around :func:`measure_footprints`."""
+    return asyncio.run(
+        measure_footprints(manifest, project_dir, names=names, timeout=timeout)
+    )
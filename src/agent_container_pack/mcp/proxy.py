@@ -0,0 +1,311 @@
+"""Share stdio MCP servers between agent sessions over Streamable HTTP."""
+
+import asyncio
+import contextlib
+import json
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
+from http import HTTPStatus
+from pathlib import Path
+from typing import Any
+from urllib.parse import unquote, urlsplit
+
+from agent_container_pack.manifest.schema import (
+    PROXY_PATH,
+    Manifest,
+    MCPServerStdio,
+)
+from agent_container_pack.mcp.client import MCPError, StdioClient, select_servers
+
+# Used when a server sets no startup_timeout_sec
+DEFAULT_STARTUP_TIMEOUT = 60.0
+
+MAX_BODY_SIZE = 16 * 1024 * 1024
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+INTERNAL_ERROR = -32603
+
+
+def shared_servers(manifest: Manifest) -> dict[str, MCPServerStdio]:
+    """The stdio servers marked ``shared: true``, in manifest order."""
+    return {
+        name: server
+        for name, server in manifest.mcp.servers.items()
+        if isinstance(server, MCPServerStdio) and server.shared
+    }
+
+
+def _error(request_id: Any, code: int, message: str) -> dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "error": {"code": code, "message": message},
+    }
+
+
+class SharedServer:
+    """One upstream stdio server used by every proxy session.
+
+    The server is initialized once; its initialize result is replayed to
+    each new session. A server that exits is restarted on the next request.
+    """
+
+    def __init__(self, name: str, server: MCPServerStdio, project_dir: Path) -> None:
+        self.name = name
+        self.server = server
+        self.project_dir = project_dir
+        self.client: StdioClient | None = None
+        self.initialize_result: dict[str, Any] | None = None
+        self._lock = asyncio.Lock()
+
+    async def ensure_started(self) -> StdioClient:
+        """Start and initialize the server unless it is already running.
+
+        Raises:
+            OSError: If the command cannot be executed.
+            MCPError: If the initialize handshake fails.
+            TimeoutError: If the server does not initialize in time.
+        """
+        async with self._lock:
+            if self.client is not None and self.client.running:
+                return self.client
+            if self.client is not None:
+                await self.client.close()
+            client = StdioClient(self.server, self.project_dir)
+            try:
+                await client.start()
+                self.initialize_result = await asyncio.wait_for(
+                    client.initialize(),
+                    self.server.startup_timeout_sec or DEFAULT_STARTUP_TIMEOUT,
+                )
+            except BaseException:
+                await client.close()
+                raise
+            self.client = client
+            return client
+
+    async def call(self, method: str, params: dict[str, Any] | None) -> dict[str, Any]:
+        """Forward a request and return the raw response.
+
+        Raises:
+            OSError, MCPError, TimeoutError: If the server is unavailable or
+                does not answer within ``tool_timeout_sec``.
+        """
+        client = await self.ensure_started()
+        return await asyncio.wait_for(
+            client.call(method, params), self.server.tool_timeout_sec
+        )
+
+    async def close(self) -> None:
+        """Stop the server."""
+        if self.client is not None:
+            await self.client.close()
+            self.client = None
+
+
+@dataclass
+class HttpRequest:
+    """A parsed HTTP/1.1 request."""
+
+    method: str
+    target: str
+    headers: dict[str, str]
+    body: bytes
+
+
+async def _read_request(reader: asyncio.StreamReader) -> HttpRequest | None:
+    """Read one request; None when the client closed the connection."""
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    method, target, _ = line.decode("latin-1").split(" ", 2)
+    headers: dict[str, str] = {}
+    while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0))
+    if length > MAX_BODY_SIZE:
+        raise ValueError("Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return HttpRequest(method.upper(), target, headers, body)
+
+
+def _encode_response(
+    status: int, message: dict[str, Any] | None, headers: dict[str, str]
+) -> bytes:
+    body = json.dumps(message).encode() if message is not None else b""
+    lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+    if message is not None:
+        lines.append("Content-Type: application/json")
+    lines.append(f"Content-Length: {len(body)}")
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+class MCPProxy:
+    """HTTP front end multiplexing many MCP sessions onto shared servers.
+
+    Each server is exposed at ``/mcp/<name>``. Clients get their own
+    ``Mcp-Session-Id``; their request IDs are remapped onto the upstream
+    connection and restored in the response. Client notifications are not
+    forwarded (the upstream is initialized once, and cancellations would
+    need per-session ID mapping), and the optional server-to-client SSE
+    stream is not offered.
+    """
+
+    def __init__(self, servers: dict[str, SharedServer]) -> None:
+        self.servers = servers
+        self.sessions: dict[str, str] = {}
+        self.port: int | None = None
+        self._server: asyncio.Server | None = None
+
+    @classmethod
+    def from_manifest(
+        cls,
+        manifest: Manifest,
+        project_dir: Path,
+        names: Sequence[str] | None = None,
+    ) -> "MCPProxy":
+        """Build a proxy for the shared servers, or the named stdio servers.
+
+        Raises:
+            ValueError: If a named server is unknown or not a stdio server,
+                or there is nothing to serve.
+        """
+        if names:
+            selected = select_servers(manifest, names)
+            not_stdio = [
+                n for n, s in selected.items() if not isinstance(s, MCPServerStdio)
+            ]
+            if not_stdio:
+                raise ValueError(
+                    f"Only stdio servers can be shared: {', '.join(not_stdio)}"
+                )
+            servers = {
+                n: s for n, s in selected.items() if isinstance(s, MCPServerStdio)
+            }
+        else:
+            servers = shared_servers(manifest)
+        if not servers:
+            raise ValueError(
+                "No shared MCP servers configured (set shared: true on a stdio server)"
+            )
+        return cls(
+            {name: SharedServer(name, s, project_dir) for name, s in servers.items()}
+        )
+
+    async def start(self, host: str, port: int) -> dict[str, str | None]:
+        """Start every server concurrently, then listen for clients.
+
+        Servers that fail to start are retried on their first request.
+
+        Returns:
+            Startup error per server (None if it started).
+        """
+
+        async def start_one(shared: SharedServer) -> str | None:
+            try:
+                await shared.ensure_started()
+            except (OSError, MCPError, TimeoutError) as e:
+                return str(e) or type(e).__name__
+            return None
+
+        errors = await asyncio.gather(*(start_one(s) for s in self.servers.values()))
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return dict(zip(self.servers, errors, strict=True))
+
+    async def serve_forever(self) -> None:
+        """Serve clients until cancelled."""
+        assert self._server is not None
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop listening and stop every server."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await asyncio.gather(*(s.close() for s in self.servers.values()))
+
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while request := await _read_request(reader):
+                status, message, headers = await self.dispatch(request)
+                writer.write(_encode_response(status, message, headers))
+                await writer.drain()
+                if request.headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def dispatch(
+        self, request: HttpRequest
+    ) -> tuple[int, dict[str, Any] | None, dict[str, str]]:
+        """Handle one HTTP request.
+
+        Returns:
+            Status code, JSON-RPC message (or None for no body) and headers.
+        """
+        path = urlsplit(request.target).path
+        name = unquote(path.removeprefix(PROXY_PATH))
+        shared = self.servers.get(name) if path.startswith(PROXY_PATH) else None
+        if shared is None:
+            return 404, None, {}
+
+        session_id = request.headers.get("mcp-session-id")
+        if request.method == "DELETE":
+            if session_id and self.sessions.get(session_id) == name:
+                del self.sessions[session_id]
+                return 200, None, {}
+            return 404, None, {}
+        if request.method != "POST":
+            return 405, None, {"Allow": "POST, DELETE"}
+
+        try:
+            message = json.loads(request.body)
+        except ValueError as e:
+            return 400, _error(None, PARSE_ERROR, f"Parse error: {e}"), {}
+        if not isinstance(message, dict):
+            return 400, _error(None, INVALID_REQUEST, "Batches are not supported"), {}
+
+        method = message.get("method")
+        if method == "initialize" and "id" in message:
+            try:
+                await shared.ensure_started()
+            except (OSError, MCPError, TimeoutError) as e:
+                error = f"Server {name} failed to start: {str(e) or type(e).__name__}"
+                return 200, _error(message["id"], INTERNAL_ERROR, error), {}
+            session_id = uuid.uuid4().hex
+            self.sessions[session_id] = name
+            response = {
+                "jsonrpc": "2.0",
+                "id": message["id"],
+                "result": shared.initialize_result,
+            }
+            return 200, response, {"Mcp-Session-Id": session_id}
+
+        if not session_id:
+            return 400, _error(None, INVALID_REQUEST, "Missing Mcp-Session-Id"), {}
+        if self.sessions.get(session_id) != name:
+            return 404, _error(None, INVALID_REQUEST, "Unknown session"), {}
+        # Notifications and responses to server requests are not forwarded
+        if not isinstance(method, str) or "id" not in message:
+            return 202, None, {}
+
+        try:
+            response = await shared.call(method, message.get("params"))
+        except TimeoutError:
+            return 200, _error(message["id"], INTERNAL_ERROR, "Request timed out"), {}
+        except (OSError, MCPError) as e:
+            error = str(e) or type(e).__name__
+            return 200, _error(message["id"], INTERNAL_ERROR, error), {}
+        return 200, {**response, "id": message["id"]}, {}
@@ -5,11 +5,20 @@ from agent_container_pack.stack.detector import (
     NoStackDetectedError,
     StackError,
     detect_stack,
+    detect_stacks,
 )
+from agent_container_pack.stack.matcher import PatternMatcher
+from agent_container_pack.stack.servers import stack_mcp_servers
+from agent_container_pack.stack.workspace import WorkspacePackage, detect_workspace
 
 __all__ = [
     "AmbiguousStackError",
     "NoStackDetectedError",
+    "PatternMatcher",
     "StackError",
+    "WorkspacePackage",
     "detect_stack",
+    "detect_stacks",
+    "detect_workspace",
+    "stack_mcp_servers",
 ]
@@ -1,8 +1,20 @@
 """Detect stack from project files."""
 
-from pathlib import Path
+import os
+import threading
+import time
+from pathlib import Path, PurePosixPath
 
 from agent_container_pack.manifest.schema import Manifest
+from agent_container_pack.stack.matcher import compile_matcher, is_glob
+
+# Listings whose directory changed this recently are not cached: a file
+# created within the filesystem's timestamp granularity would not bump mtime.
+_RACY_WINDOW_NS = 2_000_000_000
+
+# Cache of directory listings: resolved dir -> (mtime_ns, entry names)
+_listing_cache: dict[Path, tuple[int, frozenset[str]]] = {}
+_listing_cache_lock = threading.Lock()
 
 
 class StackError(Exception):
@@ -17,6 +29,111 @@ class AmbiguousStackError(StackError):
     """Multiple stacks detected, ambiguous selection."""
 
 
+def _list_dir(directory: Path) -> frozenset[str]:
+    """List entry names of a directory with a single scandir.
+
+    Listings are cached per directory and reused while its mtime is
+    unchanged.
+
+    Args:
+        directory: Directory to list.
+
+    Returns:
+        Names of the entries, or an empty set if it cannot be listed.
+    """
+    try:
+        mtime_ns = os.stat(directory).st_mtime_ns
+    except OSError:
+        return frozenset()
+
+    key = Path(os.path.abspath(directory))
+    with _listing_cache_lock:
+        cached = _listing_cache.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+
+    try:
+        with os.scandir(directory) as entries:
+            names = frozenset(entry.name for entry in entries)
+    except OSError:
+        return frozenset()
+
+    if time.time_ns() - mtime_ns > _RACY_WINDOW_NS:
+        with _listing_cache_lock:
+            _listing_cache[key] = (mtime_ns, names)
+    return names
+
+
+def literal_exists(
+    project_dir: Path, pattern: str, listings: dict[Path, frozenset[str]]
+) -> bool:
+    """Check whether a detect pattern exists using directory listings.
+
+    Args:
+        project_dir: Project directory.
+        pattern: Path relative to the project directory.
+        listings: Listings already taken during this detection run.
+
+    Returns:
+        True if the path exists.
+    """
+    parts = PurePosixPath(pattern).parts
+    if not parts or parts[0] == "/" or ".." in parts:
+        return (project_dir / pattern).exists()
+
+    directory = project_dir
+    for i, part in enumerate(parts):
+        if directory not in listings:
+            listings[directory] = _list_dir(directory)
+        if part not in listings[directory]:
+            return False
+        if i < len(parts) - 1:
+            directory = directory / part
+
+    return True
+
+
+def detect_stacks(manifest: Manifest, project_dir: Path) -> list[str]:
+    """Detect every stack whose files are present.
+
+    Args:
+        manifest: Validated manifest with stack definitions.
+        project_dir: Project directory to scan.
+
+    Returns:
+        Detected stack IDs, in manifest order.
+
+    Raises:
+        NoStackDetectedError: If no stack files found.
+    """
+    found: set[str] = set()
+    listings: dict[Path, frozenset[str]] = {}
+    glob_patterns: list[tuple[str, tuple[str, ...]]] = []
+
+    for stack_id, stack_config in manifest.stacks.items():
+        globs = tuple(p for p in stack_config.detect.any if is_glob(p))
+        for pattern in stack_config.detect.any:
+            if not is_glob(pattern) and literal_exists(project_dir, pattern, listings):
+                found.add(stack_id)
+                break
+        else:
+            if globs:
+                glob_patterns.append((stack_id, globs))
+
+    # Glob patterns of undecided stacks are evaluated in one walk
+    if glob_patterns:
+        found |= compile_matcher(tuple(glob_patterns)).match_tree(project_dir)
+
+    detected = [stack_id for stack_id in manifest.stacks if stack_id in found]
+
+    if not detected:
+        raise NoStackDetectedError(
+            f"No stack detected in {project_dir}. "
+            f"Expected one of: {list(manifest.stacks.keys())}"
+        )
+    return detected
+
+
 def detect_stack(
     manifest: Manifest,
     project_dir: Path,
@@ -41,19 +158,7 @@ def detect_stack(
     if use_manifest_stack and manifest.stack:
         return manifest.stack
 
-    detected: list[str] = []
-
-    for stack_id, stack_config in manifest.stacks.items():
-        for pattern in stack_config.detect.any:
-            if (project_dir / pattern).exists():
-                detected.append(stack_id)
-                break
-
-    if not detected:
-        raise NoStackDetectedError(
-            f"No stack detected in {project_dir}. "
-            f"Expected one of: {list(manifest.stacks.keys())}"
-        )
+    detected = detect_stacks(manifest, project_dir)
 
     if len(detected) > 1 and manifest.docs.mode == "single-stack":
         raise AmbiguousStackError(
@@ -0,0 +1,194 @@
+"""Glob matching of detect patterns over a project tree."""
+
+import functools
+import glob
+import os
+import re
+from collections import deque
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from pathlib import Path
+
+GLOB_CHARS = frozenset("*?[")
+
+# Directories never descended into
+PRUNED_DIRS = frozenset({".git", "node_modules"})
+
+# Depth limit for patterns containing "**"
+DEFAULT_MAX_DEPTH = 8
+
+
+def is_glob(pattern: str) -> bool:
+    """Check whether a detect pattern uses glob syntax."""
+    return not GLOB_CHARS.isdisjoint(pattern)
+
+
+def _translate(pattern: str) -> str:
+    """Translate a glob pattern into a regex matching POSIX relative paths."""
+    return glob.translate(pattern, recursive=True, include_hidden=True)
+
+
+@dataclass(frozen=True)
+class _CompiledPattern:
+    """A single glob pattern compiled for matching and pruning."""
+
+    key: str
+    regex: re.Pattern[str]
+    segments: tuple[re.Pattern[str] | None, ...]  # None stands for "**"
+
+    def may_contain(self, dir_parts: tuple[str, ...], max_depth: int) -> bool:
+        """Check whether entries below a directory can match the pattern."""
+        if len(dir_parts) >= max_depth and None in self.segments:
+            return False
+        for i, part in enumerate(dir_parts):
+            if i >= len(self.segments) - 1:
+                return False
+            segment = self.segments[i]
+            if segment is None:
+                return True
+            if not segment.match(part):
+                return False
+        return True
+
+
+def _compile_pattern(key: str, pattern: str) -> _CompiledPattern:
+    pattern = pattern.strip("/")
+    segments = tuple(
+        None if part == "**" else re.compile(_translate(part))
+        for part in pattern.split("/")
+    )
+    return _CompiledPattern(
+        key=key, regex=re.compile(_translate(pattern)), segments=segments
+    )
+
+
+class IgnoreRules:
+    """Minimal .gitignore support for pruning directories during the walk."""
+
+    def __init__(self) -> None:
+        # (base, pattern, anchored, negated), in file and line order
+        self._rules: list[tuple[tuple[str, ...], str, bool, bool]] = []
+
+    def load(self, base: tuple[str, ...], path: Path) -> None:
+        """Add rules from a .gitignore file located in ``base``."""
+        try:
+            lines = path.read_text().splitlines()
+        except (OSError, UnicodeDecodeError):
+            return
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            line = line.removeprefix("!").rstrip("/")
+            anchored = "/" in line
+            self._rules.append((base, line.lstrip("/"), anchored, negated))
+
+    def is_ignored(self, dir_parts: tuple[str, ...]) -> bool:
+        """Check whether a directory is ignored.
+
+        As in git, the last matching rule wins, so a ``!pattern`` re-includes
+        a directory an earlier rule ignored. Directories below an ignored
+        one are never reached by the walk, matching git's rule that nothing
+        inside an excluded directory can be re-included.
+        """
+        ignored = False
+        for base, pattern, anchored, negated in self._rules:
+            if dir_parts[: len(base)] != base:
+                continue
+            if anchored:
+                matches = fnmatchcase("/".join(dir_parts[len(base) :]), pattern)
+            else:
+                matches = fnmatchcase(dir_parts[-1], pattern)
+            if matches:
+                ignored = not negated
+        return ignored
+
+
+class PatternMatcher:
+    """Evaluate glob detect patterns for many keys in a single walk."""
+
+    def __init__(
+        self,
+        patterns: Mapping[str, Iterable[str]],
+        *,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+    ) -> None:
+        """Compile patterns.
+
+        Args:
+            patterns: Glob patterns per key (e.g. stack ID).
+            max_depth: Depth limit for patterns containing "**".
+        """
+        self.max_depth = max_depth
+        self._patterns = [
+            _compile_pattern(key, pattern)
+            for key, key_patterns in patterns.items()
+            for pattern in key_patterns
+        ]
+        # Combined regex rejects most paths with a single match call
+        self._combined = re.compile(
+            "|".join(f"(?:{p.regex.pattern})" for p in self._patterns) or "(?!)"
+        )
+
+    def match_tree(self, root: Path) -> set[str]:
+        """Walk the tree once and return the keys with a matching path.
+
+        The walk is breadth-first and bounded in depth. It skips ``.git``,
+        ``node_modules`` and gitignored directories, only enters directories
+        that can still lead to a match, and stops as soon as every key is
+        decided.
+
+        Args:
+            root: Directory to walk.
+
+        Returns:
+            Keys for which at least one pattern matched.
+        """
+        matched: set[str] = set()
+        pending = list(self._patterns)
+        ignore = IgnoreRules()
+        queue: deque[tuple[Path, tuple[str, ...]]] = deque([(root, ())])
+
+        while queue and pending:
+            directory, dir_parts = queue.popleft()
+            try:
+                with os.scandir(directory) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+
+            if any(entry.name == ".gitignore" for entry in entries):
+                ignore.load(dir_parts, directory / ".gitignore")
+
+            for entry in entries:
+                parts = (*dir_parts, entry.name)
+                rel_path = "/".join(parts)
+                if self._combined.match(rel_path):
+                    for pattern in pending:
+                        if pattern.regex.match(rel_path):
+                            matched.add(pattern.key)
+                    pending = [p for p in pending if p.key not in matched]
+                    if not pending:
+                        return matched
+
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                if entry.name in PRUNED_DIRS:
+                    continue
+                if not any(p.may_contain(parts, self.max_depth) for p in pending):
+                    continue
+                if ignore.is_ignored(parts):
+                    continue
+                queue.append((Path(entry.path), parts))
+
+        return matched
+
+
+@functools.lru_cache(maxsize=32)
+def compile_matcher(
+    patterns: tuple[tuple[str, tuple[str, ...]], ...],
+) -> PatternMatcher:
+    """Compile (and cache) a matcher for ``((key, (pattern, ...)), ...)``."""
+    return PatternMatcher(dict(patterns))
@@ -0,0 +1,31 @@
+"""Select the MCP servers a stack needs."""
+
+from collections.abc import Sequence
+
+from agent_container_pack.manifest.schema import Manifest, MCPServer
+
+
+def stack_mcp_servers(
+    manifest: Manifest, stacks: Sequence[str] | None = None
+) -> dict[str, MCPServer]:
+    """MCP servers needed by the given stacks, in manifest order.
+
+    Without a stack selection, or if any selected stack has no ``mcp``
+    list, every server is needed; otherwise the stacks' lists are combined.
+
+    Args:
+        manifest: Validated manifest.
+        stacks: Selected or detected stack IDs.
+
+    Returns:
+        Server configurations by name.
+    """
+    wanted: set[str] = set()
+    for stack in stacks or ():
+        config = manifest.stacks.get(stack)
+        if config is None or config.mcp is None:
+            return dict(manifest.mcp.servers)
+        wanted.update(config.mcp)
+    if not stacks:
+        return dict(manifest.mcp.servers)
+    return {n: s for n, s in manifest.mcp.servers.items() if n in wanted}
@@ -0,0 +1,87 @@
+"""Detect packages and their stacks across a monorepo workspace."""
+
+import os
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+
+from agent_container_pack.manifest.schema import Manifest
+from agent_container_pack.stack.detector import literal_exists
+from agent_container_pack.stack.matcher import (
+    DEFAULT_MAX_DEPTH,
+    PRUNED_DIRS,
+    IgnoreRules,
+    is_glob,
+)
+
+
+@dataclass
+class WorkspacePackage:
+    """A package directory inside a workspace."""
+
+    path: str
+    stack: str
+
+
+def detect_workspace(
+    manifest: Manifest,
+    root: Path,
+    *,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+) -> list[WorkspacePackage]:
+    """Find package directories and assign each its stack.
+
+    The tree is walked once. Every directory is checked against the literal
+    ``detect.any`` patterns of each stack, relative to that directory; the
+    first matching stack in manifest order wins. Glob patterns only apply
+    to whole-project detection and are ignored here. The root directory
+    itself is not reported as a package.
+
+    Args:
+        manifest: Validated manifest with stack definitions.
+        root: Workspace root.
+        max_depth: Maximum directory depth to descend.
+
+    Returns:
+        Packages sorted by path.
+    """
+    patterns = [
+        (stack_id, [p for p in config.detect.any if not is_glob(p)])
+        for stack_id, config in manifest.stacks.items()
+    ]
+    packages: list[WorkspacePackage] = []
+    ignore = IgnoreRules()
+    listings: dict[Path, frozenset[str]] = {}
+    queue: deque[tuple[Path, tuple[str, ...]]] = deque([(root, ())])
+
+    while queue:
+        directory, dir_parts = queue.popleft()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        listings[directory] = frozenset(entry.name for entry in entries)
+
+        if ".gitignore" in listings[directory]:
+            ignore.load(dir_parts, directory / ".gitignore")
+
+        if dir_parts:
+            for stack_id, stack_patterns in patterns:
+                if any(literal_exists(directory, p, listings) for p in stack_patterns):
+                    packages.append(WorkspacePackage("/".join(dir_parts), stack_id))
+                    break
+
+        if len(dir_parts) >= max_depth:
+            continue
+        for entry in entries:
+            parts = (*dir_parts, entry.name)
+            if (
+                entry.name in PRUNED_DIRS
+                or not entry.is_dir(follow_symlinks=False)
+                or ignore.is_ignored(parts)
+            ):
+                continue
+            queue.append((Path(entry.path), parts))
+
+    return sorted(packages, key=lambda package: package.path)
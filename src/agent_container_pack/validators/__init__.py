@@ -1,6 +1,14 @@
 """Validators for agentpack."""
 
 from agent_container_pack.validators.env import EnvValidationWarning, validate_env_vars
+from agent_container_pack.validators.registry import (
+    Severity,
+    ValidationIssue,
+    Validator,
+    ValidatorResult,
+    available_validators,
+    run_validators,
+)
 from agent_container_pack.validators.skills import (
     SkillsValidationError,
     validate_skills,
@@ -8,7 +16,13 @@ from agent_container_pack.validators.skills import (
 
 __all__ = [
     "EnvValidationWarning",
+    "Severity",
     "SkillsValidationError",
+    "ValidationIssue",
+    "Validator",
+    "ValidatorResult",
+    "available_validators",
+    "run_validators",
     "validate_env_vars",
     "validate_skills",
 ]
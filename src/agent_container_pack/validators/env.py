@@ -1,14 +1,26 @@
 """Validate environment variable references."""
 
+import os
 import re
+import threading
+from collections.abc import Iterator, Mapping
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
 from agent_container_pack.manifest.schema import Manifest
+from agent_container_pack.validators.registry import Severity, ValidationIssue
 
 # Match ${VAR} or ${env:VAR}
 ENV_REF_PATTERN = re.compile(r"\$\{(?:env:)?([A-Z_][A-Z0-9_]*)\}")
 
+# Env files layered in order; later files override earlier ones.
+ENV_FILES = (".devcontainer/.env", ".devcontainer/.env.local")
+
+# Cache of parsed env files: resolved path -> ((mtime_ns, size), names)
+_env_file_cache: dict[Path, tuple[tuple[int, int], frozenset[str]]] = {}
+_env_file_cache_lock = threading.Lock()
+
 
 @dataclass
 class EnvValidationWarning:
@@ -17,9 +29,24 @@ class EnvValidationWarning:
     message: str
 
 
+def _iter_strings(value: Any) -> Iterator[str]:
+    """Yield every string value in a nested structure of dicts and lists."""
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            yield item
+        elif isinstance(item, Mapping):
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple)):
+            stack.extend(item)
+
+
 def _extract_env_refs(manifest: Manifest) -> set[str]:
     """Extract all environment variable references from manifest.
 
+    Every string field is scanned (server env, command, url, cwd, ...).
+
     Args:
         manifest: Validated manifest.
 
@@ -28,47 +55,96 @@ def _extract_env_refs(manifest: Manifest) -> set[str]:
     """
     refs: set[str] = set()
 
-    for server in manifest.mcp.servers.values():
-        for value in server.env.values():
-            matches = ENV_REF_PATTERN.findall(value)
-            refs.update(matches)
+    for value in _iter_strings(manifest.model_dump()):
+        if "${" in value:
+            refs.update(ENV_REF_PATTERN.findall(value))
 
     return refs
 
 
-def _parse_env_file(path: Path) -> set[str]:
-    """Parse .env file and return defined variable names.
-
-    Args:
-        path: Path to .env file.
-
-    Returns:
-        Set of defined variable names.
-    """
-    if not path.exists():
-        return set()
-
+def _read_env_names(path: Path) -> frozenset[str]:
+    """Read variable names defined in an env file."""
     defined: set[str] = set()
     for line in path.read_text().splitlines():
         line = line.strip()
         if not line or line.startswith("#"):
             continue
+        line = line.removeprefix("export ")
         if "=" in line:
             key = line.split("=", 1)[0].strip()
             if key:
                 defined.add(key)
 
+    return frozenset(defined)
+
+
+def _parse_env_file(path: Path) -> frozenset[str]:
+    """Parse .env file and return defined variable names.
+
+    Results are cached by file mtime and size, so a file shared by several
+    projects is only parsed once until it changes.
+
+    Args:
+        path: Path to .env file.
+
+    Returns:
+        Set of defined variable names.
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        return frozenset()
+
+    key = path.resolve()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    with _env_file_cache_lock:
+        cached = _env_file_cache.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+    defined = _read_env_names(path)
+    with _env_file_cache_lock:
+        _env_file_cache[key] = (stamp, defined)
     return defined
 
 
+def load_env_index(
+    project_dir: Path, *, include_process_env: bool = True
+) -> dict[str, str]:
+    """Build the index of defined variables from all env sources.
+
+    Sources are layered in order: ``.devcontainer/.env``,
+    ``.devcontainer/.env.local`` and the process environment.
+
+    Args:
+        project_dir: Project directory.
+        include_process_env: Also consider variables from ``os.environ``.
+
+    Returns:
+        Mapping of variable name to the source that defines it.
+    """
+    index: dict[str, str] = {}
+    for env_file in ENV_FILES:
+        for name in _parse_env_file(project_dir / env_file):
+            index[name] = env_file
+
+    if include_process_env:
+        for name in os.environ:
+            index[name] = "environment"
+
+    return index
+
+
 def validate_env_vars(
-    manifest: Manifest, project_dir: Path
+    manifest: Manifest, project_dir: Path, *, include_process_env: bool = True
 ) -> list[EnvValidationWarning]:
     """Validate environment variable references.
 
     Args:
         manifest: Validated manifest.
         project_dir: Project directory.
+        include_process_env: Treat variables set in the process environment
+            as defined.
 
     Returns:
         List of warnings for missing variables.
@@ -79,16 +155,23 @@ def validate_env_vars(
     if not refs:
         return warnings
 
-    env_file = project_dir / ".devcontainer" / ".env"
-    defined = _parse_env_file(env_file)
+    defined = load_env_index(project_dir, include_process_env=include_process_env)
 
     for ref in sorted(refs):
         if ref not in defined:
             warnings.append(
                 EnvValidationWarning(
                     f"Environment variable {ref} is referenced but not defined in "
-                    f".devcontainer/.env"
+                    f"{' or '.join(ENV_FILES)}"
                 )
             )
 
     return warnings
+
+
+def env_validator(manifest: Manifest, project_dir: Path) -> list[ValidationIssue]:
+    """Registry adapter for validate_env_vars."""
+    return [
+        ValidationIssue(validator="env", severity=Severity.WARNING, message=w.message)
+        for w in validate_env_vars(manifest, project_dir)
+    ]
@@ -0,0 +1,152 @@
+"""Validator registry with entry point discovery."""
+
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from enum import StrEnum
+from importlib.metadata import EntryPoint, entry_points
+from pathlib import Path
+
+from agent_container_pack.manifest.schema import Manifest
+
+ENTRY_POINT_GROUP = "acpack.validators"
+
+
+class Severity(StrEnum):
+    """Severity of a validation issue."""
+
+    ERROR = "error"
+    WARNING = "warning"
+    INFO = "info"
+
+
+@dataclass
+class ValidationIssue:
+    """Issue reported by a validator."""
+
+    validator: str
+    severity: Severity
+    message: str
+    subject: str | None = None
+
+    def __str__(self) -> str:
+        if self.subject:
+            return f"[{self.subject}] {self.message}"
+        return self.message
+
+
+@dataclass
+class ValidatorResult:
+    """Outcome of running one validator."""
+
+    name: str
+    duration: float
+    issues: list[ValidationIssue] = field(default_factory=list)
+
+
+Validator = Callable[[Manifest, Path], list[ValidationIssue]]
+
+BUILTIN_VALIDATORS = {
+    "env": "agent_container_pack.validators.env:env_validator",
+    "skills": "agent_container_pack.validators.skills:skills_validator",
+}
+
+
+def available_validators() -> dict[str, EntryPoint]:
+    """Return all known validators without importing them.
+
+    Built-in validators come first; plugins registered under the
+    ``acpack.validators`` entry point group are added after them. A plugin
+    cannot replace a built-in validator.
+
+    Returns:
+        Mapping of validator name to its (not yet loaded) entry point.
+    """
+    validators = {
+        name: EntryPoint(name=name, value=value, group=ENTRY_POINT_GROUP)
+        for name, value in BUILTIN_VALIDATORS.items()
+    }
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        validators.setdefault(ep.name, ep)
+    return validators
+
+
+def _select(
+    validators: dict[str, EntryPoint],
+    only: Iterable[str] | None,
+    skip: Iterable[str] | None,
+) -> list[EntryPoint]:
+    """Pick the enabled validators in registry order."""
+    requested = set(only or ())
+    skipped = set(skip or ())
+    unknown = (requested | skipped) - validators.keys()
+    if unknown:
+        raise ValueError(f"Unknown validator(s): {sorted(unknown)}")
+
+    return [
+        ep
+        for name, ep in validators.items()
+        if (not requested or name in requested) and name not in skipped
+    ]
+
+
+def _run_one(ep: EntryPoint, manifest: Manifest, project_dir: Path) -> ValidatorResult:
+    """Load and run a single validator, timing both.
+
+    A failing plugin is reported as an error issue; exceptions from
+    built-in validators are bugs and propagate.
+    """
+    start = time.perf_counter()
+    try:
+        validator: Validator = ep.load()
+        issues = list(validator(manifest, project_dir))
+    # Third-party plugins may raise anything
+    except Exception as e:
+        if ep.value == BUILTIN_VALIDATORS.get(ep.name):
+            raise
+        issues = [
+            ValidationIssue(
+                validator=ep.name,
+                severity=Severity.ERROR,
+                message=f"Validator failed: {e}",
+            )
+        ]
+    return ValidatorResult(
+        name=ep.name, duration=time.perf_counter() - start, issues=issues
+    )
+
+
+def run_validators(
+    manifest: Manifest,
+    project_dir: Path,
+    *,
+    only: Iterable[str] | None = None,
+    skip: Iterable[str] | None = None,
+) -> list[ValidatorResult]:
+    """Run enabled validators concurrently.
+
+    Only enabled validators are imported. A plugin validator that raises
+    is reported as an error instead of aborting the run.
+
+    Args:
+        manifest: Validated manifest.
+        project_dir: Project directory.
+        only: Run only these validators.
+        skip: Do not run these validators.
+
+    Returns:
+        One result per validator, in registry order.
+
+    Raises:
+        ValueError: If an unknown validator name is given.
+    """
+    enabled = _select(available_validators(), only, skip)
+    if not enabled:
+        return []
+
+    with ThreadPoolExecutor(max_workers=len(enabled)) as executor:
+        futures = [
+            executor.submit(_run_one, ep, manifest, project_dir) for ep in enabled
+        ]
+        return [future.result() for future in futures]
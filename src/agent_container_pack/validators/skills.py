@@ -5,6 +5,7 @@ from dataclasses import dataclass
 from pathlib import Path
 
 from agent_container_pack.manifest.schema import Manifest
+from agent_container_pack.validators.registry import Severity, ValidationIssue
 
 FRONTMATTER_PATTERN = re.compile(r"^---\s*\n(.*?)\n---", re.DOTALL)
 NAME_PATTERN = re.compile(r"^name:\s*(.+)$", re.MULTILINE)
@@ -119,3 +120,16 @@ def validate_skills(
         errors.extend(_validate_skill(skill_id, skill_path))
 
     return errors
+
+
+def skills_validator(manifest: Manifest, project_dir: Path) -> list[ValidationIssue]:
+    """Registry adapter for validate_skills."""
+    return [
+        ValidationIssue(
+            validator="skills",
+            severity=Severity.ERROR,
+            message=e.message,
+            subject=e.skill_id,
+        )
+        for e in validate_skills(manifest, project_dir)
+    ]
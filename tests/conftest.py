@@ -1,5 +1,12 @@
 """Pytest configuration and fixtures."""
 
+import hashlib
+import io
+import sys
+import threading
+import zipfile
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
 import pytest
@@ -15,3 +22,108 @@ def fixtures_dir() -> Path:
 def tmp_project(tmp_path: Path) -> Path:
     """Create a temporary project directory."""
     return tmp_path
+
+
+def make_template_zip(files: dict[str, str | bytes], root: str = "repo-main") -> bytes:
+    """Build a GitHub-style template archive with a single root directory."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, content in files.items():
+            zf.writestr(f"{root}/{name}", content)
+    return buffer.getvalue()
+
+
+def _parse_range(header: str, size: int) -> tuple[int, int]:
+    """Parse a single ``bytes=`` range into inclusive offsets."""
+    first, _, last = header.removeprefix("bytes=").partition("-")
+    if not first:
+        return max(size - int(last), 0), size - 1
+    return int(first), min(int(last), size - 1) if last else size - 1
+
+
+class TemplateServer:
+    """Local HTTP stand-in for GitHub archive downloads."""
+
+    def __init__(self) -> None:
+        self.archives: dict[str, bytes] = {}
+        self.requests: list[tuple[str, dict[str, str]]] = []
+        self.support_ranges = False
+        self.bytes_sent = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                server.requests.append((self.path, dict(self.headers)))
+                data = server.archives.get(self.path)
+                if data is None:
+                    self.send_error(404)
+                    return
+                etag = f'"{hashlib.sha256(data).hexdigest()}"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                status = 200
+                range_header = self.headers.get("Range")
+                if server.support_ranges and range_header:
+                    start, end = _parse_range(range_header, len(data))
+                    body = data[start : end + 1]
+                    status = 206
+                else:
+                    body = data
+
+                self.send_response(status)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Type", "application/zip")
+                self.send_header("Content-Length", str(len(body)))
+                if server.support_ranges:
+                    self.send_header("Accept-Ranges", "bytes")
+                if status == 206:
+                    self.send_header(
+                        "Content-Range", f"bytes {start}-{end}/{len(data)}"
+                    )
+                self.end_headers()
+                self.wfile.write(body)
+                server.bytes_sent += len(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def add_archive(
+        self,
+        owner: str,
+        repo: str,
+        files: dict[str, str | bytes],
+        branch: str = "main",
+    ) -> None:
+        """Serve a template archive for owner/repo@branch."""
+        path = f"/{owner}/{repo}/archive/refs/heads/{branch}.zip"
+        self.archives[path] = make_template_zip(files, root=f"{repo}-{branch}")
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def template_server() -> Iterator[TemplateServer]:
+    """Run a local HTTP server serving template archives."""
+    server = TemplateServer()
+    yield server
+    server.close()
+
+
+def stub_mcp_command(*args: str) -> list[str]:
+    """Command running the stub MCP server with the current interpreter."""
+    return [
+        sys.executable,
+        str(Path(__file__).parent / "fixtures" / "stub_mcp_server.py"),
+        *args,
+    ]
@@ -0,0 +1,69 @@
+"""Stub MCP server speaking newline-delimited JSON-RPC over stdio.
+
+Options:
+    --delay SECONDS  Wait before answering initialize.
+    --fail MESSAGE   Print MESSAGE to stderr and exit before answering.
+    --tools N        Number of tools returned by tools/list.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--delay", type=float, default=0.0)
+    parser.add_argument("--fail")
+    parser.add_argument("--tools", type=int, default=2)
+    args = parser.parse_args()
+
+    if args.fail:
+        print(args.fail, file=sys.stderr)
+        sys.exit(1)
+
+    for line in sys.stdin:
+        message = json.loads(line)
+        if "id" not in message:
+            continue
+        method = message.get("method")
+        if method == "initialize":
+            time.sleep(args.delay)
+            result = {
+                "protocolVersion": message["params"]["protocolVersion"],
+                "capabilities": {"tools": {}},
+                "serverInfo": {"name": "stub", "version": "1.0.0"},
+            }
+        elif method == "tools/list":
+            result = {
+                "tools": [
+                    {
+                        "name": f"tool_{i}",
+                        "description": f"Stub tool number {i}.",
+                        "inputSchema": {
+                            "type": "object",
+                            "properties": {"query": {"type": "string"}},
+                        },
+                    }
+                    for i in range(args.tools)
+                ]
+            }
+        elif method == "ping":
+            result = {}
+        else:
+            response = {
+                "jsonrpc": "2.0",
+                "id": message["id"],
+                "error": {"code": -32601, "message": "Method not found"},
+            }
+            print(json.dumps(response), flush=True)
+            continue
+        print(
+            json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": result}),
+            flush=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
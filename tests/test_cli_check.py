@@ -0,0 +1,93 @@
+"""Tests for check command."""
+
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+
+class TestCheckCommand:
+    """Test acpack check command."""
+
+    def test_check_passes(self, fixtures_dir: Path, tmp_path: Path) -> None:
+        """Check exits 0 for a valid manifest and writes nothing."""
+        shutil.copy(fixtures_dir / "minimal.yml", tmp_path / "agentpack.yml")
+
+        result = subprocess.run(
+            [sys.executable, "-m", "agent_container_pack", "check"],
+            cwd=tmp_path,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+        assert result.returncode == 0
+        assert "0 error(s), 0 warning(s)" in result.stdout
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["agentpack.yml"]
+
+    def test_check_json_reports_skill_errors(
+        self, fixtures_dir: Path, tmp_path: Path
+    ) -> None:
+        """Check fails on missing required skills and reports JSON."""
+        shutil.copy(fixtures_dir / "full.yml", tmp_path / "agentpack.yml")
+
+        result = subprocess.run(
+            [sys.executable, "-m", "agent_container_pack", "check", "--format", "json"],
+            cwd=tmp_path,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+        assert result.returncode == 1
+        report = json.loads(result.stdout)
+        assert report["ok"] is False
+        assert report["errors"][0]["validator"] == "skills"
+        assert "python-dev" in report["errors"][0]["message"]
+
+    def test_check_invalid_manifest(self, tmp_path: Path) -> None:
+        """Schema errors are reported as errors."""
+        (tmp_path / "agentpack.yml").write_text('version: "2"\n')
+
+        result = subprocess.run(
+            [sys.executable, "-m", "agent_container_pack", "check"],
+            cwd=tmp_path,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+        assert result.returncode == 1
+        assert "Invalid manifest" in result.stderr
+
+    def test_check_strict_fails_on_warnings(self, tmp_path: Path) -> None:
+        """Warnings only fail the check with --strict."""
+        (tmp_path / "agentpack.yml").write_text(
+            """version: "1"
+project:
+  name: "test"
+  description: "Test"
+mcp:
+  servers:
+    api:
+      transport: http
+      url: "https://${ACPACK_TEST_UNDEFINED_HOST}/mcp"
+"""
+        )
+
+        command = [sys.executable, "-m", "agent_container_pack", "check"]
+        result = subprocess.run(
+            command, cwd=tmp_path, capture_output=True, text=True, check=False
+        )
+        assert result.returncode == 0
+        assert "ACPACK_TEST_UNDEFINED_HOST" in result.stderr
+
+        result = subprocess.run(
+            [*command, "--strict"],
+            cwd=tmp_path,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        assert result.returncode == 1
@@ -2,8 +2,16 @@
 
 from pathlib import Path
 
-from agent_container_pack.devcontainer.firewall import update_firewall, extract_domains
+from agent_container_pack.devcontainer.firewall import (
+    extract_domains,
+    fold_domains,
+    render_dnsmasq_ipset,
+    render_ipset_restore,
+    render_nft_set,
+    update_firewall,
+)
 from agent_container_pack.manifest import load_manifest
+from agent_container_pack.manifest.schema import Manifest
 
 
 class TestFirewallUpdater:
@@ -59,3 +67,217 @@ ALLOWED_DOMAINS=(
         result = update_firewall(manifest, tmp_path)
         assert result.success
         assert result.domains_added == 0
+
+    def test_domains_file_when_script_references_it(
+        self, fixtures_dir: Path, tmp_path: Path
+    ) -> None:
+        """Domains go to allowed-domains.txt and the script is left alone."""
+        manifest = load_manifest(fixtures_dir / "full.yml")
+
+        devcontainer = tmp_path / ".devcontainer"
+        devcontainer.mkdir()
+        script = """#!/bin/bash
+ALLOWED_DOMAINS=(
+    "existing.example.com"
+)
+mapfile -t -O "${#ALLOWED_DOMAINS[@]}" ALLOWED_DOMAINS \\
+    < <(grep -v '^#' /usr/local/etc/allowed-domains.txt)
+"""
+        (devcontainer / "init-firewall.sh").write_text(script)
+        (devcontainer / "allowed-domains.txt").write_text("# mine\nkept.example.com\n")
+
+        result = update_firewall(manifest, tmp_path)
+
+        assert result.success
+        assert result.path == devcontainer / "allowed-domains.txt"
+        assert (devcontainer / "init-firewall.sh").read_text() == script
+        lines = (devcontainer / "allowed-domains.txt").read_text().splitlines()
+        assert "api.example.com" in lines
+        assert "kept.example.com" in lines
+
+        again = update_firewall(manifest, tmp_path)
+        assert again.domains_added == 0
+        assert again.path is None
+
+    def test_stale_managed_domains_pruned(
+        self, fixtures_dir: Path, tmp_path: Path
+    ) -> None:
+        """Managed domains follow the manifest; hand-written ones are kept."""
+        devcontainer = tmp_path / ".devcontainer"
+        devcontainer.mkdir()
+        script = devcontainer / "init-firewall.sh"
+        script.write_text(
+            """#!/bin/bash
+ALLOWED_DOMAINS=(
+    "zeta.example.com"  # hand-written, keeps its place
+    "alpha.example.com"
+    # BEGIN acpack managed
+    "old.example.com"
+    # END acpack managed
+)
+"""
+        )
+
+        result = update_firewall(load_manifest(fixtures_dir / "full.yml"), tmp_path)
+
+        assert result.added == ["api.example.com"]
+        assert result.removed == ["old.example.com"]
+        assert '-    "old.example.com"' in result.diff
+        assert '+    "api.example.com"' in result.diff
+        assert (
+            script.read_text()
+            == """#!/bin/bash
+ALLOWED_DOMAINS=(
+    "zeta.example.com"  # hand-written, keeps its place
+    "alpha.example.com"
+    # BEGIN acpack managed
+    "api.example.com"
+    # END acpack managed
+)
+"""
+        )
+
+        mtime = script.stat().st_mtime_ns
+        again = update_firewall(load_manifest(fixtures_dir / "full.yml"), tmp_path)
+        assert again.path is None
+        assert again.diff == ""
+        assert script.stat().st_mtime_ns == mtime
+
+        pruned = update_firewall(load_manifest(fixtures_dir / "minimal.yml"), tmp_path)
+        assert pruned.removed == ["api.example.com"]
+        assert "acpack managed" not in script.read_text()
+        assert '"zeta.example.com"' in script.read_text()
+
+    def test_hand_written_domain_not_duplicated(
+        self, fixtures_dir: Path, tmp_path: Path
+    ) -> None:
+        """Domains already listed by hand are not added to the managed block."""
+        devcontainer = tmp_path / ".devcontainer"
+        devcontainer.mkdir()
+        script = devcontainer / "init-firewall.sh"
+        script.write_text('ALLOWED_DOMAINS=(\n    "api.example.com"\n)\n')
+
+        result = update_firewall(load_manifest(fixtures_dir / "full.yml"), tmp_path)
+
+        assert result.path is None
+        assert script.read_text() == 'ALLOWED_DOMAINS=(\n    "api.example.com"\n)\n'
+
+
+class TestFirewallSets:
+    """Test batch set rendering."""
+
+    def test_render_ipset_restore(self) -> None:
+        """Sets are filled under a temporary name and swapped in."""
+        batch = render_ipset_restore(["10.0.0.0/8", "192.0.2.1", "2001:db8::1"])
+
+        assert batch.splitlines() == [
+            "create allowed-domains hash:net family inet -exist",
+            "create allowed-domains-tmp hash:net family inet -exist",
+            "flush allowed-domains-tmp",
+            "add allowed-domains-tmp 10.0.0.0/8 -exist",
+            "add allowed-domains-tmp 192.0.2.1/32 -exist",
+            "swap allowed-domains-tmp allowed-domains",
+            "destroy allowed-domains-tmp",
+            "create allowed-domains-v6 hash:net family inet6 -exist",
+            "create allowed-domains-v6-tmp hash:net family inet6 -exist",
+            "flush allowed-domains-v6-tmp",
+            "add allowed-domains-v6-tmp 2001:db8::1/128 -exist",
+            "swap allowed-domains-v6-tmp allowed-domains-v6",
+            "destroy allowed-domains-v6-tmp",
+        ]
+
+    def test_render_nft_set(self) -> None:
+        """One nft transaction flushes and refills the sets."""
+        script = render_nft_set(["192.0.2.1", "198.51.100.0/24"])
+
+        assert "add table inet filter" in script
+        assert (
+            "add element inet filter allowed-domains { 192.0.2.1/32, 198.51.100.0/24 }"
+        ) in script
+        assert "add element inet filter allowed-domains-v6" not in script
+
+
+def _vendor_manifest() -> Manifest:
+    return Manifest.model_validate(
+        {
+            "version": "1",
+            "project": {"name": "test", "description": "test"},
+            "mcp": {
+                "servers": {
+                    "a": {"transport": "http", "url": "https://a.vendor.com/mcp"},
+                    "b": {"transport": "http", "url": "https://b.vendor.com/mcp"},
+                    "c": {"transport": "http", "url": "https://other.io/mcp"},
+                },
+            },
+            "firewall": {"allow": ["*.Vendor.com."]},
+        }
+    )
+
+
+class TestWildcardRules:
+    """Test folding hostnames into wildcard and suffix allow rules."""
+
+    def test_fold_domains(self) -> None:
+        """Covered hostnames are replaced by the rule that covers them."""
+        domains = fold_domains(
+            ["api.vendor.com", "eu.api.vendor.com", "vendor.com", "other.io"],
+            ["*.vendor.com"],
+        )
+
+        # *.domain does not cover the domain itself
+        assert domains == {"*.vendor.com", "vendor.com", "other.io"}
+
+    def test_suffix_rule_covers_apex(self) -> None:
+        """.domain covers the domain and every subdomain."""
+        domains = fold_domains(["vendor.com", "a.b.vendor.com"], [".vendor.com"])
+
+        assert domains == {".vendor.com"}
+
+    def test_suffix_must_match_whole_labels(self) -> None:
+        """notvendor.com is not covered by .vendor.com."""
+        domains = fold_domains(["notvendor.com"], [".vendor.com"])
+
+        assert domains == {".vendor.com", "notvendor.com"}
+
+    def test_update_firewall_keeps_resolvable_hosts(self, tmp_path: Path) -> None:
+        """dig cannot resolve a wildcard, so covered hosts stay listed."""
+        manifest = _vendor_manifest()
+        script = tmp_path / ".devcontainer" / "init-firewall.sh"
+        script.parent.mkdir()
+        script.write_text("ALLOWED_DOMAINS=(\n)\n")
+
+        result = update_firewall(manifest, tmp_path)
+
+        assert result.added == ["a.vendor.com", "b.vendor.com", "other.io"]
+        assert "*.vendor.com" not in script.read_text()
+        assert not (tmp_path / ".devcontainer" / "allowed-domains.dnsmasq").exists()
+        # The rule itself cannot be applied, which is reported
+        assert result.warning and "*.vendor.com" in result.warning
+
+    def test_update_firewall_folds_into_dnsmasq(self, tmp_path: Path) -> None:
+        """A script loading the dnsmasq config gets the rule instead."""
+        manifest = _vendor_manifest()
+        script = tmp_path / ".devcontainer" / "init-firewall.sh"
+        script.parent.mkdir()
+        script.write_text(
+            "cp allowed-domains.dnsmasq /etc/dnsmasq.d/\nALLOWED_DOMAINS=(\n)\n"
+        )
+
+        result = update_firewall(manifest, tmp_path)
+
+        dnsmasq = (tmp_path / ".devcontainer" / "allowed-domains.dnsmasq").read_text()
+        assert "ipset=/vendor.com/allowed-domains" in dnsmasq
+        assert "a.vendor.com" not in dnsmasq
+        assert result.added == ["other.io"]
+        assert "vendor.com" not in script.read_text()
+        assert result.warning is None
+
+    def test_render_dnsmasq_ipset(self) -> None:
+        """dnsmasq matches subdomains, so rules become plain domains."""
+        config = render_dnsmasq_ipset(["*.vendor.com", ".other.io", "api.x.com"])
+
+        assert config.splitlines() == [
+            "ipset=/api.x.com/allowed-domains",
+            "ipset=/other.io/allowed-domains",
+            "ipset=/vendor.com/allowed-domains",
+        ]
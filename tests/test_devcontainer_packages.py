@@ -0,0 +1,218 @@
+"""Tests for pre-installing MCP server packages."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+
+from agent_container_pack.devcontainer.packages import (
+    PackageCommand,
+    check_preinstall,
+    parse_package_command,
+    preinstall_packages,
+    render_install_script,
+    update_preinstall,
+)
+from agent_container_pack.generators.codex_config import generate_codex_config
+from agent_container_pack.generators.settings import generate_settings_json
+from agent_container_pack.manifest.schema import Manifest
+
+
+def _manifest(preinstall: bool = True) -> Manifest:
+    return Manifest.model_validate(
+        {
+            "version": "1",
+            "project": {"name": "test", "description": "test"},
+            "mcp": {
+                "preinstall": preinstall,
+                "servers": {
+                    "context7": {
+                        "command": ["npx", "-y", "@upstash/context7-mcp@1.0"],
+                    },
+                    "git": {
+                        "command": [
+                            "uvx",
+                            "--from",
+                            "mcp-server-git==0.6",
+                            "mcp-server-git",
+                            "--repository",
+                            ".",
+                        ],
+                    },
+                    "local": {"command": ["python", "server.py"]},
+                },
+            },
+        }
+    )
+
+
+class TestPackageCommands:
+    """Test recognizing npx and uvx commands."""
+
+    def test_parse(self) -> None:
+        """Runner flags are skipped and versions stripped from executables."""
+        assert parse_package_command(["npx", "-y", "@a/b@latest", "--x"]) == (
+            PackageCommand("npx", "@a/b@latest", "@a/b", ["--x"])
+        )
+        assert parse_package_command(["/usr/bin/npx", "pkg"]) == (
+            PackageCommand("npx", "pkg", "pkg", [])
+        )
+        assert parse_package_command(["uvx", "mcp-server-fetch==1.0"]) == (
+            PackageCommand("uvx", "mcp-server-fetch==1.0", "mcp-server-fetch", [])
+        )
+        assert parse_package_command(["uvx", "--from=git+https://x/y", "y"]) == (
+            PackageCommand("uvx", "git+https://x/y", "y", [])
+        )
+
+    def test_unsupported(self) -> None:
+        """Other commands and runner options are left alone."""
+        assert parse_package_command(["node", "server.js"]) is None
+        assert parse_package_command(["npx", "-p", "a", "b"]) is None
+        assert parse_package_command(["uvx", "--with", "a", "b"]) is None
+
+    def test_generated_configs_use_launchers(self) -> None:
+        """With preinstall, package servers run their launcher."""
+        settings = json.loads(generate_settings_json(_manifest(), preinstalled=True))[
+            "mcpServers"
+        ]
+        assert settings["context7"] == {
+            "command": "/opt/acpack/mcp/bin/context7",
+            "args": [],
+        }
+        assert settings["git"]["command"] == "/opt/acpack/mcp/bin/git"
+        assert settings["git"]["args"] == ["--repository", "."]
+        assert settings["local"]["command"] == "python"
+        assert 'command = "/opt/acpack/mcp/bin/git"' in generate_codex_config(
+            _manifest(), preinstalled=True
+        )
+
+        # Without the install step, commands are left alone
+        off = json.loads(generate_settings_json(_manifest()))
+        assert off["mcpServers"]["context7"]["command"] == "npx"
+        disabled = _manifest(preinstall=False)
+        off = json.loads(generate_settings_json(disabled, preinstalled=True))
+        assert off["mcpServers"]["context7"]["command"] == "npx"
+
+
+class TestInstallScript:
+    """Test the install script and its Dockerfile step."""
+
+    def test_render(self) -> None:
+        """Packages are installed once and linked per server."""
+        script = render_install_script(preinstall_packages(_manifest()))
+
+        assert "npm install --prefix" in script
+        assert script.count("@upstash/context7-mcp@1.0") == 1
+        assert "link_npm context7 @upstash/context7-mcp" in script
+        assert "uv tool install mcp-server-git==0.6" in script
+        assert 'ln -sf "$PREFIX/uv/bin/"mcp-server-git "$PREFIX/bin/"git' in script
+        assert "server.py" not in script
+        subprocess.run(["bash", "-n"], input=script, text=True, check=True)
+
+    def test_missing_tools_fail_the_build(self, tmp_path: Path) -> None:
+        """The script stops with a clear message if npm or uv is missing."""
+        script = render_install_script(preinstall_packages(_manifest()))
+        assert "for tool in npm node uv; do" in script
+
+        # Nothing on PATH, as when uv is only installed for the image's user
+        result = subprocess.run(
+            ["/bin/bash", "-c", script],
+            env={"PATH": str(tmp_path)},
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+        assert result.returncode == 1
+        assert "npm is not on PATH" in result.stderr
+        assert "# BEGIN acpack managed" in result.stderr
+
+    def test_update_dockerfile(self, tmp_path: Path) -> None:
+        """The step goes before USER and is removed when preinstall is off."""
+        devcontainer = tmp_path / ".devcontainer"
+        devcontainer.mkdir()
+        dockerfile = devcontainer / "Dockerfile"
+        original = "FROM node:20\nRUN apt-get update\n\nUSER node\n"
+        dockerfile.write_text(original)
+
+        result = update_preinstall(_manifest(), tmp_path)
+
+        assert result.success
+        assert result.packages == ["@upstash/context7-mcp@1.0", "mcp-server-git==0.6"]
+        assert (devcontainer / "install-mcp-servers.sh").exists()
+        assert dockerfile.read_text().splitlines() == [
+            "FROM node:20",
+            "RUN apt-get update",
+            "",
+            "# BEGIN acpack managed",
+            "COPY install-mcp-servers.sh /tmp/acpack/install-mcp-servers.sh",
+            "RUN bash /tmp/acpack/install-mcp-servers.sh && rm -rf /tmp/acpack",
+            "# END acpack managed",
+            "",
+            "USER node",
+        ]
+        # Idempotent
+        update_preinstall(_manifest(), tmp_path)
+        assert dockerfile.read_text().count("# BEGIN acpack managed") == 1
+
+        assert update_preinstall(_manifest(preinstall=False), tmp_path).success
+        assert dockerfile.read_text() == original
+        assert not (devcontainer / "install-mcp-servers.sh").exists()
+
+    def test_build_context(self, tmp_path: Path) -> None:
+        """The COPY source follows build.context in devcontainer.json."""
+        devcontainer = tmp_path / ".devcontainer"
+        devcontainer.mkdir()
+        (devcontainer / "Dockerfile").write_text("FROM node:20\n")
+        (devcontainer / "devcontainer.json").write_text(
+            '{"build": {"dockerfile": "Dockerfile", "context": ".."}}'
+        )
+
+        update_preinstall(_manifest(), tmp_path)
+
+        assert (
+            "COPY .devcontainer/install-mcp-servers.sh"
+            in (devcontainer / "Dockerfile").read_text()
+        )
+
+    def test_missing_dockerfile(self, tmp_path: Path) -> None:
+        """Without a Dockerfile the update fails instead of guessing."""
+        result = update_preinstall(_manifest(), tmp_path)
+        assert not result.success
+        assert "Dockerfile not found" in result.message
+        with pytest.raises(ValueError, match="needs a Dockerfile"):
+            check_preinstall(_manifest(), tmp_path)
+        assert not check_preinstall(_manifest(preinstall=False), tmp_path)
+
+    def test_generate_fails_without_dockerfile(self, tmp_path: Path) -> None:
+        """generate refuses to write configs pointing at missing launchers."""
+        (tmp_path / ".devcontainer").mkdir()
+        (tmp_path / ".devcontainer" / "devcontainer.json").write_text(
+            '{"image": "mcr.microsoft.com/devcontainers/base"}'
+        )
+        (tmp_path / "agentpack.yml").write_text(
+            yaml.safe_dump(_manifest().model_dump(mode="json"))
+        )
+
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "agent_container_pack",
+                "generate",
+                "--write",
+                "--directory",
+                str(tmp_path),
+            ],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+        assert result.returncode == 1
+        assert "mcp.preinstall needs a Dockerfile" in result.stderr
+        assert not (tmp_path / ".claude" / "settings.json").exists()
+        assert not (tmp_path / "codex.config.toml").exists()
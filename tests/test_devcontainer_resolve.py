@@ -0,0 +1,158 @@
+"""Tests for firewall address pre-resolution."""
+
+import json
+import threading
+import time
+from pathlib import Path
+
+from agent_container_pack.devcontainer import (
+    AddressCache,
+    ResolvedAddress,
+    collapse_cidrs,
+    resolve_domains,
+    resolve_firewall,
+    update_firewall,
+)
+from agent_container_pack.manifest import load_manifest
+from agent_container_pack.manifest.schema import Manifest
+
+
+class FakeResolver:
+    """Offline resolver returning fixed records."""
+
+    def __init__(self, records: dict[str, list[str]], ttl: int = 60) -> None:
+        self.records = records
+        self.ttl = ttl
+        self.calls: list[str] = []
+        self._lock = threading.Lock()
+
+    def resolve(self, domain: str) -> list[ResolvedAddress]:
+        with self._lock:
+            self.calls.append(domain)
+        if domain not in self.records:
+            raise OSError(f"NXDOMAIN {domain}")
+        return [ResolvedAddress(a, self.ttl) for a in self.records[domain]]
+
+
+class TestCollapse:
+    """Test CIDR collapsing."""
+
+    def test_collapse_adjacent(self) -> None:
+        """Adjacent and duplicate addresses collapse into networks."""
+        cidrs = collapse_cidrs(
+            ["192.0.2.0", "192.0.2.1", "192.0.2.1", "198.51.100.7", "2001:db8::1"]
+        )
+
+        assert cidrs == ["192.0.2.0/31", "198.51.100.7/32", "2001:db8::1/128"]
+
+
+class TestResolveDomains:
+    """Test concurrent resolution and TTL caching."""
+
+    def test_resolves_and_reuses_fresh_entries(self) -> None:
+        """Entries are reused until their TTL expires."""
+        resolver = FakeResolver(
+            {"a.example.com": ["192.0.2.1"], "b.example.com": ["192.0.2.0"]}
+        )
+
+        first = resolve_domains(["a.example.com", "b.example.com"], resolver, now=0)
+        assert first.resolved == ["a.example.com", "b.example.com"]
+        assert first.cache.cidrs == ["192.0.2.0/31"]
+        assert first.cache.expires_at == 60
+
+        second = resolve_domains(
+            ["a.example.com", "b.example.com"], resolver, cache=first.cache, now=30
+        )
+        assert second.reused == ["a.example.com", "b.example.com"]
+        assert len(resolver.calls) == 2
+
+        third = resolve_domains(["a.example.com"], resolver, cache=second.cache, now=61)
+        assert third.resolved == ["a.example.com"]
+        assert list(third.cache.domains) == ["a.example.com"]
+
+    def test_failure_keeps_previous_entry(self) -> None:
+        """A failed lookup keeps the last known addresses."""
+        resolver = FakeResolver({"a.example.com": ["192.0.2.1"]})
+        first = resolve_domains(["a.example.com"], resolver, now=0)
+
+        resolver.records.clear()
+        second = resolve_domains(
+            ["a.example.com", "gone.example.com"], resolver, cache=first.cache, now=100
+        )
+
+        assert set(second.errors) == {"a.example.com", "gone.example.com"}
+        assert second.cache.cidrs == ["192.0.2.1/32"]
+
+    def test_lookups_run_concurrently(self) -> None:
+        """Slow lookups overlap instead of running one after another."""
+
+        class SlowResolver(FakeResolver):
+            def resolve(self, domain: str) -> list[ResolvedAddress]:
+                time.sleep(0.2)
+                return super().resolve(domain)
+
+        domains = [f"d{i}.example.com" for i in range(10)]
+        resolver = SlowResolver({d: [f"192.0.2.{i}"] for i, d in enumerate(domains)})
+
+        start = time.perf_counter()
+        resolve_domains(domains, resolver)
+
+        assert time.perf_counter() - start < 1.0
+
+
+class TestResolveFirewall:
+    """Test resolving the project allowlist."""
+
+    def test_writes_cache_and_ipset(self, fixtures_dir: Path, tmp_path: Path) -> None:
+        """Manifest and allowlist domains are resolved and stored."""
+        manifest = load_manifest(fixtures_dir / "full.yml")
+        devcontainer = tmp_path / ".devcontainer"
+        devcontainer.mkdir()
+        (devcontainer / "init-firewall.sh").write_text(
+            'ALLOWED_DOMAINS=(\n    "registry.npmjs.org"\n)\n'
+        )
+        resolver = FakeResolver(
+            {"api.example.com": ["192.0.2.10"], "registry.npmjs.org": ["192.0.2.11"]}
+        )
+
+        result = resolve_firewall(manifest, tmp_path, resolver=resolver)
+
+        assert sorted(resolver.calls) == ["api.example.com", "registry.npmjs.org"]
+        data = json.loads((devcontainer / "allowed-addresses.json").read_text())
+        assert data["cidrs"] == ["192.0.2.10/31"]
+        assert data["domains"]["api.example.com"]["ttl"] == 60
+        ipset = (devcontainer / "allowed-addresses.ipset").read_text()
+        assert "add allowed-domains-tmp 192.0.2.10/31 -exist" in ipset
+        assert result.written[0] == devcontainer / "allowed-addresses.json"
+
+        cache = AddressCache.load(devcontainer / "allowed-addresses.json")
+        assert set(cache.domains) == {"api.example.com", "registry.npmjs.org"}
+
+    def test_hosts_under_wildcard_rule_resolve(self, tmp_path: Path) -> None:
+        """Hosts covered by a wildcard allow rule still get addresses."""
+        manifest = Manifest.model_validate(
+            {
+                "version": "1",
+                "project": {"name": "test", "description": "test"},
+                "mcp": {
+                    "servers": {
+                        "a": {"transport": "http", "url": "https://a.mcp.vendor.com"},
+                        "b": {"transport": "http", "url": "https://b.mcp.vendor.com"},
+                    },
+                },
+                "firewall": {"allow": ["*.mcp.vendor.com"]},
+            }
+        )
+        devcontainer = tmp_path / ".devcontainer"
+        devcontainer.mkdir()
+        (devcontainer / "init-firewall.sh").write_text("ALLOWED_DOMAINS=(\n)\n")
+        resolver = FakeResolver(
+            {"a.mcp.vendor.com": ["192.0.2.1"], "b.mcp.vendor.com": ["192.0.2.2"]}
+        )
+
+        update_firewall(manifest, tmp_path)
+        result = resolve_firewall(manifest, tmp_path, resolver=resolver)
+
+        assert sorted(resolver.calls) == ["a.mcp.vendor.com", "b.mcp.vendor.com"]
+        assert set(result.cache.domains) == {"a.mcp.vendor.com", "b.mcp.vendor.com"}
+        assert result.cache.cidrs == ["192.0.2.1/32", "192.0.2.2/32"]
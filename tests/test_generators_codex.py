@@ -123,3 +123,57 @@ class TestCodexConfigGenerator:
         assert 'url = "https://api.example.com/mcp"' in result
         # env is not a valid Codex HTTP field - should not be output
         assert "API_KEY" not in result
+
+    def test_timeouts_and_tool_filters(self) -> None:
+        """Timeouts and tool lists use Codex's native keys."""
+        from agent_container_pack.manifest.schema import Manifest
+
+        manifest = Manifest.model_validate(
+            {
+                "version": "1",
+                "project": {"name": "test", "description": "test"},
+                "mcp": {
+                    "servers": {
+                        "docs": {
+                            "transport": "http",
+                            "url": "https://docs.example.com/mcp",
+                            "startup_timeout_sec": 20,
+                            "tool_timeout_sec": 2.5,
+                            "enabled_tools": ["search", "fetch"],
+                            "disabled_tools": ["fetch"],
+                        },
+                    },
+                },
+            }
+        )
+        result = generate_codex_config(manifest)
+        assert result.splitlines() == [
+            "[mcp_servers.docs]",
+            'url = "https://docs.example.com/mcp"',
+            "startup_timeout_sec = 20",
+            "tool_timeout_sec = 2.5",
+            'enabled_tools = ["search", "fetch"]',
+            'disabled_tools = ["fetch"]',
+        ]
+
+    def test_shared_server_uses_proxy(self) -> None:
+        """Shared stdio servers point at the acpack mcp serve proxy."""
+        from agent_container_pack.manifest.schema import Manifest
+
+        manifest = Manifest.model_validate(
+            {
+                "version": "1",
+                "project": {"name": "test", "description": "test"},
+                "mcp": {
+                    "proxy": {"port": 9000},
+                    "servers": {
+                        "ctx": {"command": ["ctx-mcp"], "shared": True},
+                    },
+                },
+            }
+        )
+        result = generate_codex_config(manifest)
+        assert result.splitlines() == [
+            "[mcp_servers.ctx]",
+            'url = "http://127.0.0.1:9000/mcp/ctx"',
+        ]
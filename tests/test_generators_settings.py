@@ -54,3 +54,62 @@ class TestSettingsGenerator:
         assert (
             data["mcpServers"]["external-api"]["url"] == "https://api.example.com/mcp"
         )
+
+    def test_timeouts_and_tool_filters(self) -> None:
+        """Timeouts become env settings and disabled tools deny rules."""
+        import json
+
+        from agent_container_pack.manifest.schema import Manifest
+
+        manifest = Manifest.model_validate(
+            {
+                "version": "1",
+                "project": {"name": "test", "description": "test"},
+                "mcp": {
+                    "servers": {
+                        "fast": {
+                            "command": ["fast-mcp"],
+                            "startup_timeout_sec": 5,
+                            "disabled_tools": ["delete"],
+                        },
+                        "slow": {
+                            "command": ["slow-mcp"],
+                            "startup_timeout_sec": 30,
+                            "tool_timeout_sec": 120,
+                            "enabled_tools": ["query"],
+                        },
+                        "off": {"command": ["off-mcp"], "enabled_tools": []},
+                    },
+                },
+            }
+        )
+        data = json.loads(generate_settings_json(manifest))
+        assert data["env"] == {"MCP_TIMEOUT": "30000", "MCP_TOOL_TIMEOUT": "120000"}
+        # enabled_tools must not pre-approve anything
+        assert data["permissions"] == {"deny": ["mcp__off", "mcp__fast__delete"]}
+        assert "startup_timeout_sec" not in data["mcpServers"]["fast"]
+
+    def test_shared_server_uses_proxy(self) -> None:
+        """Shared stdio servers point at the acpack mcp serve proxy."""
+        import json
+
+        from agent_container_pack.manifest.schema import Manifest
+
+        manifest = Manifest.model_validate(
+            {
+                "version": "1",
+                "project": {"name": "test", "description": "test"},
+                "mcp": {
+                    "servers": {
+                        "ctx": {"command": ["ctx-mcp"], "shared": True},
+                        "local": {"command": ["local-mcp"]},
+                    },
+                },
+            }
+        )
+        data = json.loads(generate_settings_json(manifest))
+        assert data["mcpServers"]["ctx"] == {
+            "type": "http",
+            "url": "http://127.0.0.1:8765/mcp/ctx",
+        }
+        assert data["mcpServers"]["local"]["command"] == "local-mcp"
@@ -0,0 +1,79 @@
+"""Tests for template archive indexing and extraction."""
+
+import io
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from agent_container_pack.init.archive import extract_template, index_archive
+
+
+def _zip(files: dict[str, str]) -> zipfile.ZipFile:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for name, content in files.items():
+            zf.writestr(name, content)
+    return zipfile.ZipFile(buffer)
+
+
+class TestArchive:
+    """Test single-pass indexing and parallel extraction."""
+
+    def test_index_archive(self) -> None:
+        """Index finds .devcontainer files and agentpack.yml under a subdir."""
+        zf = _zip(
+            {
+                "repo-main/": "",
+                "repo-main/.devcontainer/Dockerfile": "FROM root",
+                "repo-main/templates/py/.devcontainer/Dockerfile": "FROM py",
+                "repo-main/templates/py/.devcontainer/scripts/setup.sh": "",
+                "repo-main/templates/py/agentpack.yml": 'version: "1"',
+            }
+        )
+
+        index = index_archive(zf, "templates/py")
+
+        assert sorted(index.devcontainer) == ["Dockerfile", "scripts/setup.sh"]
+        assert index.manifest is not None
+        assert index.manifest.filename == "repo-main/templates/py/agentpack.yml"
+
+    def test_index_empty_archive(self) -> None:
+        """Archives without a root directory are rejected."""
+        with pytest.raises(ValueError, match="Empty or invalid"):
+            index_archive(_zip({}))
+
+    def test_extract_many_members(self, tmp_path: Path, monkeypatch) -> None:
+        """Members are streamed with zf.open, never read whole with zf.read."""
+        files = {
+            f"repo-main/.devcontainer/features/f{i}/install.sh": f"echo {i}"
+            for i in range(200)
+        }
+        files["repo-main/agentpack.yml"] = 'version: "1"'
+        zf = _zip(files)
+
+        def fail_read(*args, **kwargs):
+            raise AssertionError("zf.read should not be used")
+
+        monkeypatch.setattr(zipfile.ZipFile, "read", fail_read)
+        extract_template(zf, index_archive(zf), tmp_path)
+
+        assert len(list((tmp_path / ".devcontainer" / "features").iterdir())) == 200
+        script = tmp_path / ".devcontainer" / "features" / "f42" / "install.sh"
+        assert script.read_text() == "echo 42"
+        assert (tmp_path / "agentpack.yml").exists()
+
+    def test_reject_path_escape(self, tmp_path: Path) -> None:
+        """Members escaping the target directory are rejected before writing."""
+        zf = _zip(
+            {
+                "repo-main/.devcontainer/ok.txt": "ok",
+                "repo-main/.devcontainer/../../evil.sh": "rm -rf /",
+            }
+        )
+
+        with pytest.raises(ValueError, match="Unsafe path"):
+            extract_template(zf, index_archive(zf), tmp_path / "project")
+
+        assert not (tmp_path / "evil.sh").exists()
+        assert not (tmp_path / "project" / ".devcontainer" / "ok.txt").exists()
@@ -0,0 +1,135 @@
+"""Tests for initializing many projects from one template fetch."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from agent_container_pack.init import (
+    init_projects,
+    parse_template_source,
+    read_targets_file,
+)
+
+TEMPLATE_FILES = {
+    ".devcontainer/Dockerfile": "FROM ubuntu",
+    ".devcontainer/devcontainer.json": "{}",
+}
+
+
+class TestInitProjects:
+    """Test bulk initialization."""
+
+    def test_single_fetch_for_many_targets(
+        self, tmp_path: Path, template_server
+    ) -> None:
+        """The template is downloaded once and copied into every target."""
+        template_server.add_archive("owner", "repo", TEMPLATE_FILES)
+        targets = [tmp_path / f"sandbox-{i}" for i in range(50)]
+
+        results = init_projects(
+            parse_template_source("github:owner/repo"),
+            targets,
+            stack="node",
+            base_url=template_server.base_url,
+        )
+
+        assert len(template_server.requests) == 1
+        assert [r.status for r in results] == ["created"] * 50
+        for target in targets:
+            assert (target / ".devcontainer" / "Dockerfile").read_text() == (
+                "FROM ubuntu"
+            )
+            assert "stack: node" in (target / "agentpack.yml").read_text()
+
+    def test_existing_targets_skipped(self, tmp_path: Path, template_server) -> None:
+        """Targets with an existing project are skipped without --force."""
+        template_server.add_archive("owner", "repo", TEMPLATE_FILES)
+        existing = tmp_path / "existing"
+        (existing / ".devcontainer").mkdir(parents=True)
+        fresh = tmp_path / "fresh"
+
+        results = init_projects(
+            parse_template_source("github:owner/repo"),
+            [existing, fresh, fresh],
+            base_url=template_server.base_url,
+        )
+
+        assert [(r.directory, r.status) for r in results] == [
+            (existing, "skipped"),
+            (fresh, "created"),
+        ]
+        assert ".devcontainer already exists" in results[0].message
+        assert not (existing / ".devcontainer" / "Dockerfile").exists()
+
+    def test_force_overwrites(self, tmp_path: Path, template_server) -> None:
+        """With force, existing files are replaced."""
+        template_server.add_archive("owner", "repo", TEMPLATE_FILES)
+        (tmp_path / ".devcontainer").mkdir()
+        (tmp_path / ".devcontainer" / "Dockerfile").write_text("old")
+
+        results = init_projects(
+            parse_template_source("github:owner/repo"),
+            [tmp_path],
+            force=True,
+            base_url=template_server.base_url,
+        )
+
+        assert results[0].status == "created"
+        assert (tmp_path / ".devcontainer" / "Dockerfile").read_text() == "FROM ubuntu"
+
+    def test_nothing_to_do_skips_fetch(self, tmp_path: Path, template_server) -> None:
+        """No request is made when every target is skipped."""
+        (tmp_path / "agentpack.yml").write_text('version: "1"')
+
+        results = init_projects(
+            parse_template_source("github:owner/repo"),
+            [tmp_path],
+            base_url=template_server.base_url,
+        )
+
+        assert results[0].status == "skipped"
+        assert template_server.requests == []
+
+
+class TestReadTargetsFile:
+    """Test reading target lists."""
+
+    def test_read_targets_file(self, tmp_path: Path) -> None:
+        """Blank lines and comments are ignored."""
+        targets = tmp_path / "targets.txt"
+        targets.write_text("a\n\n# comment\n  b/c  \n")
+
+        assert read_targets_file(targets) == [Path("a"), Path("b/c")]
+
+
+class TestInitCommand:
+    """Test acpack init target options."""
+
+    def test_directory_option(self, tmp_path: Path) -> None:
+        """--directory targets are added to the positional ones."""
+        template = tmp_path / "template"
+        for name, content in TEMPLATE_FILES.items():
+            (template / name).parent.mkdir(parents=True, exist_ok=True)
+            (template / name).write_text(content)
+
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "agent_container_pack",
+                "init",
+                str(tmp_path / "a"),
+                "--directory",
+                str(tmp_path / "b"),
+                "--template",
+                f"dir:{template}",
+                "--no-cache",
+            ],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert (tmp_path / "a" / ".devcontainer" / "Dockerfile").exists()
+        assert (tmp_path / "b" / ".devcontainer" / "Dockerfile").exists()
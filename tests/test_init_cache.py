@@ -0,0 +1,127 @@
+"""Tests for the template cache."""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from agent_container_pack.init.cache import (
+    PRUNE_GRACE_PERIOD,
+    TemplateCache,
+    parse_size,
+)
+from agent_container_pack.init.template import (
+    TemplateNotCachedError,
+    download_template,
+    parse_template_source,
+)
+
+TEMPLATE_FILES = {
+    ".devcontainer/devcontainer.json": "{}",
+    "agentpack.yml": 'version: "1"\n',
+}
+
+
+class TestTemplateCache:
+    """Test cached template downloads."""
+
+    def test_revalidates_with_etag(self, tmp_path: Path, template_server) -> None:
+        """Second download sends If-None-Match and reuses the cached archive."""
+        template_server.add_archive("owner", "repo", TEMPLATE_FILES)
+        cache = TemplateCache(tmp_path / "cache")
+        source = parse_template_source("github:owner/repo")
+
+        download_template(
+            source, tmp_path / "a", cache=cache, base_url=template_server.base_url
+        )
+        download_template(
+            source, tmp_path / "b", cache=cache, base_url=template_server.base_url
+        )
+
+        assert "If-None-Match" not in template_server.requests[0][1]
+        assert template_server.requests[1][1]["If-None-Match"].startswith('"')
+        assert (tmp_path / "b" / ".devcontainer" / "devcontainer.json").exists()
+        assert [e.key for e in cache.entries()] == ["owner/repo@main"]
+
+    def test_offline_uses_cache_only(self, tmp_path: Path, template_server) -> None:
+        """Offline mode never touches the network."""
+        cache = TemplateCache(tmp_path / "cache")
+        source = parse_template_source("github:owner/repo")
+
+        with pytest.raises(TemplateNotCachedError):
+            download_template(source, tmp_path / "a", cache=cache, offline=True)
+
+        template_server.add_archive("owner", "repo", TEMPLATE_FILES)
+        download_template(
+            source, tmp_path / "a", cache=cache, base_url=template_server.base_url
+        )
+        requests_before = len(template_server.requests)
+
+        download_template(source, tmp_path / "b", cache=cache, offline=True)
+        assert (tmp_path / "b" / "agentpack.yml").exists()
+        assert len(template_server.requests) == requests_before
+
+    def test_prune_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        """Prune evicts old entries until the cache fits."""
+        cache = TemplateCache(tmp_path / "cache")
+        cache.store("owner/old@main", b"x" * 100)
+        cache.store("owner/shared@main", b"y" * 100)
+        cache.store("owner/shared@v2", b"y" * 100)
+        cache.touch("owner/old@main")
+
+        result = cache.prune(max_size=100)
+
+        assert sorted(result.removed) == ["owner/shared@main", "owner/shared@v2"]
+        assert result.freed == 100
+        assert [e.key for e in cache.entries()] == ["owner/old@main"]
+
+        assert cache.prune().remaining == 0
+        assert list(cache.objects_dir.iterdir()) == []
+
+    def test_prune_keeps_blobs_being_stored(self, tmp_path: Path) -> None:
+        """A blob renamed by a concurrent store before indexing survives."""
+        cache = TemplateCache(tmp_path / "cache")
+        cache.store("owner/repo@main", b"x" * 100)
+        # Renamed into place, index not updated yet
+        pending = cache.objects_dir / ("0" * 64)
+        pending.write_bytes(b"y" * 100)
+
+        assert cache.prune().remaining == 0
+        assert list(cache.objects_dir.iterdir()) == [pending]
+
+        stale = time.time() - PRUNE_GRACE_PERIOD - 1
+        os.utime(pending, (stale, stale))
+        assert cache.prune().freed == 100
+        assert list(cache.objects_dir.iterdir()) == []
+
+    def test_cli_prune_keeps_a_budget(self, tmp_path: Path) -> None:
+        """Prune without options keeps 1G; clearing needs --all."""
+        cache = TemplateCache(tmp_path)
+        cache.store("owner/repo@main", b"x" * 100)
+
+        def prune(*args: str) -> subprocess.CompletedProcess[str]:
+            return subprocess.run(
+                [sys.executable, "-m", "agent_container_pack", "cache", "prune", *args],
+                capture_output=True,
+                text=True,
+                env={**os.environ, "ACPACK_CACHE_DIR": str(tmp_path)},
+                check=False,
+            )
+
+        assert prune().returncode == 0
+        assert [e.key for e in cache.entries()] == ["owner/repo@main"]
+        assert prune("--all", "--max-size", "1M").returncode == 1
+        result = prune("--all")
+        assert "Removed owner/repo@main" in result.stdout
+        assert cache.entries() == []
+
+    def test_parse_size(self) -> None:
+        """Human readable sizes are parsed."""
+        assert parse_size("1024") == 1024
+        assert parse_size("500M") == 500 * 1024**2
+        assert parse_size("1.5GiB") == int(1.5 * 1024**3)
+        with pytest.raises(ValueError):
+            parse_size("lots")
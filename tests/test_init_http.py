@@ -0,0 +1,160 @@
+"""Tests for the shared template HTTP clients."""
+
+from pathlib import Path
+
+import httpx
+import pytest
+
+from agent_container_pack.init import (
+    HttpConfig,
+    create_async_client,
+    create_client,
+    download_template,
+    fetch_archive_async,
+    parse_template_source,
+)
+from agent_container_pack.init.http import RetryTransport
+
+from .conftest import make_template_zip
+
+NO_BACKOFF = HttpConfig(backoff=0, retries=2)
+
+
+def _flaky(failures: list[int | type[Exception]], body: bytes = b"ok"):
+    """Mock handler failing with the given statuses/exceptions, then 200."""
+    calls: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) <= len(failures):
+            failure = failures[len(calls) - 1]
+            if isinstance(failure, int):
+                return httpx.Response(failure)
+            raise failure("boom", request=request)
+        return httpx.Response(200, content=body)
+
+    return handler, calls
+
+
+class TestRetries:
+    """Test retry, backoff and timeout policy."""
+
+    def test_retries_transient_status(self) -> None:
+        """503 responses are retried until the request succeeds."""
+        handler, calls = _flaky([503, 502])
+        with create_client(
+            NO_BACKOFF, transport=httpx.MockTransport(handler)
+        ) as client:
+            response = client.get("https://example.com/archive.zip")
+
+        assert response.status_code == 200
+        assert len(calls) == 3
+
+    def test_retries_connection_errors(self) -> None:
+        """Connection errors are retried."""
+        handler, calls = _flaky([httpx.ConnectError])
+        with create_client(
+            NO_BACKOFF, transport=httpx.MockTransport(handler)
+        ) as client:
+            assert client.get("https://example.com/").status_code == 200
+
+        assert len(calls) == 2
+
+    def test_gives_up_after_retries(self) -> None:
+        """The last response is returned once retries are exhausted."""
+        handler, calls = _flaky([503, 503, 503, 503])
+        with create_client(
+            NO_BACKOFF, transport=httpx.MockTransport(handler)
+        ) as client:
+            assert client.get("https://example.com/").status_code == 503
+
+        assert len(calls) == 3
+
+    def test_non_idempotent_not_retried(self) -> None:
+        """POST requests are never retried."""
+        handler, calls = _flaky([503])
+        with create_client(
+            NO_BACKOFF, transport=httpx.MockTransport(handler)
+        ) as client:
+            assert client.post("https://example.com/").status_code == 503
+
+        assert len(calls) == 1
+
+    def test_retry_after_and_jitter(self) -> None:
+        """Retry-After is honoured; otherwise delays are jittered backoff."""
+        delays: list[float] = []
+        config = HttpConfig(backoff=1.0, max_backoff=4.0, retries=3)
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            if not delays:
+                return httpx.Response(429, headers={"Retry-After": "2"})
+            if len(delays) < 3:
+                return httpx.Response(503)
+            return httpx.Response(200)
+
+        transport = RetryTransport(
+            httpx.MockTransport(handler), config, sleep=delays.append
+        )
+        with httpx.Client(transport=transport) as client:
+            assert client.get("https://example.com/").status_code == 200
+
+        assert delays[0] == 2.0
+        assert 0 <= delays[1] <= 2.0
+        assert 0 <= delays[2] <= 4.0
+
+    def test_timeouts_configured(self) -> None:
+        """Clients carry explicit timeouts."""
+        config = HttpConfig(connect_timeout=1.5, read_timeout=7.0)
+        with create_client(config) as client:
+            assert client.timeout.connect == 1.5
+            assert client.timeout.read == 7.0
+            # Never wait forever for a pooled connection
+            assert client.timeout.pool == 60.0
+
+
+class TestTemplateClient:
+    """Test template downloads over an injected transport."""
+
+    def test_download_uses_injected_client(self, tmp_path: Path) -> None:
+        """download_template sends every request through the given client."""
+        archive = make_template_zip({".devcontainer/Dockerfile": "FROM x"})
+        handler, calls = _flaky([503], body=archive)
+
+        with create_client(
+            NO_BACKOFF, transport=httpx.MockTransport(handler)
+        ) as client:
+            download_template(
+                parse_template_source("github:owner/repo"), tmp_path, client=client
+            )
+
+        assert (tmp_path / ".devcontainer" / "Dockerfile").read_text() == "FROM x"
+        assert [str(r.url) for r in calls] == [
+            "https://github.com/owner/repo/archive/refs/heads/main.zip"
+        ] * 2
+
+    async def test_async_fetch(self) -> None:
+        """The async client retries and streams archives too."""
+        handler, calls = _flaky([500], body=b"PK-data")
+
+        async with create_async_client(
+            NO_BACKOFF, transport=httpx.MockTransport(handler)
+        ) as client:
+            archive = await fetch_archive_async(
+                parse_template_source("github:owner/repo"), client=client
+            )
+
+        with archive:
+            assert archive.read() == b"PK-data"
+        assert len(calls) == 2
+
+    async def test_async_status_error(self) -> None:
+        """Non-retryable errors surface as HTTPStatusError."""
+        handler, _ = _flaky([404, 404, 404])
+
+        async with create_async_client(
+            NO_BACKOFF, transport=httpx.MockTransport(handler)
+        ) as client:
+            with pytest.raises(httpx.HTTPStatusError):
+                await fetch_archive_async(
+                    parse_template_source("github:owner/repo"), client=client
+                )
@@ -0,0 +1,78 @@
+"""Tests for layered template composition."""
+
+from pathlib import Path
+
+import yaml
+
+from agent_container_pack.init import init_projects, parse_template_source
+from agent_container_pack.init.layers import deep_merge
+
+
+class TestDeepMerge:
+    """Test manifest deep-merging."""
+
+    def test_nested_mappings_merged(self) -> None:
+        """Mappings merge recursively; scalars and lists are replaced."""
+        base = {"project": {"name": "base", "description": "d"}, "tags": ["a"]}
+        override = {"project": {"name": "overlay"}, "tags": ["b"]}
+
+        assert deep_merge(base, override) == {
+            "project": {"name": "overlay", "description": "d"},
+            "tags": ["b"],
+        }
+        assert base["project"]["name"] == "base"
+
+
+class TestLayeredInit:
+    """Test composing several template layers."""
+
+    def test_layers_override_and_merge(self, tmp_path: Path, template_server) -> None:
+        """Later layers override files and deep-merge agentpack.yml."""
+        template_server.add_archive(
+            "org",
+            "base",
+            {
+                ".devcontainer/Dockerfile": "FROM base",
+                ".devcontainer/init-firewall.sh": "# firewall",
+                "agentpack.yml": (
+                    'version: "1"\n'
+                    "project:\n  name: base\n  description: Base\n"
+                    "stacks:\n  python:\n    detect:\n      any: [pyproject.toml]\n"
+                ),
+            },
+        )
+        template_server.add_archive(
+            "org",
+            "node",
+            {
+                ".devcontainer/Dockerfile": "FROM node",
+                "agentpack.yml": (
+                    "project:\n  name: overlay\n"
+                    "stacks:\n  node:\n    detect:\n      any: [package.json]\n"
+                ),
+            },
+        )
+        sidecar = tmp_path / "sidecar"
+        (sidecar / ".devcontainer").mkdir(parents=True)
+        (sidecar / ".devcontainer" / "compose.yml").write_text("services: {}")
+        target = tmp_path / "project"
+
+        results = init_projects(
+            [
+                parse_template_source("github:org/base"),
+                parse_template_source("github:org/node"),
+                parse_template_source(f"dir:{sidecar}"),
+            ],
+            [target],
+            base_url=template_server.base_url,
+        )
+
+        assert results[0].status == "created"
+        devcontainer = target / ".devcontainer"
+        assert (devcontainer / "Dockerfile").read_text() == "FROM node"
+        assert (devcontainer / "init-firewall.sh").read_text() == "# firewall"
+        assert (devcontainer / "compose.yml").exists()
+        manifest = yaml.safe_load((target / "agentpack.yml").read_text())
+        assert manifest["project"] == {"name": "overlay", "description": "Base"}
+        assert list(manifest["stacks"]) == ["python", "node"]
+        assert len(template_server.requests) == 2
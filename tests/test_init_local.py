@@ -0,0 +1,192 @@
+"""Tests for local directory and archive template sources."""
+
+import io
+import os
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from agent_container_pack.init import (
+    LocalTemplateSource,
+    download_template,
+    parse_template_source,
+)
+from agent_container_pack.init.local import copy_file
+
+from .conftest import make_template_zip
+
+TEMPLATE_FILES = {
+    ".devcontainer/Dockerfile": "FROM python",
+    ".devcontainer/scripts/setup.sh": "#!/bin/sh\necho setup",
+    "agentpack.yml": 'version: "1"',
+}
+
+
+def _write_template_dir(path: Path) -> Path:
+    for name, content in TEMPLATE_FILES.items():
+        (path / name).parent.mkdir(parents=True, exist_ok=True)
+        (path / name).write_text(content)
+    (path / ".devcontainer/scripts/setup.sh").chmod(0o755)
+    (path / "README.md").write_text("not part of the template")
+    return path
+
+
+def _write_tar(path: Path, files: dict[str, str]) -> Path:
+    with tarfile.open(path, "w:gz") as tf:
+        for name, content in files.items():
+            data = content.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    return path
+
+
+class TestParseLocalSource:
+    """Test parsing of file: and dir: sources."""
+
+    def test_parse_dir(self) -> None:
+        """dir: sources keep the path and optional subdir."""
+        source = parse_template_source("dir:vendor/templates#python")
+
+        assert source == LocalTemplateSource(
+            path=Path("vendor/templates"), subdir="python"
+        )
+
+    def test_parse_file(self) -> None:
+        """file: sources point at archives."""
+        source = parse_template_source("file:/tmp/template.tar.gz")
+
+        assert source == LocalTemplateSource(path=Path("/tmp/template.tar.gz"))
+
+    def test_unsupported_archive(self, tmp_path: Path) -> None:
+        """Unknown archive types are rejected."""
+        (tmp_path / "template.rar").write_bytes(b"")
+
+        with pytest.raises(ValueError, match="Unsupported template archive"):
+            download_template(
+                LocalTemplateSource(path=tmp_path / "template.rar"), tmp_path
+            )
+
+    def test_missing_path(self, tmp_path: Path) -> None:
+        """Missing sources are reported."""
+        with pytest.raises(ValueError, match="Template not found"):
+            download_template(LocalTemplateSource(path=tmp_path / "nope"), tmp_path)
+
+
+class TestLocalTemplates:
+    """Test copying templates from local directories and archives."""
+
+    def test_copy_directory(self, tmp_path: Path) -> None:
+        """Only .devcontainer and agentpack.yml are copied, modes preserved."""
+        template = _write_template_dir(tmp_path / "template")
+        target = tmp_path / "project"
+        target.mkdir()
+
+        download_template(parse_template_source(f"dir:{template}"), target)
+
+        assert (target / ".devcontainer/Dockerfile").read_text() == "FROM python"
+        assert (target / "agentpack.yml").exists()
+        assert not (target / "README.md").exists()
+        assert os.access(target / ".devcontainer/scripts/setup.sh", os.X_OK)
+
+    def test_copy_directory_subdir(self, tmp_path: Path) -> None:
+        """A subdir selects one template from a vendored collection."""
+        _write_template_dir(tmp_path / "templates" / "python")
+        target = tmp_path / "project"
+        target.mkdir()
+
+        download_template(
+            parse_template_source(f"dir:{tmp_path / 'templates'}#python"), target
+        )
+
+        assert (target / ".devcontainer/Dockerfile").exists()
+
+    def test_copy_does_not_write_through(self, tmp_path: Path) -> None:
+        """Existing targets are replaced, never modified in place."""
+        src = tmp_path / "src"
+        src.write_text("template")
+        dst = tmp_path / "dst"
+        os.link(src, dst)
+
+        copy_file(src, dst)
+        dst.write_text("edited")
+
+        assert src.read_text() == "template"
+
+    def test_hardlink_opt_in(self, tmp_path: Path) -> None:
+        """Hardlinks are only used with link=True."""
+        src = tmp_path / "src"
+        src.write_text("template")
+
+        method = copy_file(src, tmp_path / "copy")
+        assert method in ("reflink", "copy")
+        assert (tmp_path / "copy").stat().st_ino != src.stat().st_ino
+
+        method = copy_file(src, tmp_path / "link", link=True)
+        if method == "hardlink":
+            assert (tmp_path / "link").stat().st_ino == src.stat().st_ino
+        assert (tmp_path / "link").read_text() == "template"
+
+    @pytest.mark.parametrize("root", ["repo-main", None])
+    def test_zip_archive(self, tmp_path: Path, root: str | None) -> None:
+        """Zip archives work with or without a root directory."""
+        archive = tmp_path / "template.zip"
+        if root:
+            archive.write_bytes(make_template_zip(TEMPLATE_FILES, root=root))
+        else:
+            with zipfile.ZipFile(archive, "w") as zf:
+                for name, content in TEMPLATE_FILES.items():
+                    zf.writestr(name, content)
+        target = tmp_path / "project"
+        target.mkdir()
+
+        download_template(parse_template_source(f"file:{archive}"), target)
+
+        assert (target / ".devcontainer/scripts/setup.sh").exists()
+        assert (target / "agentpack.yml").read_text() == 'version: "1"'
+
+    @pytest.mark.parametrize("prefix", ["repo-main/", "./", ""])
+    def test_tar_archive(self, tmp_path: Path, prefix: str) -> None:
+        """Tarballs work with a root directory, ./ entries or flat members."""
+        archive = _write_tar(
+            tmp_path / "template.tar.gz",
+            {f"{prefix}{name}": content for name, content in TEMPLATE_FILES.items()},
+        )
+        target = tmp_path / "project"
+        target.mkdir()
+
+        download_template(parse_template_source(f"file:{archive}"), target)
+
+        assert (target / ".devcontainer/Dockerfile").read_text() == "FROM python"
+        assert (target / "agentpack.yml").exists()
+
+    def test_tar_archive_subdir(self, tmp_path: Path) -> None:
+        """Tarball subdirs select one template."""
+        archive = _write_tar(
+            tmp_path / "templates.tgz",
+            {
+                f"templates/python/{name}": content
+                for name, content in TEMPLATE_FILES.items()
+            },
+        )
+        target = tmp_path / "project"
+        target.mkdir()
+
+        download_template(
+            parse_template_source(f"file:{archive}#templates/python"), target
+        )
+
+        assert (target / ".devcontainer/Dockerfile").exists()
+
+    def test_tar_archive_unsafe_path(self, tmp_path: Path) -> None:
+        """Members escaping .devcontainer are rejected."""
+        archive = _write_tar(
+            tmp_path / "evil.tar.gz", {".devcontainer/../../evil.sh": "rm -rf /"}
+        )
+
+        with pytest.raises(ValueError, match="Unsafe path"):
+            download_template(
+                parse_template_source(f"file:{archive}"), tmp_path / "project"
+            )
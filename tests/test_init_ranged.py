@@ -0,0 +1,89 @@
+"""Tests for partial template downloads over HTTP Range."""
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+import httpx
+import pytest
+
+from agent_container_pack.init.ranged import (
+    HTTPRangeFile,
+    RangeNotSupportedError,
+    extract_remote_template,
+)
+from agent_container_pack.init.template import download_template, parse_template_source
+
+MONOREPO_FILES: dict[str, str | bytes] = {
+    "assets/video.bin": os.urandom(2_000_000),
+    "templates/py/.devcontainer/devcontainer.json": "{}",
+    "templates/py/.devcontainer/Dockerfile": "FROM python",
+    "templates/py/agentpack.yml": 'version: "1"\n',
+    "docs/large.bin": os.urandom(1_000_000),
+}
+
+
+class TestRangedFetch:
+    """Test fetching only the needed members of a remote zip."""
+
+    def test_fetches_only_needed_members(self, tmp_path: Path, template_server) -> None:
+        """Only the central directory and template members are transferred."""
+        template_server.support_ranges = True
+        template_server.add_archive("owner", "mono", MONOREPO_FILES)
+        archive_size = len(next(iter(template_server.archives.values())))
+        url = f"{template_server.base_url}/owner/mono/archive/refs/heads/main.zip"
+
+        remote = extract_remote_template(url, tmp_path, subdir="templates/py")
+
+        assert (tmp_path / ".devcontainer" / "Dockerfile").read_text() == "FROM python"
+        assert (tmp_path / "agentpack.yml").exists()
+        assert template_server.bytes_sent < archive_size // 10
+        assert remote.requests == len(template_server.requests)
+
+    def test_range_not_supported(self, tmp_path: Path, template_server) -> None:
+        """Servers ignoring Range are detected."""
+        template_server.add_archive("owner", "mono", MONOREPO_FILES)
+        url = f"{template_server.base_url}/owner/mono/archive/refs/heads/main.zip"
+
+        with pytest.raises(RangeNotSupportedError):
+            extract_remote_template(url, tmp_path)
+
+    def test_ignored_range_body_not_read(self) -> None:
+        """A full 200 response to a range request is closed unread."""
+        chunks_read = []
+
+        def body() -> Iterator[bytes]:
+            for _ in range(100):
+                chunks_read.append(1)
+                yield b"x" * 65536
+
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(200, content=body())
+        )
+        with httpx.Client(transport=transport) as client:
+            remote = HTTPRangeFile(
+                client,
+                "https://example.test/a.zip",
+                size=10,
+                etag='"a"',
+                segment=(0, b""),
+            )
+            with pytest.raises(RangeNotSupportedError):
+                remote.fetch(0, 10)
+
+        assert chunks_read == []
+        assert remote.bytes_fetched == 0
+
+    def test_download_template_falls_back(
+        self, tmp_path: Path, template_server
+    ) -> None:
+        """download_template falls back to the full download."""
+        template_server.add_archive("owner", "mono", MONOREPO_FILES)
+
+        source = parse_template_source("github:owner/mono#templates/py")
+        download_template(
+            source, tmp_path, base_url=template_server.base_url, partial=True
+        )
+
+        assert (tmp_path / ".devcontainer" / "devcontainer.json").exists()
+        assert len(template_server.requests) == 2
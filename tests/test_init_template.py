@@ -1,9 +1,15 @@
 """Tests for template download."""
 
+import os
 from pathlib import Path
-from unittest.mock import patch, MagicMock
 
-from agent_container_pack.init.template import parse_template_source, download_template
+import pytest
+
+from agent_container_pack.init.template import (
+    TemplateTooLargeError,
+    download_template,
+    parse_template_source,
+)
 
 
 class TestTemplateSource:
@@ -50,29 +56,57 @@ class TestTemplateSource:
 class TestDownloadTemplate:
     """Test template download."""
 
-    def test_download_creates_files(self, tmp_path: Path) -> None:
+    def test_download_creates_files(self, tmp_path: Path, template_server) -> None:
         """Download template creates expected files."""
-        # Mock httpx response
-        with patch("agent_container_pack.init.template.httpx") as mock_httpx:
-            import zipfile
-            import io
-
-            # Create mock zip file with .devcontainer
-            zip_buffer = io.BytesIO()
-            with zipfile.ZipFile(zip_buffer, "w") as zf:
-                zf.writestr("repo-main/.devcontainer/devcontainer.json", "{}")
-                zf.writestr("repo-main/.devcontainer/Dockerfile", "FROM ubuntu")
-
-            mock_response = MagicMock()
-            mock_response.content = zip_buffer.getvalue()
-            mock_response.raise_for_status = MagicMock()
-            mock_httpx.get.return_value = mock_response
-
-            source = parse_template_source("github:owner/repo")
-            download_template(source, tmp_path)
-
-            assert (tmp_path / ".devcontainer" / "devcontainer.json").exists()
-            assert (tmp_path / ".devcontainer" / "Dockerfile").exists()
+        template_server.add_archive(
+            "owner",
+            "repo",
+            {
+                ".devcontainer/devcontainer.json": "{}",
+                ".devcontainer/Dockerfile": "FROM ubuntu",
+            },
+        )
+
+        source = parse_template_source("github:owner/repo")
+        download_template(source, tmp_path, base_url=template_server.base_url)
+
+        assert (tmp_path / ".devcontainer" / "devcontainer.json").exists()
+        assert (tmp_path / ".devcontainer" / "Dockerfile").exists()
+
+    def test_download_streams_with_progress(
+        self, tmp_path: Path, template_server
+    ) -> None:
+        """Downloads are streamed in chunks and report progress."""
+        template_server.add_archive(
+            "owner",
+            "repo",
+            {".devcontainer/big.bin": os.urandom(300_000).hex()},
+        )
+        updates: list[tuple[int, int | None]] = []
+
+        source = parse_template_source("github:owner/repo")
+        download_template(
+            source,
+            tmp_path,
+            base_url=template_server.base_url,
+            progress=lambda received, total: updates.append((received, total)),
+        )
+
+        assert len(updates) > 1
+        assert updates[-1][0] == updates[-1][1]
+        assert (tmp_path / ".devcontainer" / "big.bin").stat().st_size == 600_000
+
+    def test_download_size_limit(self, tmp_path: Path, template_server) -> None:
+        """Archives larger than the limit are rejected."""
+        template_server.add_archive(
+            "owner", "repo", {".devcontainer/devcontainer.json": "{}"}
+        )
+
+        source = parse_template_source("github:owner/repo")
+        with pytest.raises(TemplateTooLargeError):
+            download_template(
+                source, tmp_path, base_url=template_server.base_url, max_size=10
+            )
 
 
 class TestGenerateSkeleton:
@@ -114,6 +114,34 @@ class TestManifestValidation:
             Manifest.model_validate(data)
         assert "mode" in str(exc_info.value)
 
+    def test_firewall_allow_rules(self) -> None:
+        """Allow rules accept hosts, *.domain and .domain only."""
+        data = {
+            "version": "1",
+            "project": {"name": "test", "description": "test"},
+            "firewall": {"allow": ["*.Vendor.com", ".example.org.", "api.x.io"]},
+        }
+        manifest = Manifest.model_validate(data)
+        assert manifest.firewall.allow == ["*.vendor.com", ".example.org", "api.x.io"]
+
+        data["firewall"] = {"allow": ["vendor.*.com"]}
+        with pytest.raises(ValidationError, match="Invalid allow rule"):
+            Manifest.model_validate(data)
+
+    def test_mcp_server_timeouts_must_be_positive(self) -> None:
+        """Timeouts of zero or less are rejected."""
+        data = {
+            "version": "1",
+            "project": {"name": "test", "description": "test"},
+            "mcp": {
+                "servers": {
+                    "slow": {"command": ["slow-mcp"], "startup_timeout_sec": 0},
+                },
+            },
+        }
+        with pytest.raises(ValidationError, match="startup_timeout_sec"):
+            Manifest.model_validate(data)
+
     def test_mcp_server_requires_transport(self) -> None:
         """MCP server must have valid transport."""
         data = {
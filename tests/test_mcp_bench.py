@@ -0,0 +1,167 @@
+"""Tests for the MCP startup benchmark."""
+
+import json
+import shlex
+import subprocess
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+import yaml
+
+from agent_container_pack.manifest.schema import Manifest
+from agent_container_pack.mcp import bench_servers, percentile
+
+from .conftest import stub_mcp_command
+
+
+def _manifest(servers: dict[str, dict]) -> Manifest:
+    return Manifest.model_validate(
+        {
+            "version": "1",
+            "project": {"name": "test", "description": "test"},
+            "mcp": {"servers": servers},
+        }
+    )
+
+
+def _paged_handler(request: httpx.Request) -> httpx.Response:
+    """Mock HTTP server returning tools/list in two pages."""
+    message = json.loads(request.content) if request.content else {}
+    if "id" not in message:
+        return httpx.Response(202)
+    if message["method"] == "initialize":
+        result = {"protocolVersion": "2025-06-18", "serverInfo": {"name": "remote"}}
+    elif message.get("params", {}).get("cursor") == "2":
+        result = {"tools": [{"name": "c"}]}
+    else:
+        result = {"tools": [{"name": "a"}, {"name": "b"}], "nextCursor": "2"}
+    return httpx.Response(
+        200,
+        json={"jsonrpc": "2.0", "id": message["id"], "result": result},
+        headers={"mcp-session-id": "s1"},
+    )
+
+
+class TestPercentile:
+    """Test percentile interpolation."""
+
+    def test_percentiles(self) -> None:
+        """Values between ranks are interpolated."""
+        values = [float(v) for v in range(1, 101)]
+
+        assert percentile(values, 50) == pytest.approx(50.5)
+        assert percentile(values, 99) == pytest.approx(99.01)
+        assert percentile([3.0], 95) == 3.0
+
+    def test_empty(self) -> None:
+        """Empty samples are rejected."""
+        with pytest.raises(ValueError):
+            percentile([], 50)
+
+
+class TestBenchServers:
+    """Test trial execution against stub servers."""
+
+    async def test_stdio_trials(self, tmp_path: Path) -> None:
+        """Every trial times initialize and tools/list and samples RSS."""
+        manifest = _manifest({"stub": {"command": stub_mcp_command("--tools", "5")}})
+
+        [result] = await bench_servers(manifest, tmp_path, trials=3)
+
+        assert len(result.trials) == 3
+        assert result.cold is result.trials[0]
+        assert len(result.warm) == 2
+        assert all(t.tools == 5 for t in result.trials)
+        if sys.platform == "linux":
+            assert all(t.rss and t.rss > 0 for t in result.trials)
+        report = result.to_dict()
+        assert set(report["warm"]["initialize_ms"]) == {
+            "p50",
+            "p95",
+            "p99",
+            "min",
+            "max",
+            "mean",
+        }
+
+    @pytest.mark.skipif(sys.platform != "linux", reason="reads /proc")
+    async def test_rss_counts_child_processes(self, tmp_path: Path) -> None:
+        """RSS of a server started by a wrapper includes the server itself."""
+        stub = shlex.join(stub_mcp_command())
+        manifest = _manifest(
+            {
+                "direct": {"command": stub_mcp_command()},
+                # No exec: the stub runs as a child of the shell
+                "wrapped": {"command": ["sh", "-c", f"{stub}; true"]},
+            }
+        )
+
+        direct, wrapped = await bench_servers(manifest, tmp_path, trials=1)
+
+        assert wrapped.errors == []
+        # The shell alone is a fraction of the Python interpreter's RSS
+        assert wrapped.cold.rss > direct.cold.rss * 0.8
+
+    async def test_failed_trials_recorded(self, tmp_path: Path) -> None:
+        """Failures are collected per trial instead of aborting."""
+        manifest = _manifest({"broken": {"command": stub_mcp_command("--fail", "x")}})
+
+        [result] = await bench_servers(manifest, tmp_path, trials=2)
+
+        assert result.trials == []
+        assert len(result.errors) == 2
+        assert result.to_dict()["cold"] is None
+
+    async def test_http_pagination(self, tmp_path: Path) -> None:
+        """tools/list pages are followed over one HTTP session."""
+        manifest = _manifest(
+            {"remote": {"transport": "http", "url": "https://mcp.test/mcp"}}
+        )
+
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(_paged_handler)
+        ) as client:
+            [result] = await bench_servers(manifest, tmp_path, trials=2, client=client)
+
+        assert [t.tools for t in result.trials] == [3, 3]
+        assert result.trials[0].rss is None
+
+
+class TestBenchCommand:
+    """Test acpack bench mcp command."""
+
+    def test_writes_json(self, tmp_path: Path) -> None:
+        """Results are written as JSON for regression tracking."""
+        manifest = {
+            "version": "1",
+            "project": {"name": "test", "description": "test"},
+            "mcp": {"servers": {"stub": {"command": stub_mcp_command()}}},
+        }
+        (tmp_path / "agentpack.yml").write_text(yaml.safe_dump(manifest))
+
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "agent_container_pack",
+                "bench",
+                "mcp",
+                "--trials",
+                "2",
+                "--output",
+                "bench.json",
+            ],
+            cwd=tmp_path,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+        assert result.returncode == 0, result.stderr
+        assert "warm   initialize p50" in result.stdout
+        report = json.loads((tmp_path / "bench.json").read_text())
+        assert report["trials"] == 2
+        assert report["servers"][0]["name"] == "stub"
+        assert len(report["servers"][0]["trials"]) == 2
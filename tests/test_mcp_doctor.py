@@ -0,0 +1,220 @@
+"""Tests for MCP server health probes."""
+
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+import yaml
+
+from agent_container_pack.manifest.schema import Manifest
+from agent_container_pack.mcp import expand_variables, probe_servers
+
+from .conftest import stub_mcp_command
+
+
+def _manifest(servers: dict[str, dict]) -> Manifest:
+    return Manifest.model_validate(
+        {
+            "version": "1",
+            "project": {"name": "test", "description": "test"},
+            "mcp": {"servers": servers},
+        }
+    )
+
+
+def _mcp_handler(request: httpx.Request) -> httpx.Response:
+    """Mock Streamable HTTP endpoint answering initialize over SSE."""
+    if request.url.host != "mcp.test" or request.url.path != "/mcp":
+        return httpx.Response(404)
+    message = json.loads(request.content)
+    if "id" not in message:
+        return httpx.Response(202)
+    result = {
+        "protocolVersion": message["params"]["protocolVersion"],
+        "serverInfo": {"name": "remote", "version": "2.0"},
+    }
+    body = f"event: message\ndata: {json.dumps({'jsonrpc': '2.0', 'id': message['id'], 'result': result})}\n\n"
+    return httpx.Response(
+        200, headers={"content-type": "text/event-stream"}, content=body
+    )
+
+
+class TestProbes:
+    """Test stdio and HTTP probes."""
+
+    async def test_stdio_handshake(self, tmp_path: Path) -> None:
+        """A stdio server is started and answers initialize."""
+        manifest = _manifest({"stub": {"command": stub_mcp_command()}})
+
+        [result] = await probe_servers(manifest, tmp_path)
+
+        assert result.ok
+        assert result.server_info == {"name": "stub", "version": "1.0.0"}
+        assert result.latency > 0
+
+    async def test_stdio_failure_reports_stderr(self, tmp_path: Path) -> None:
+        """A server exiting early fails with its last stderr line."""
+        manifest = _manifest(
+            {"broken": {"command": stub_mcp_command("--fail", "missing API key")}}
+        )
+
+        [result] = await probe_servers(manifest, tmp_path)
+
+        assert not result.ok
+        assert "missing API key" in (result.error or "")
+
+    async def test_missing_command(self, tmp_path: Path) -> None:
+        """A command that does not exist is a failure, not a crash."""
+        manifest = _manifest({"nope": {"command": ["acpack-no-such-command"]}})
+
+        [result] = await probe_servers(manifest, tmp_path)
+
+        assert not result.ok
+
+    async def test_probes_run_concurrently(self, tmp_path: Path) -> None:
+        """Slow servers are probed in parallel and time out individually."""
+        manifest = _manifest(
+            {
+                "slow-1": {"command": stub_mcp_command("--delay", "0.5")},
+                "slow-2": {"command": stub_mcp_command("--delay", "0.5")},
+                "hung": {"command": stub_mcp_command("--delay", "30")},
+            }
+        )
+
+        start = time.perf_counter()
+        results = await probe_servers(manifest, tmp_path, timeout=2.0)
+        elapsed = time.perf_counter() - start
+
+        assert [r.ok for r in results] == [True, True, False]
+        assert "Timed out" in (results[2].error or "")
+        assert elapsed < 6
+
+    async def test_http_probe(self, tmp_path: Path) -> None:
+        """HTTP servers are probed through the given pooled client."""
+        manifest = _manifest(
+            {
+                "remote": {"transport": "http", "url": "https://mcp.test/mcp"},
+                "gone": {"transport": "http", "url": "https://mcp.test/missing"},
+            }
+        )
+
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(_mcp_handler)
+        ) as client:
+            remote, gone = await probe_servers(manifest, tmp_path, client=client)
+
+        assert remote.ok
+        assert remote.server_info == {"name": "remote", "version": "2.0"}
+        assert not gone.ok
+        assert "404" in (gone.error or "")
+
+    async def test_http_url_variables(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Variables in HTTP server URLs are expanded before connecting."""
+        monkeypatch.setenv("API_HOST", "mcp.test")
+        manifest = _manifest(
+            {"remote": {"transport": "http", "url": "https://${API_HOST}/mcp"}}
+        )
+
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(_mcp_handler)
+        ) as client:
+            [remote] = await probe_servers(manifest, tmp_path, client=client)
+
+        assert remote.ok, remote.error
+
+    def test_expand_variables(self, tmp_path: Path) -> None:
+        """workspaceFolder and env references are expanded."""
+        value = expand_variables(
+            "${workspaceFolder}/data:${env:TOKEN}:${MISSING}",
+            tmp_path,
+            {"TOKEN": "abc"},
+        )
+
+        assert value == f"{tmp_path}/data:abc:${{MISSING}}"
+
+
+class TestDoctorCommand:
+    """Test acpack doctor command."""
+
+    def test_doctor_json(self, tmp_path: Path) -> None:
+        """Failures are reported and make the command exit non-zero."""
+        manifest = {
+            "version": "1",
+            "project": {"name": "test", "description": "test"},
+            "mcp": {
+                "servers": {
+                    "stub": {"command": stub_mcp_command()},
+                    "broken": {"command": stub_mcp_command("--fail", "boom")},
+                }
+            },
+        }
+        (tmp_path / "agentpack.yml").write_text(
+            yaml.safe_dump(manifest, sort_keys=False)
+        )
+
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "agent_container_pack",
+                "doctor",
+                "--format",
+                "json",
+            ],
+            cwd=tmp_path,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+        assert result.returncode == 1
+        report = json.loads(result.stdout)
+        assert not report["ok"]
+        assert [(s["name"], s["ok"]) for s in report["servers"]] == [
+            ("stub", True),
+            ("broken", False),
+        ]
+
+    def test_doctor_selected_server(self, tmp_path: Path) -> None:
+        """--server limits the probes; unknown names are rejected."""
+        manifest = {
+            "version": "1",
+            "project": {"name": "test", "description": "test"},
+            "mcp": {"servers": {"stub": {"command": stub_mcp_command()}}},
+        }
+        (tmp_path / "agentpack.yml").write_text(
+            yaml.safe_dump(manifest, sort_keys=False)
+        )
+
+        ok = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "agent_container_pack",
+                "doctor",
+                "--server",
+                "stub",
+            ],
+            cwd=tmp_path,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        unknown = subprocess.run(
+            [sys.executable, "-m", "agent_container_pack", "doctor", "--server", "x"],
+            cwd=tmp_path,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+        assert ok.returncode == 0
+        assert "1 server(s): 1 ok, 0 failed" in ok.stdout
+        assert unknown.returncode == 2
+        assert "Unknown MCP server(s): x" in unknown.stderr
@@ -0,0 +1,147 @@
+"""Tests for MCP tool catalog footprints."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import yaml
+
+from agent_container_pack.manifest.schema import Manifest
+from agent_container_pack.mcp import ToolFootprint, estimate_tokens, measure_footprints
+
+from .conftest import stub_mcp_command
+
+
+def _write_manifest(path: Path, servers: dict[str, dict]) -> None:
+    manifest = {
+        "version": "1",
+        "project": {"name": "test", "description": "test"},
+        "mcp": {"servers": servers},
+    }
+    (path / "agentpack.yml").write_text(yaml.safe_dump(manifest, sort_keys=False))
+
+
+class TestFootprint:
+    """Test measuring tool catalogs."""
+
+    def test_tool_footprint(self) -> None:
+        """Tools are measured as compact JSON."""
+        tool = {"name": "search", "description": "Search the docs."}
+        text = '{"name":"search","description":"Search the docs."}'
+
+        footprint = ToolFootprint.from_tool(tool)
+
+        assert footprint == ToolFootprint("search", len(text), estimate_tokens(text))
+        assert estimate_tokens("abcde") == 2
+
+    async def test_servers_measured(self, tmp_path: Path) -> None:
+        """Per-server totals are the sum of their tools; failures are kept."""
+        manifest = Manifest.model_validate(
+            {
+                "version": "1",
+                "project": {"name": "test", "description": "test"},
+                "mcp": {
+                    "servers": {
+                        "small": {"command": stub_mcp_command("--tools", "1")},
+                        "large": {"command": stub_mcp_command("--tools", "20")},
+                        "broken": {"command": stub_mcp_command("--fail", "x")},
+                    }
+                },
+            }
+        )
+
+        small, large, broken = await measure_footprints(manifest, tmp_path)
+
+        assert len(small.tools) == 1
+        assert len(large.tools) == 20
+        assert large.tokens == sum(t.tokens for t in large.tools)
+        assert large.tokens > small.tokens
+        assert broken.error and broken.tools == []
+
+    async def test_tool_filters_applied(self, tmp_path: Path) -> None:
+        """Tools hidden by enabled_tools/disabled_tools are not counted."""
+        command = stub_mcp_command("--tools", "4")
+        manifest = Manifest.model_validate(
+            {
+                "version": "1",
+                "project": {"name": "test", "description": "test"},
+                "mcp": {
+                    "servers": {
+                        "all": {"command": command},
+                        "filtered": {
+                            "command": command,
+                            "enabled_tools": ["tool_0", "tool_1", "tool_2"],
+                            "disabled_tools": ["tool_1"],
+                        },
+                    }
+                },
+            }
+        )
+
+        unfiltered, filtered = await measure_footprints(manifest, tmp_path)
+
+        assert [t.name for t in filtered.tools] == ["tool_0", "tool_2"]
+        assert [t.name for t in filtered.hidden] == ["tool_1", "tool_3"]
+        assert filtered.tokens < unfiltered.tokens
+        assert filtered.unfiltered_tokens == unfiltered.tokens
+        assert unfiltered.hidden == []
+
+
+class TestFootprintCommand:
+    """Test acpack mcp footprint command."""
+
+    def test_json_report(self, tmp_path: Path) -> None:
+        """The JSON report lists servers and tools against the budget."""
+        _write_manifest(
+            tmp_path, {"stub": {"command": stub_mcp_command("--tools", "3")}}
+        )
+
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "agent_container_pack",
+                "mcp",
+                "footprint",
+                "--format",
+                "json",
+            ],
+            cwd=tmp_path,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+        assert result.returncode == 0, result.stderr
+        report = json.loads(result.stdout)
+        assert report["within_budget"]
+        assert report["budget"] == 20_000
+        [server] = report["servers"]
+        assert [t["name"] for t in server["tools"]] == ["tool_0", "tool_1", "tool_2"]
+        assert report["total_tokens"] == server["tokens"]
+
+    def test_over_budget_fails(self, tmp_path: Path) -> None:
+        """Exceeding the budget exits non-zero."""
+        _write_manifest(
+            tmp_path, {"stub": {"command": stub_mcp_command("--tools", "10")}}
+        )
+
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "agent_container_pack",
+                "mcp",
+                "footprint",
+                "--budget",
+                "50",
+            ],
+            cwd=tmp_path,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+        assert result.returncode == 1
+        assert "exceed the budget" in result.stderr
@@ -0,0 +1,99 @@
+"""Tests for the shared MCP server proxy."""
+
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+
+from agent_container_pack.manifest.schema import (
+    Manifest,
+    MCPProxyConfig,
+    MCPServerHTTP,
+)
+from agent_container_pack.mcp import HttpSession, MCPProxy, list_tools, proxy_url
+
+from .conftest import stub_mcp_command
+
+
+def _manifest(servers: dict[str, dict]) -> Manifest:
+    return Manifest.model_validate(
+        {
+            "version": "1",
+            "project": {"name": "test", "description": "test"},
+            "mcp": {"servers": servers},
+        }
+    )
+
+
+class TestProxy:
+    """Test multiplexing sessions onto shared stdio servers."""
+
+    def test_proxy_url(self) -> None:
+        """Server names are quoted and IPv6 hosts bracketed."""
+        assert proxy_url(MCPProxyConfig(), "docs") == "http://127.0.0.1:8765/mcp/docs"
+        assert (
+            proxy_url(MCPProxyConfig(host="::1", port=9000), "a b")
+            == "http://[::1]:9000/mcp/a%20b"
+        )
+
+    def test_from_manifest(self, tmp_path: Path) -> None:
+        """Only shared servers are served unless servers are named."""
+        manifest = _manifest(
+            {
+                "shared": {"command": ["a"], "shared": True},
+                "local": {"command": ["b"]},
+                "remote": {"transport": "http", "url": "https://mcp.test/mcp"},
+            }
+        )
+
+        assert list(MCPProxy.from_manifest(manifest, tmp_path).servers) == ["shared"]
+        proxy = MCPProxy.from_manifest(manifest, tmp_path, ["local"])
+        assert list(proxy.servers) == ["local"]
+        with pytest.raises(ValueError, match="Only stdio servers"):
+            MCPProxy.from_manifest(manifest, tmp_path, ["remote"])
+        with pytest.raises(ValueError, match="No shared MCP servers"):
+            MCPProxy.from_manifest(_manifest({"b": {"command": ["b"]}}), tmp_path)
+
+    async def test_sessions_share_one_process(self, tmp_path: Path) -> None:
+        """Concurrent sessions are answered by a single upstream process."""
+        manifest = _manifest(
+            {"stub": {"command": stub_mcp_command("--tools", "3"), "shared": True}}
+        )
+        proxy = MCPProxy.from_manifest(manifest, tmp_path)
+        errors = await proxy.start("127.0.0.1", 0)
+        assert errors == {"stub": None}
+        upstream = proxy.servers["stub"].client
+        assert upstream is not None
+        url = proxy_url(MCPProxyConfig(port=proxy.port), "stub")
+        server = MCPServerHTTP(transport="http", url=url)
+
+        async def session(client: httpx.AsyncClient) -> tuple[str, int]:
+            async with HttpSession(server, tmp_path, client) as http:
+                result = await http.initialize()
+                tools = await list_tools(http)
+                await http.request("ping")
+            return result["serverInfo"]["name"], len(tools)
+
+        try:
+            async with httpx.AsyncClient() as client:
+                results = await asyncio.gather(*(session(client) for _ in range(4)))
+                assert results == [("stub", 3)] * 4
+                assert proxy.servers["stub"].client is upstream
+                # Closed sessions are forgotten
+                assert proxy.sessions == {}
+
+                response = await client.post(
+                    url,
+                    json={"jsonrpc": "2.0", "id": 1, "method": "ping"},
+                    headers={"Mcp-Session-Id": "unknown"},
+                )
+                assert response.status_code == 404
+                missing = await client.post(
+                    url, json={"jsonrpc": "2.0", "id": 1, "method": "ping"}
+                )
+                assert missing.status_code == 400
+                other = await client.post(url.removesuffix("stub") + "other", json={})
+                assert other.status_code == 404
+        finally:
+            await proxy.close()
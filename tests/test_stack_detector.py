@@ -68,3 +68,80 @@ class TestStackDetection:
 
         with pytest.raises(AmbiguousStackError):
             detect_stack(manifest, tmp_path)
+
+    def test_detect_nested_pattern(self, tmp_path: Path) -> None:
+        """Patterns may point into subdirectories."""
+        manifest = Manifest.model_validate(
+            {
+                "version": "1",
+                "project": {"name": "test", "description": "test"},
+                "stacks": {
+                    "go": {"detect": {"any": ["cmd/server/main.go"]}},
+                    "node": {"detect": {"any": ["package.json"]}},
+                },
+            }
+        )
+        (tmp_path / "cmd" / "server").mkdir(parents=True)
+        (tmp_path / "cmd" / "server" / "main.go").touch()
+
+        assert detect_stack(manifest, tmp_path) == "go"
+
+    def test_listing_cached_until_mtime_changes(self, tmp_path: Path) -> None:
+        """Directory listings are reused until the directory changes."""
+        import os
+
+        manifest = Manifest.model_validate(
+            {
+                "version": "1",
+                "project": {"name": "test", "description": "test"},
+                "stacks": {"node": {"detect": {"any": ["package.json"]}}},
+            }
+        )
+        (tmp_path / "package.json").touch()
+        os.utime(tmp_path, ns=(0, 1_000_000_000))
+        assert detect_stack(manifest, tmp_path) == "node"
+
+        (tmp_path / "package.json").unlink()
+        os.utime(tmp_path, ns=(0, 1_000_000_000))
+        # Same mtime: the cached listing is still used
+        assert detect_stack(manifest, tmp_path) == "node"
+
+        os.utime(tmp_path, ns=(0, 2_000_000_000))
+        with pytest.raises(NoStackDetectedError):
+            detect_stack(manifest, tmp_path)
+
+    def test_syscall_count_benchmark(self, tmp_path: Path, monkeypatch) -> None:
+        """Many stacks and patterns cost one scandir, not one stat each."""
+        import os
+
+        stacks = {
+            f"stack{i}": {"detect": {"any": [f"marker-{i}-{j}.txt" for j in range(20)]}}
+            for i in range(50)
+        }
+        manifest = Manifest.model_validate(
+            {
+                "version": "1",
+                "project": {"name": "test", "description": "test"},
+                "stacks": stacks,
+            }
+        )
+        (tmp_path / "marker-49-19.txt").touch()
+
+        counts = {"stat": 0, "scandir": 0}
+        real_stat, real_scandir = os.stat, os.scandir
+
+        def counting_stat(*args, **kwargs):
+            counts["stat"] += 1
+            return real_stat(*args, **kwargs)
+
+        def counting_scandir(*args, **kwargs):
+            counts["scandir"] += 1
+            return real_scandir(*args, **kwargs)
+
+        monkeypatch.setattr(os, "stat", counting_stat)
+        monkeypatch.setattr(os, "scandir", counting_scandir)
+
+        assert detect_stack(manifest, tmp_path) == "stack49"
+
+        # 1000 patterns: one stat for the cache key plus one scandir
+        assert counts == {"stat": 1, "scandir": 1}
@@ -0,0 +1,99 @@
+"""Tests for glob detect patterns."""
+
+import os
+from pathlib import Path
+
+from agent_container_pack.manifest.schema import Manifest
+from agent_container_pack.stack.detector import detect_stack
+from agent_container_pack.stack.matcher import PatternMatcher, is_glob
+
+
+def _touch(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+
+
+class TestPatternMatcher:
+    """Test glob and recursive detect patterns."""
+
+    def test_is_glob(self) -> None:
+        """Literal paths are not globs."""
+        assert is_glob("packages/*/package.json")
+        assert is_glob("**/pyproject.toml")
+        assert not is_glob("cmd/main.go")
+
+    def test_single_level_glob(self, tmp_path: Path) -> None:
+        """'*' matches one directory level."""
+        _touch(tmp_path / "packages" / "web" / "package.json")
+        matcher = PatternMatcher({"node": ["packages/*/package.json"]})
+        assert matcher.match_tree(tmp_path) == {"node"}
+
+        matcher = PatternMatcher({"node": ["*/package.json"]})
+        assert matcher.match_tree(tmp_path) == set()
+
+    def test_recursive_glob(self, tmp_path: Path) -> None:
+        """'**' matches any depth, including the root."""
+        _touch(tmp_path / "services" / "api" / "src" / "pyproject.toml")
+        matcher = PatternMatcher({"python": ["**/pyproject.toml"]})
+        assert matcher.match_tree(tmp_path) == {"python"}
+
+        matcher = PatternMatcher({"python": ["**/pyproject.toml"]}, max_depth=2)
+        assert matcher.match_tree(tmp_path) == set()
+
+    def test_pruned_and_gitignored_dirs(self, tmp_path: Path) -> None:
+        """.git, node_modules and gitignored directories are skipped."""
+        _touch(tmp_path / "node_modules" / "dep" / "pyproject.toml")
+        _touch(tmp_path / ".git" / "pyproject.toml")
+        _touch(tmp_path / "build" / "out" / "pyproject.toml")
+        _touch(tmp_path / "vendor" / "pyproject.toml")
+        (tmp_path / ".gitignore").write_text("# build output\nbuild/\n/vendor\n")
+
+        matcher = PatternMatcher({"python": ["**/pyproject.toml"]})
+        assert matcher.match_tree(tmp_path) == set()
+
+    def test_gitignore_negation(self, tmp_path: Path) -> None:
+        """A directory re-included with '!' is still walked."""
+        _touch(tmp_path / "build" / "keep" / "pyproject.toml")
+        _touch(tmp_path / "build" / "tmp" / "package.json")
+        (tmp_path / ".gitignore").write_text("build/*\n!build/keep/\n")
+
+        matcher = PatternMatcher(
+            {"python": ["**/pyproject.toml"], "node": ["**/package.json"]}
+        )
+        assert matcher.match_tree(tmp_path) == {"python"}
+
+    def test_stops_once_decided(self, tmp_path: Path, monkeypatch) -> None:
+        """The walk stops as soon as every key has matched."""
+        _touch(tmp_path / "pyproject.toml")
+        _touch(tmp_path / "deep" / "a" / "b" / "c" / "package.json")
+
+        calls: list[str] = []
+        real_scandir = os.scandir
+
+        def counting_scandir(path):
+            calls.append(str(path))
+            return real_scandir(path)
+
+        monkeypatch.setattr(os, "scandir", counting_scandir)
+
+        matcher = PatternMatcher({"python": ["**/pyproject.toml"]})
+        assert matcher.match_tree(tmp_path) == {"python"}
+        assert len(calls) == 1
+
+    def test_detect_stack_with_globs(self, tmp_path: Path) -> None:
+        """detect_stack combines literal and glob patterns."""
+        manifest = Manifest.model_validate(
+            {
+                "version": "1",
+                "project": {"name": "test", "description": "test"},
+                "docs": {"mode": "multi-stack"},
+                "stacks": {
+                    "python": {"detect": {"any": ["pyproject.toml"]}},
+                    "node": {"detect": {"any": ["packages/*/package.json"]}},
+                    "go": {"detect": {"any": ["**/go.mod"]}},
+                },
+            }
+        )
+        _touch(tmp_path / "packages" / "web" / "package.json")
+
+        assert detect_stack(manifest, tmp_path) == "node"
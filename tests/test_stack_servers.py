@@ -0,0 +1,119 @@
+"""Tests for per-stack MCP server selection."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+import yaml
+from pydantic import ValidationError
+
+from agent_container_pack.manifest.schema import Manifest
+from agent_container_pack.stack import stack_mcp_servers
+
+STACK_MANIFEST = {
+    "version": "1",
+    "project": {"name": "mono", "description": "Monorepo"},
+    "docs": {"mode": "multi-stack"},
+    "stacks": {
+        "python": {"detect": {"any": ["pyproject.toml"]}, "mcp": ["pyright"]},
+        "node": {"detect": {"any": ["package.json"]}, "mcp": ["eslint", "docs"]},
+        "go": {"detect": {"any": ["go.mod"]}, "mcp": []},
+        "other": {"detect": {"any": ["Makefile"]}},
+    },
+    "mcp": {
+        "servers": {
+            "docs": {"transport": "http", "url": "https://docs.example.com/mcp"},
+            "eslint": {"command": ["eslint-mcp"]},
+            "pyright": {"command": ["pyright-mcp"]},
+        }
+    },
+}
+
+
+class TestStackServers:
+    """Test selecting the MCP servers of a stack."""
+
+    def test_stack_subset(self) -> None:
+        """Only the servers a stack lists are selected, in manifest order."""
+        manifest = Manifest.model_validate(STACK_MANIFEST)
+
+        assert list(stack_mcp_servers(manifest, ["node"])) == ["docs", "eslint"]
+        assert list(stack_mcp_servers(manifest, ["go"])) == []
+
+    def test_union_of_stacks(self) -> None:
+        """Several stacks get the union of their servers."""
+        manifest = Manifest.model_validate(STACK_MANIFEST)
+
+        assert list(stack_mcp_servers(manifest, ["python", "go"])) == ["pyright"]
+
+    @pytest.mark.parametrize("stacks", [None, [], ["other"], ["unknown"]])
+    def test_all_servers_fallback(self, stacks: list[str] | None) -> None:
+        """No selection or a stack without an mcp list keeps every server."""
+        manifest = Manifest.model_validate(STACK_MANIFEST)
+
+        assert len(stack_mcp_servers(manifest, stacks)) == 3
+
+    def test_unknown_server_reference(self) -> None:
+        """Stacks may only reference configured servers."""
+        data = {
+            **STACK_MANIFEST,
+            "stacks": {"python": {"mcp": ["pyright", "missing"]}},
+        }
+
+        with pytest.raises(ValidationError, match="unknown MCP server"):
+            Manifest.model_validate(data)
+
+
+class TestGenerateStackServers:
+    """Test stack selection in acpack generate."""
+
+    def _generate(self, root: Path, *args: str) -> subprocess.CompletedProcess[str]:
+        return subprocess.run(
+            [sys.executable, "-m", "agent_container_pack", "generate", *args],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+    def test_detected_stack(self, tmp_path: Path) -> None:
+        """The detected stack's servers are emitted; --stack overrides it."""
+        (tmp_path / "agentpack.yml").write_text(yaml.safe_dump(STACK_MANIFEST))
+        (tmp_path / "pyproject.toml").touch()
+
+        result = self._generate(tmp_path, "--write")
+        assert result.returncode == 0, result.stderr
+        settings = json.loads((tmp_path / ".claude" / "settings.json").read_text())
+        assert list(settings["mcpServers"]) == ["pyright"]
+
+        result = self._generate(tmp_path, "--write", "--stack", "node")
+        assert result.returncode == 0, result.stderr
+        codex = (tmp_path / "codex.config.toml").read_text()
+        assert "[mcp_servers.eslint]" in codex
+        assert "pyright" not in codex
+
+        result = self._generate(tmp_path, "--stack", "rust")
+        assert result.returncode == 1
+        assert "Unknown stack: rust" in result.stderr
+
+    def test_workspace_packages(self, tmp_path: Path) -> None:
+        """Each workspace package gets its own minimal server set."""
+        (tmp_path / "agentpack.yml").write_text(yaml.safe_dump(STACK_MANIFEST))
+        for path in ["api/pyproject.toml", "web/package.json", "tools/Makefile"]:
+            (tmp_path / path).parent.mkdir(parents=True)
+            (tmp_path / path).touch()
+
+        result = self._generate(tmp_path, "--write", "--workspace")
+
+        assert result.returncode == 0, result.stderr
+        api = json.loads((tmp_path / "api" / ".claude" / "settings.json").read_text())
+        assert list(api["mcpServers"]) == ["pyright"]
+        assert (
+            "[mcp_servers.docs]" in (tmp_path / "web" / "codex.config.toml").read_text()
+        )
+        # Stacks without an mcp list share the root configuration
+        assert not (tmp_path / "tools" / ".claude").exists()
+        root = json.loads((tmp_path / ".claude" / "settings.json").read_text())
+        assert len(root["mcpServers"]) == 3
@@ -0,0 +1,89 @@
+"""Tests for workspace package detection."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+from agent_container_pack.manifest.schema import Manifest
+from agent_container_pack.stack.workspace import WorkspacePackage, detect_workspace
+
+MONOREPO_MANIFEST = {
+    "version": "1",
+    "project": {"name": "mono", "description": "Monorepo"},
+    "stacks": {
+        "python": {"detect": {"any": ["pyproject.toml"]}, "test": "uv run pytest"},
+        "node": {"detect": {"any": ["package.json"]}, "test": "npm test"},
+        "go": {"detect": {"any": ["go.mod"]}, "test": "go test ./..."},
+    },
+}
+
+
+def _make_monorepo(root: Path) -> None:
+    for path in [
+        "services/api/pyproject.toml",
+        "web/package.json",
+        "tools/cli/go.mod",
+        "web/node_modules/dep/package.json",
+        "dist/pkg/pyproject.toml",
+    ]:
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).touch()
+    (root / ".gitignore").write_text("dist/\n")
+
+
+class TestWorkspaceDetection:
+    """Test monorepo workspace detection."""
+
+    def test_detect_packages(self, tmp_path: Path) -> None:
+        """Each package directory gets its own stack."""
+        manifest = Manifest.model_validate(MONOREPO_MANIFEST)
+        _make_monorepo(tmp_path)
+
+        assert detect_workspace(manifest, tmp_path) == [
+            WorkspacePackage("services/api", "python"),
+            WorkspacePackage("tools/cli", "go"),
+            WorkspacePackage("web", "node"),
+        ]
+
+    def test_first_stack_wins(self, tmp_path: Path) -> None:
+        """A directory matching several stacks takes the first one."""
+        manifest = Manifest.model_validate(MONOREPO_MANIFEST)
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "package.json").touch()
+        (tmp_path / "pkg" / "pyproject.toml").touch()
+
+        assert detect_workspace(manifest, tmp_path) == [
+            WorkspacePackage("pkg", "python")
+        ]
+
+    def test_generate_workspace_writes_nested_docs(self, tmp_path: Path) -> None:
+        """generate --workspace writes per-package CLAUDE.md/AGENTS.md."""
+        import yaml
+
+        (tmp_path / "agentpack.yml").write_text(yaml.safe_dump(MONOREPO_MANIFEST))
+        _make_monorepo(tmp_path)
+
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "agent_container_pack",
+                "generate",
+                "--write",
+                "--workspace",
+            ],
+            cwd=tmp_path,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+
+        assert result.returncode == 0, result.stderr
+        web = (tmp_path / "web" / "CLAUDE.md").read_text()
+        assert "# mono: web" in web
+        assert "npm test" in web
+        assert "uv run pytest" not in web
+        assert (tmp_path / "web" / "AGENTS.md").read_text() == web
+        assert "go test" in (tmp_path / "tools" / "cli" / "CLAUDE.md").read_text()
+        assert "- `services/api` (python)" in (tmp_path / "CLAUDE.md").read_text()
+        assert not (tmp_path / "dist" / "pkg" / "CLAUDE.md").exists()
@@ -3,7 +3,7 @@
 from pathlib import Path
 
 from agent_container_pack.manifest import load_manifest
-from agent_container_pack.validators.env import validate_env_vars, _extract_env_refs
+from agent_container_pack.validators.env import _extract_env_refs, validate_env_vars
 
 
 class TestEnvValidation:
@@ -47,3 +47,81 @@ class TestEnvValidation:
 
         refs = _extract_env_refs(manifest)
         assert "EXAMPLE_API_KEY" in refs
+
+    def test_extract_refs_from_all_string_fields(self) -> None:
+        """References in command, url and cwd are extracted too."""
+        from agent_container_pack.manifest.schema import Manifest
+
+        manifest = Manifest.model_validate(
+            {
+                "version": "1",
+                "project": {"name": "test", "description": "test"},
+                "mcp": {
+                    "servers": {
+                        "local": {
+                            "command": ["run", "--token=${env:TOKEN}"],
+                            "cwd": "${WORK_DIR}/server",
+                        },
+                        "remote": {
+                            "transport": "http",
+                            "url": "https://${API_HOST}/mcp",
+                        },
+                    }
+                },
+            }
+        )
+
+        refs = _extract_env_refs(manifest)
+        assert refs == {"TOKEN", "WORK_DIR", "API_HOST"}
+
+    def test_env_local_and_process_env(
+        self, fixtures_dir: Path, tmp_path: Path, monkeypatch
+    ) -> None:
+        """Variables from .env.local and the process environment count."""
+        manifest = load_manifest(fixtures_dir / "full.yml")
+        devcontainer = tmp_path / ".devcontainer"
+        devcontainer.mkdir()
+        (devcontainer / ".env").write_text("")
+        (devcontainer / ".env.local").write_text("export EXAMPLE_API_KEY=x\n")
+
+        assert validate_env_vars(manifest, tmp_path) == []
+
+        (devcontainer / ".env.local").write_text("")
+        monkeypatch.setenv("EXAMPLE_API_KEY", "x")
+        assert validate_env_vars(manifest, tmp_path) == []
+        assert (
+            len(validate_env_vars(manifest, tmp_path, include_process_env=False)) == 1
+        )
+
+    def test_env_file_parsed_once(
+        self, fixtures_dir: Path, tmp_path: Path, monkeypatch
+    ) -> None:
+        """A shared .env is parsed once and re-read only after it changes."""
+        import os
+
+        from agent_container_pack.validators import env
+
+        manifest = load_manifest(fixtures_dir / "full.yml")
+        devcontainer = tmp_path / ".devcontainer"
+        devcontainer.mkdir()
+        env_file = devcontainer / ".env"
+        env_file.write_text("EXAMPLE_API_KEY=secret\n")
+
+        calls: list[Path] = []
+        original = env._read_env_names
+
+        def counting(path: Path) -> frozenset[str]:
+            calls.append(path)
+            return original(path)
+
+        monkeypatch.setattr(env, "_read_env_names", counting)
+
+        for _ in range(5):
+            validate_env_vars(manifest, tmp_path)
+        assert calls.count(env_file) == 1
+
+        env_file.write_text("OTHER=1\n")
+        stat = env_file.stat()
+        os.utime(env_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        validate_env_vars(manifest, tmp_path)
+        assert calls.count(env_file) == 2
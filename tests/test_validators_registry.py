@@ -0,0 +1,101 @@
+"""Tests for the validator registry."""
+
+from importlib.metadata import EntryPoint
+from pathlib import Path
+
+import pytest
+
+from agent_container_pack.manifest import Manifest, load_manifest
+from agent_container_pack.validators import registry
+from agent_container_pack.validators.registry import (
+    ENTRY_POINT_GROUP,
+    Severity,
+    ValidationIssue,
+    available_validators,
+    run_validators,
+)
+
+
+def org_validator(manifest: Manifest, project_dir: Path) -> list[ValidationIssue]:
+    """Example plugin validator used by the tests."""
+    return [
+        ValidationIssue(
+            validator="org",
+            severity=Severity.INFO,
+            message=f"checked {manifest.project.name}",
+        )
+    ]
+
+
+def _plugin(name: str, value: str) -> EntryPoint:
+    return EntryPoint(name=name, value=value, group=ENTRY_POINT_GROUP)
+
+
+def boom_validator(manifest: Manifest, project_dir: Path) -> list[ValidationIssue]:
+    """Example validator with a bug."""
+    raise RuntimeError("boom")
+
+
+class TestValidatorRegistry:
+    """Test validator discovery and execution."""
+
+    def test_builtin_validators(self) -> None:
+        """Built-in validators are registered."""
+        assert list(available_validators())[:2] == ["env", "skills"]
+
+    def test_run_reports_severity_and_timing(
+        self, fixtures_dir: Path, tmp_path: Path
+    ) -> None:
+        """Results carry severity levels and durations."""
+        manifest = load_manifest(fixtures_dir / "full.yml")
+
+        results = {r.name: r for r in run_validators(manifest, tmp_path)}
+
+        assert results["skills"].issues[0].severity == Severity.ERROR
+        assert str(results["skills"].issues[0]).startswith("[python-dev]")
+        assert all(r.duration >= 0 for r in results.values())
+
+    def test_only_and_skip(self, fixtures_dir: Path, tmp_path: Path) -> None:
+        """Validators can be selected or skipped by name."""
+        manifest = load_manifest(fixtures_dir / "full.yml")
+
+        assert [r.name for r in run_validators(manifest, tmp_path, only=["env"])] == [
+            "env"
+        ]
+        assert [r.name for r in run_validators(manifest, tmp_path, skip=["env"])] == [
+            "skills"
+        ]
+        with pytest.raises(ValueError, match="Unknown validator"):
+            run_validators(manifest, tmp_path, only=["nope"])
+
+    def test_entry_point_plugins_are_lazy(
+        self, fixtures_dir: Path, tmp_path: Path, monkeypatch
+    ) -> None:
+        """Plugins are discovered via entry points and loaded only when enabled."""
+        plugins = [
+            _plugin("org", f"{__name__}:org_validator"),
+            _plugin("broken", "acpack_missing_plugin_module:validator"),
+        ]
+        monkeypatch.setattr(registry, "entry_points", lambda group: plugins)
+        manifest = load_manifest(fixtures_dir / "minimal.yml")
+
+        results = run_validators(manifest, tmp_path, skip=["broken"])
+        org = next(r for r in results if r.name == "org")
+        assert org.issues[0].message == "checked minimal-project"
+
+        results = run_validators(manifest, tmp_path, only=["broken"])
+        assert results[0].issues[0].severity == Severity.ERROR
+        assert "Validator failed" in results[0].issues[0].message
+
+    def test_builtin_failures_propagate(
+        self, fixtures_dir: Path, tmp_path: Path, monkeypatch
+    ) -> None:
+        """Only plugin failures are isolated; built-in bugs are raised."""
+        monkeypatch.setattr(
+            registry, "BUILTIN_VALIDATORS", {"boom": f"{__name__}:boom_validator"}
+        )
+        monkeypatch.setattr(registry, "entry_points", lambda group: [])
+        manifest = load_manifest(fixtures_dir / "minimal.yml")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            run_validators(manifest, tmp_path)